@@ -0,0 +1,79 @@
+"""
+Admin-only operational endpoints.
+
+There are no user accounts in the API yet, so admin access is a shared
+secret: set ADMIN_TOKEN and send it in the X-Admin-Token header. When
+ADMIN_TOKEN is not set every admin endpoint answers 403.
+
+Endpoints (mounted under /api/admin):
+    GET /profile?seconds=10&interval_ms=5   Sample this worker, speedscope JSON
+    GET /profiles/{profile_id}              Profile captured with X-Profile: true
+"""
+
+import os
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    """Check a token against ADMIN_TOKEN in constant time."""
+    if not ADMIN_TOKEN or not token:
+        return False
+    return secrets.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8"))
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """FastAPI dependency rejecting requests without a valid X-Admin-Token."""
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+
+
+# ============================================================================
+# PROFILING
+# ============================================================================
+
+@router.get("/profile")
+async def profile_worker(
+    seconds: float = Query(10, gt=0),
+    # ge is profiler.PROFILE_MIN_INTERVAL_MS (app.profiler imports this module)
+    interval_ms: float = Query(None, ge=1, le=1000)
+):
+    """Sample every thread of this worker for N seconds and return speedscope JSON"""
+    from app import profiler
+
+    if seconds > profiler.PROFILE_MAX_SECONDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"seconds must be at most {profiler.PROFILE_MAX_SECONDS:g}")
+
+    profile = await run_in_threadpool(
+        profiler.profile_worker, seconds, interval_ms or profiler.PROFILE_INTERVAL_MS)
+    if profile is None:
+        raise HTTPException(status_code=409, detail="A profile is already running on this worker")
+    # Return the dict as-is; profiles are large and already JSON-safe
+    return JSONResponse(profile)
+
+
+@router.get("/profiles/{profile_id}")
+def get_request_profile(profile_id: str):
+    """Fetch the profile of a request sent with X-Profile: true"""
+    from app import profiler
+
+    profile = profiler.get_request_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return JSONResponse(profile)
@@ -0,0 +1,241 @@
+"""
+Download of uploaded files.
+
+Form records keep the path of every uploaded file in form_data (e.g.
+"flight_itinerary_path": "uploads/exit_forms/1234567/<uuid>.pdf"). The
+attachment ID is that path relative to uploads/, so the file is served at
+GET /api/attachments/exit_forms/1234567/<uuid>.pdf.
+
+Files are sent with Starlette's FileResponse:
+- Range requests are answered with 206, so PDF viewers load large files
+  progressively and resume interrupted downloads
+- the body goes out with zero-copy sendfile when the ASGI server supports
+  the http.response.pathsend extension, and in chunks read on a worker
+  thread otherwise
+- the ETag is a hash of the file's content; If-None-Match answers 304
+  without sending the file, and If-Range falls back to the full file if the
+  content changed
+
+Stored files never change (every upload gets a new UUID name), so the
+content hash is computed once per file and kept in memory, and browsers may
+reuse a download for ATTACHMENT_CACHE_MAX_AGE seconds without asking again.
+
+Images and PDFs also have a small JPEG thumbnail and preview (see
+app/previews.py), served with ?variant=thumbnail or ?variant=preview. A
+derivative that hasn't been rendered yet is rendered on request; if that
+takes longer than PREVIEW_WAIT_SECONDS the response is 202 with
+Retry-After, and a file without derivatives gets 404.
+
+With S3 storage (STORAGE_BACKEND=s3, see app/storage.py) the response is a
+307 redirect to a short-lived presigned URL, so the bytes go from S3 to the
+browser without passing through the API. With S3_PRESIGNED_DOWNLOADS=false
+the API proxies the object instead, passing Range on to S3. The ETag is
+then the object's ETag.
+
+Only files inside the form upload directories (UPLOAD_PATHS) are served.
+
+Configuration:
+    ATTACHMENT_CACHE_MAX_AGE   Seconds a browser may reuse a download (default 86400)
+    ATTACHMENT_ETAG_CACHE_SIZE Content hashes kept in memory (default 4096)
+    PREVIEW_WAIT_SECONDS       How long a request waits for a derivative (default 5)
+"""
+
+import asyncio
+import hashlib
+import os
+import posixpath
+from functools import lru_cache
+from typing import Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, Response, StreamingResponse
+
+from app.openapi_cache import parse_if_none_match
+from app.previews import is_derivative, preview_renderer
+from app.route_helpers import UPLOAD_PATHS
+from app.storage import S3_PRESIGNED_DOWNLOADS, storage
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+ATTACHMENT_CACHE_MAX_AGE = int(os.getenv("ATTACHMENT_CACHE_MAX_AGE", "86400"))
+ATTACHMENT_ETAG_CACHE_SIZE = int(os.getenv("ATTACHMENT_ETAG_CACHE_SIZE", "4096"))
+PREVIEW_WAIT_SECONDS = float(os.getenv("PREVIEW_WAIT_SECONDS", "5"))
+
+# Attachment IDs are relative to this directory
+UPLOAD_ROOT = "uploads"
+
+# Files are private to the student and staff; never store them in shared caches
+CACHE_CONTROL = f"private, max-age={ATTACHMENT_CACHE_MAX_AGE}, immutable"
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+# Proxied S3 downloads are sent in pieces of this size
+PROXY_CHUNK_BYTES = 64 * 1024
+
+
+# ============================================================================
+# FILE LOOKUP
+# ============================================================================
+
+def attachment_id(file_path: str) -> str:
+    """
+    The attachment ID of a stored file path.
+
+    Example:
+        attachment_id("uploads/exit_forms/1234567/a1b2c3d4-uuid.pdf")
+        # Result: "exit_forms/1234567/a1b2c3d4-uuid.pdf"
+    """
+    return os.path.relpath(file_path, UPLOAD_ROOT).replace(os.sep, "/")
+
+
+def resolve_attachment(attachment_id: str) -> str:
+    """
+    Storage key of the file with this attachment ID (its real path on local disk).
+
+    Raises:
+        HTTPException: 404 if it isn't a file in a form upload directory
+    """
+    if storage.is_local:
+        path = os.path.realpath(os.path.join(UPLOAD_ROOT, *attachment_id.split("/")))
+        in_upload_dir = any(
+            path.startswith(os.path.realpath(directory) + os.sep) for directory in UPLOAD_PATHS.values()
+        )
+    else:
+        path = posixpath.normpath(posixpath.join(UPLOAD_ROOT, attachment_id))
+        in_upload_dir = any(path.startswith(directory + "/") for directory in UPLOAD_PATHS.values())
+    if not in_upload_dir or not storage.exists(path):
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    return path
+
+
+@lru_cache(maxsize=ATTACHMENT_ETAG_CACHE_SIZE)
+def _content_etag(path: str, size: int, mtime_ns: int) -> str:
+    # size and mtime_ns are part of the cache key, so a replaced file is hashed again
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+# ============================================================================
+# RESPONSES
+# ============================================================================
+
+def _headers(etag: str) -> dict:
+    return {
+        "ETag": etag,
+        "Cache-Control": CACHE_CONTROL,
+        # Uploaded content is served as stored; don't let browsers guess a type
+        "X-Content-Type-Options": "nosniff",
+    }
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    if_none_match = parse_if_none_match(request.headers.get("if-none-match"))
+    return etag in if_none_match or "*" in if_none_match
+
+
+async def _object_response(key: str, request: Request) -> Response:
+    """Serve a file from S3: a presigned redirect, or the object proxied through."""
+    stored = await run_in_threadpool(storage.stat, key)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    headers = _headers(stored.etag)
+    if _not_modified(request, stored.etag):
+        return Response(status_code=304, headers=headers)
+
+    filename = posixpath.basename(key)
+    if S3_PRESIGNED_DOWNLOADS:
+        url = await run_in_threadpool(storage.presigned_url, key, filename)
+        # The URL expires long before the file would, so the redirect isn't cached
+        return RedirectResponse(url, status_code=307, headers={**headers, "Cache-Control": "no-store"})
+
+    headers["Accept-Ranges"] = "bytes"
+    headers["Content-Disposition"] = f'inline; filename="{filename}"'
+    if request.method == "HEAD":
+        headers["Content-Length"] = str(stored.size)
+        return Response(headers=headers)
+
+    # Like FileResponse: a Range only applies if the file is still the one the client has
+    byte_range = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range and if_range != stored.etag:
+        byte_range = None
+    try:
+        response = await run_in_threadpool(storage.get, key, byte_range)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    except ValueError:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{stored.size}"})
+
+    headers["Content-Length"] = str(response["ContentLength"])
+    if response.get("ContentRange"):
+        headers["Content-Range"] = response["ContentRange"]
+    # A sync iterator: Starlette reads the S3 stream on a worker thread
+    return StreamingResponse(
+        response["Body"].iter_chunks(PROXY_CHUNK_BYTES),
+        status_code=response["ResponseMetadata"]["HTTPStatusCode"],
+        media_type=response.get("ContentType") or "application/octet-stream",
+        headers=headers,
+    )
+
+
+# ============================================================================
+# ROUTES
+# ============================================================================
+
+router = APIRouter(prefix="/attachments")
+
+
+@router.get("/{attachment_id:path}", response_class=FileResponse)
+async def get_attachment(
+    attachment_id: str,
+    request: Request,
+    variant: Optional[Literal["thumbnail", "preview"]] = Query(None)
+):
+    """Download an uploaded file or its thumbnail/preview (supports Range and If-None-Match)"""
+    path = await run_in_threadpool(resolve_attachment, attachment_id)
+    if variant is not None:
+        # A thumbnail or preview has no derivatives of its own
+        if is_derivative(path):
+            raise HTTPException(status_code=404, detail=f"Attachment has no {variant}")
+        try:
+            path = await preview_renderer.get(path, variant, PREVIEW_WAIT_SECONDS)
+        except asyncio.TimeoutError:
+            return JSONResponse(
+                status_code=202, content={"detail": f"The {variant} is being rendered"},
+                headers={"Retry-After": "1"})
+        if path is None:
+            raise HTTPException(status_code=404, detail=f"Attachment has no {variant}")
+
+    if not storage.is_local:
+        return await _object_response(path, request)
+
+    def stat_attachment():
+        stat_result = os.stat(path)
+        return stat_result, _content_etag(path, stat_result.st_size, stat_result.st_mtime_ns)
+
+    stat_result, etag = await run_in_threadpool(stat_attachment)
+    headers = _headers(etag)
+
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(
+        path,
+        headers=headers,
+        stat_result=stat_result,
+        filename=os.path.basename(path),
+        content_disposition_type="inline",
+    )
+
+
+# Same handler for HEAD (FileResponse sends the headers only); one operation in the schema
+router.add_api_route(
+    "/{attachment_id:path}", get_attachment, methods=["HEAD"], name="head_attachment",
+    include_in_schema=False)
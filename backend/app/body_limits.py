@@ -0,0 +1,139 @@
+"""
+Request body size limits.
+
+Without a limit a client can stream an arbitrarily large body: multipart
+files are spooled to disk and JSON bodies are read into memory before any
+validation runs. Two checks stop that early:
+
+- BodyLimitMiddleware caps the whole body of every request. A
+  Content-Length above the limit is answered with 413 before a byte of the
+  body is read; bodies without one (chunked) are counted as they stream in
+  and rejected the moment the limit is crossed.
+- The form parsers in app/multipart.py cap each part: every uploaded file
+  at its form's max_file_bytes and every other field at MAX_FIELD_BYTES,
+  again rejecting mid-stream.
+
+Form create endpoints get a body limit sized for their file inputs (see
+body_limits() in app/form_registry.py), chunks of resumable uploads one of
+MAX_FILE_BYTES (app/resumable.py); every other request gets MAX_BODY_BYTES.
+
+Configuration:
+    MAX_BODY_BYTES   Body limit of requests without file uploads (default 1 MB)
+    MAX_FILE_BYTES   Default size limit of each uploaded file (default 10 MB)
+    MAX_FIELD_BYTES  Size limit of each non-file form field (default 64 KB)
+"""
+
+import os
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+MAX_BODY_BYTES = int(os.getenv("MAX_BODY_BYTES", str(1024 * 1024)))
+MAX_FILE_BYTES = int(os.getenv("MAX_FILE_BYTES", str(10 * 1024 * 1024)))
+MAX_FIELD_BYTES = int(os.getenv("MAX_FIELD_BYTES", str(64 * 1024)))
+
+
+class RequestTooLarge(HTTPException):
+    """
+    413 raised while the body is being received or parsed.
+
+    An HTTPException, so FastAPI's exception handling turns it into the
+    response wherever it is raised during a request.
+    """
+
+    def __init__(self, what: str, limit: int):
+        super().__init__(status_code=413, detail=f"{what} exceeds the limit of {limit} bytes")
+
+
+# ============================================================================
+# ASGI MIDDLEWARE
+# ============================================================================
+
+class BodyLimitMiddleware:
+    """
+    Reject request bodies larger than the limit for their route with 413.
+
+    Args:
+        limits: Body limit by (method, path), e.g. ("POST", "/api/exit-forms/")
+        prefix_limits: Body limit by (method, path prefix), for paths with IDs
+        default_limit: Limit of every other request
+    """
+
+    def __init__(self, app, limits: Optional[Dict[Tuple[str, str], int]] = None,
+                 prefix_limits: Optional[Dict[Tuple[str, str], int]] = None,
+                 default_limit: int = MAX_BODY_BYTES):
+        self.app = app
+        self.limits = limits or {}
+        self.prefix_limits = prefix_limits or {}
+        self.default_limit = default_limit
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = self._limit(scope["method"], scope["path"])
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    declared = 0
+                if declared > limit:
+                    # Answer without reading the body at all
+                    await _reject(RequestTooLarge("Request body", limit), scope, receive, send)
+                    return
+                break
+
+        received = 0
+        response_started = False
+
+        async def receive_wrapper():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise RequestTooLarge("Request body", limit)
+            return message
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except RequestTooLarge as exc:
+            # Normally the route's exception handling answers; this catches
+            # a body read outside of it (e.g. by another middleware)
+            if response_started:
+                raise
+            await _reject(exc, scope, receive, send)
+
+    def _limit(self, method: str, path: str) -> int:
+        limit = self.limits.get((method, path))
+        if limit is not None:
+            return limit
+        for (prefix_method, prefix), prefix_limit in self.prefix_limits.items():
+            if method == prefix_method and path.startswith(prefix):
+                return prefix_limit
+        return self.default_limit
+
+
+async def _reject(exc: RequestTooLarge, scope, receive, send) -> None:
+    response = JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        # The rest of the body is never read, so don't reuse the connection
+        headers={"Connection": "close"},
+    )
+    await response(scope, receive, send)
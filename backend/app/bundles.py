@@ -0,0 +1,126 @@
+"""
+ZIP downloads built while they are sent.
+
+stream_zip() writes the archive into a small in-memory sink and yields
+whatever the zipfile module has written after each chunk of input, so the
+download starts with the first file's header, no temporary file is
+written and memory stays at about one chunk however many files are
+bundled. Files are read through the storage backend (app/storage.py), so
+S3 objects are streamed the same way. The output isn't seekable, so every
+entry is followed by a data descriptor holding its CRC and sizes, which
+every unzip tool reads.
+
+PDFs, images and other already-compressed files are stored as they are;
+deflating them costs CPU and saves nothing. Everything else is deflated.
+
+Example:
+    return zip_response(
+        [("transcripts.pdf", "uploads/opt_stem_applications/1234567/a1b2.pdf")],
+        "opt_stem_application_12_attachments.zip",
+    )
+"""
+
+import io
+import logging
+import os
+import time
+import zipfile
+from typing import Iterable, Iterator, Tuple
+
+from fastapi.responses import StreamingResponse
+
+from app.logging_config import log_fields
+from app.storage import storage
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Extensions of formats that are compressed already
+STORED_EXTENSIONS = frozenset({
+    ".pdf", ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic",
+    ".zip", ".gz", ".docx", ".xlsx", ".pptx",
+})
+
+# Files are read and sent in pieces of this size
+ZIP_CHUNK_BYTES = 64 * 1024
+
+
+# ============================================================================
+# ZIP STREAMING
+# ============================================================================
+
+class _ZipSink(io.RawIOBase):
+    """Write-only, unseekable buffer the archive is written into."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(entries: Iterable[Tuple[str, str]]) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive of files piece by piece.
+
+    Args:
+        entries: (name in the archive, storage key) pairs; files that no
+                 longer exist are left out
+
+    Yields:
+        Consecutive pieces of the archive
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w", allowZip64=True) as archive:
+        for arcname, path in entries:
+            stored = storage.stat(path)
+            try:
+                if stored is None:
+                    raise FileNotFoundError(path)
+                source = storage.open(path)
+            except FileNotFoundError:
+                logger.warning("Attachment missing from bundle", extra=log_fields(path=path))
+                continue
+            with source:
+                info = zipfile.ZipInfo(arcname, time.localtime(stored.modified)[:6])
+                info.file_size = stored.size
+                info.external_attr = 0o644 << 16
+                extension = os.path.splitext(path)[1].lower()
+                info.compress_type = zipfile.ZIP_STORED if extension in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+                with archive.open(info, "w", force_zip64=info.file_size > zipfile.ZIP64_LIMIT) as target:
+                    for chunk in iter(lambda: source.read(ZIP_CHUNK_BYTES), b""):
+                        target.write(chunk)
+                        data = sink.drain()
+                        if data:
+                            yield data
+            # The entry's data descriptor
+            yield sink.drain()
+    # The central directory
+    yield sink.drain()
+
+
+def zip_response(entries: Iterable[Tuple[str, str]], filename: str) -> StreamingResponse:
+    """
+    Stream a ZIP of files as a download.
+
+    The generator reads files, so Starlette runs it on a worker thread.
+    """
+    return StreamingResponse(
+        stream_zip(entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
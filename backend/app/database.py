@@ -1,19 +1,104 @@
-from sqlalchemy import create_engine
+import logging
+import os
+import time
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from app.logging_config import log_fields
+from app.timing import current_timings
+
+logger = logging.getLogger(__name__)
+
+# Queries slower than this are logged together with their EXPLAIN QUERY PLAN
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+
+# Statement types EXPLAIN QUERY PLAN is run for (never DDL or PRAGMAs)
+EXPLAINABLE_STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
 SQLALCHEMY_DATABASE_URL = "sqlite:///./sql_app.db"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Records stay loaded after commit so newly created ones can be returned
+# without a refresh SELECT
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
+
+@event.listens_for(engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _record_query_time(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+
+    timings = current_timings()
+    if timings is not None:
+        timings.add_query(elapsed)
+
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        plan = None
+        if (not executemany and conn.dialect.name == "sqlite"
+                and statement.lstrip().upper().startswith(EXPLAINABLE_STATEMENTS)):
+            plan = _explain_query_plan(conn, statement, parameters)
+        # Only the statement with placeholders is logged, never the bound values
+        logger.warning("Slow query", extra=log_fields(
+            duration_ms=round(elapsed * 1000, 1), statement=statement, plan=plan))
+
+
+def _explain_query_plan(conn, statement, parameters):
+    # Use a separate DBAPI cursor so the caller's result rows are untouched
+    plan_cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        plan_cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+        return [row[-1] for row in plan_cursor.fetchall()]
+    except Exception as e:
+        return [f"unavailable: {e}"]
+    finally:
+        plan_cursor.close()
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Ingest journal - kept in its own SQLite file so acknowledging a submission
+# never waits on the write lock of the main form tables
+INGEST_DATABASE_URL = "sqlite:///./ingest_queue.db"
+
+ingest_engine = create_engine(
+    INGEST_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+IngestSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=ingest_engine
+)
+
+IngestBase = declarative_base()
+
+
+@event.listens_for(ingest_engine, "connect")
+def _configure_ingest_connection(dbapi_connection, connection_record):
+    # WAL lets the drain worker read while requests append; FULL sync makes
+    # every acknowledged receipt survive a crash or power loss
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=FULL")
+    cursor.close()
+
+
+def get_ingest_db():
+    db = IngestSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,195 @@
+"""
+File type detection for uploads.
+
+The filename and Content-Type of an uploaded file are whatever the client
+sent; an executable renamed to passport.pdf arrives as application/pdf.
+The real type is read from the file's first bytes (its magic number)
+instead, while the upload is still streaming:
+
+- app/multipart.py holds back the first SNIFF_BYTES of every file part,
+  detects the type, and stops the request with a 415 before anything of a
+  disallowed file is written to the spool file
+- app/resumable.py checks the first PATCH of a resumable upload the same way
+
+The detected type replaces the client's Content-Type on the UploadFile.
+An empty file has no type to detect; it is accepted as it was before type
+checks, as EMPTY_FILE_TYPE.
+save_upload_file() names the stored file with a matching extension and
+passes the type on to the storage backend, so downloads are served with
+the detected type (and X-Content-Type-Options: nosniff).
+
+Detected types:
+    application/pdf, image/jpeg, image/png, image/gif, image/webp,
+    image/heic, image/tiff, image/bmp, application/msword (.doc) and the
+    Office Open XML documents (.docx, .xlsx, .pptx)
+
+Configuration:
+    UPLOAD_ALLOWED_TYPES  Comma-separated MIME types accepted (default: all detected types)
+"""
+
+import os
+from typing import Optional
+
+from fastapi import HTTPException
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+PPTX = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+# MIME type -> file extensions; the first is used when the client's doesn't match
+FILE_TYPES = {
+    "application/pdf": (".pdf",),
+    "image/jpeg": (".jpg", ".jpeg"),
+    "image/png": (".png",),
+    "image/gif": (".gif",),
+    "image/webp": (".webp",),
+    "image/heic": (".heic", ".heif"),
+    "image/tiff": (".tif", ".tiff"),
+    "image/bmp": (".bmp",),
+    "application/msword": (".doc",),
+    DOCX: (".docx",),
+    XLSX: (".xlsx",),
+    PPTX: (".pptx",),
+}
+
+UPLOAD_ALLOWED_TYPES = frozenset(
+    value.strip() for value in os.getenv("UPLOAD_ALLOWED_TYPES", ",".join(FILE_TYPES)).split(",")
+    if value.strip()
+)
+
+# Bytes read before deciding
+SNIFF_BYTES = 1024
+
+# Content-Type of an empty upload
+EMPTY_FILE_TYPE = "application/octet-stream"
+
+# Header sizes of the BMP DIB header versions (BITMAPCOREHEADER .. BITMAPV5HEADER)
+_BMP_DIB_HEADER_SIZES = {12, 40, 52, 56, 64, 108, 124}
+
+# ftyp brands of HEIF images (iPhone photos)
+_HEIF_BRANDS = {b"heic", b"heix", b"hevc", b"hevx", b"heim", b"heis", b"mif1", b"msf1"}
+
+_OOXML_BY_EXTENSION = {".docx": DOCX, ".xlsx": XLSX, ".pptx": PPTX}
+
+
+class UnsupportedFileType(HTTPException):
+    """415 raised while an upload of a disallowed type is being received."""
+
+    def __init__(self, what: str, content_type: Optional[str]):
+        detail = f"{what} is not an accepted file type"
+        if content_type:
+            detail += f" ({content_type})"
+        super().__init__(status_code=415, detail=detail)
+
+
+# ============================================================================
+# DETECTION
+# ============================================================================
+
+def sniff_content_type(head: bytes, filename: Optional[str] = None) -> Optional[str]:
+    """
+    MIME type of a file from its first bytes.
+
+    Args:
+        head: The first SNIFF_BYTES of the file (or all of it, if shorter)
+        filename: Client filename; only tells the Office Open XML formats apart
+
+    Returns:
+        The detected type, or None if it isn't one of FILE_TYPES
+
+    Example:
+        sniff_content_type(b"%PDF-1.7\\n...")
+        # Result: "application/pdf"
+    """
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[4:8] == b"ftyp" and head[8:12] in _HEIF_BRANDS:
+        return "image/heic"
+    if head.startswith((b"II*\x00", b"MM\x00*")):
+        return "image/tiff"
+    if head.startswith(b"BM") and _is_bmp_header(head):
+        return "image/bmp"
+    if head.startswith(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"):
+        return "application/msword"
+    if head.startswith(b"PK\x03\x04"):
+        # A ZIP; Office documents list their parts in [Content_Types].xml
+        if b"[Content_Types].xml" not in head and not any(
+                part in head for part in (b"word/", b"xl/", b"ppt/", b"_rels/")):
+            return None
+        if b"word/" in head:
+            return DOCX
+        if b"xl/" in head:
+            return XLSX
+        if b"ppt/" in head:
+            return PPTX
+        extension = os.path.splitext(filename or "")[1].lower()
+        return _OOXML_BY_EXTENSION.get(extension, DOCX)
+    if head.lstrip().startswith(b"%PDF-"):
+        return "application/pdf"
+    return None
+
+
+def _is_bmp_header(head: bytes) -> bool:
+    """Whether a file starting with "BM" has a plausible BMP file and DIB header."""
+    if len(head) < 18:
+        return False
+    file_size = int.from_bytes(head[2:6], "little")
+    reserved = head[6:10]
+    pixel_offset = int.from_bytes(head[10:14], "little")
+    dib_size = int.from_bytes(head[14:18], "little")
+    return (
+        dib_size in _BMP_DIB_HEADER_SIZES
+        and reserved == b"\0\0\0\0"
+        and 14 + dib_size <= pixel_offset <= file_size
+        # head is the start of the file, or all of it
+        and file_size >= len(head)
+    )
+
+
+def check_file_type(head: bytes, filename: Optional[str], what: str) -> str:
+    """
+    Detected type of an upload, if it is allowed.
+
+    Args:
+        head: The first SNIFF_BYTES of the file
+        filename: Client filename
+        what: How to name the file in the error, e.g. "File 'passport'"
+
+    Returns:
+        The detected MIME type, or EMPTY_FILE_TYPE for an empty file
+
+    Raises:
+        UnsupportedFileType: Unknown or not in UPLOAD_ALLOWED_TYPES (415)
+    """
+    if not head:
+        return EMPTY_FILE_TYPE
+    content_type = sniff_content_type(head, filename)
+    if content_type not in UPLOAD_ALLOWED_TYPES:
+        raise UnsupportedFileType(what, content_type)
+    return content_type
+
+
+def stored_extension(content_type: Optional[str], filename: Optional[str]) -> str:
+    """
+    Extension to store an upload with: the client's if it fits the type.
+
+    Example:
+        stored_extension("image/png", "passport.pdf")
+        # Result: ".png"
+    """
+    extension = os.path.splitext(filename or "")[1]
+    extensions = FILE_TYPES.get(content_type or "")
+    if not extensions or extension.lower() in extensions:
+        return extension
+    return extensions[0]
@@ -0,0 +1,558 @@
+"""
+Form registry: one spec per form, one route implementation for all of them.
+
+Every form collection exposes the same five endpoints under /api/<path>/:
+
+    POST   /<path>/               create     - JSON body or multipart form
+    GET    /<path>/?skip&limit    list       - paginated, ordered by id
+    GET    /<path>/{request_id}   get        - 404 "<label> not found"
+    DELETE /<path>/{request_id}   delete     - 204, upload files removed after commit
+    DELETE /<path>/               delete-all - 204, one DELETE ... RETURNING
+
+Forms with file inputs also get
+
+    GET    /<path>/{request_id}/attachments.zip   the submission's files, streamed
+
+A FormSpec describes what differs between forms (model, schemas, body
+type, upload directory, extra columns) and add_form_routes() generates
+the endpoints from it, so a change to pagination, deletes or logging is
+made once in this module and applies to every form.
+
+Route names stay "create_<name>", "get_<plural>", "get_<name>",
+"delete_<name>" and "delete_all_<plural>", which are also the labels of
+the transaction retry metrics.
+
+Example (adding a form):
+    FormSpec(
+        path="exit-forms", name="exit_form", label="Exit Form",
+        model=models.ExitForm, schema=schemas.ExitForm,
+        form_class=forms.ExitFormSubmission,
+        program="Exit Form", upload_dir=UPLOAD_PATHS["exit_forms"],
+    )
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app import forms, models, schemas
+from app.body_limits import MAX_BODY_BYTES
+from app.bundles import zip_response
+from app.database import get_db
+from app.logging_config import log_fields
+from app.route_helpers import (
+    UPLOAD_PATHS, create_db_record, delete_all_records, delete_multiple_files,
+    save_multiple_files, submit_record,
+)
+from app.transactions import run_in_transaction
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Page size of list endpoints when no ?limit= is given, and the largest allowed
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+
+# Fields of the JSON create schemas that become columns, not form_data
+JSON_RECORD_FIELDS = frozenset({"student_name", "student_id", "program"})
+
+
+# ============================================================================
+# FORM SPEC
+# ============================================================================
+
+@dataclass(frozen=True)
+class FormSpec:
+    """
+    Everything the generic routes need to know about one form.
+
+    Exactly one of create_schema (JSON body) and form_class (a
+    MultipartForm from app/forms.py) is set.
+
+    Attributes:
+        path: URL segment, e.g. "exit-forms"
+        name: Singular route name stem, e.g. "exit_form"
+        label: Human-readable name used in messages, e.g. "Exit Form"
+        model: SQLAlchemy model of the form table
+        schema: Response schema of a record
+        create_schema: Pydantic schema of a JSON create body
+        form_class: MultipartForm subclass of a form-encoded create body
+        program: Program stored when the body doesn't supply one
+        upload_dir: Where the form's uploaded files are saved
+        columns: Body fields stored in their own model columns
+        build_form_data: Builds form_data from a JSON body, replacing the default
+        plural: Plural route name stem (defaults to name + "s")
+    """
+    path: str
+    name: str
+    label: str
+    model: type
+    schema: type
+    create_schema: Optional[type] = None
+    form_class: Optional[type] = None
+    program: Optional[str] = None
+    upload_dir: Optional[str] = None
+    columns: Tuple[str, ...] = ()
+    build_form_data: Optional[Callable[[BaseModel], Dict[str, Any]]] = None
+    plural: str = ""
+
+    def __post_init__(self):
+        if (self.create_schema is None) == (self.form_class is None):
+            raise ValueError(f"{self.path}: set exactly one of create_schema and form_class")
+        if self.form_class is not None and self.form_class.file_inputs and not self.upload_dir:
+            raise ValueError(f"{self.path}: form has file inputs but no upload_dir")
+        if not self.plural:
+            object.__setattr__(self, "plural", self.name + "s")
+
+    @property
+    def file_fields(self) -> Tuple[str, ...]:
+        """form_data keys holding the paths of this form's uploaded files."""
+        if self.form_class is None:
+            return ()
+        return tuple(f"{name}_path" for name in self.form_class.file_inputs.values())
+
+    @property
+    def max_body_bytes(self) -> int:
+        """Largest accepted create body: every file at its limit plus the fields."""
+        if self.form_class is None:
+            return MAX_BODY_BYTES
+        return len(self.form_class.file_inputs) * self.form_class.max_file_bytes + MAX_BODY_BYTES
+
+
+def _records_release_form_data(request: BaseModel) -> Dict[str, Any]:
+    """The frontend nests the UCF Global Records Release fields in form_data."""
+    if request.form_data:
+        return request.form_data
+    return request.model_dump(exclude=JSON_RECORD_FIELDS)
+
+
+# ============================================================================
+# REGISTRY
+# ============================================================================
+
+FORMS: List[FormSpec] = [
+    FormSpec(
+        path="i20-requests", name="i20_request", label="I-20 request",
+        model=models.I20Request, schema=schemas.I20Request,
+        create_schema=schemas.I20RequestCreate,
+        columns=("other_reason",),
+    ),
+    FormSpec(
+        path="academic-training", name="academic_training_request",
+        label="Academic Training request",
+        model=models.AcademicTrainingRequest, schema=schemas.AcademicTrainingRequest,
+        form_class=forms.AcademicTrainingSubmission,
+        upload_dir=UPLOAD_PATHS["academic_training"],
+        columns=("completion_type", "comments"),
+    ),
+    FormSpec(
+        path="administrative-record", name="administrative_record_request",
+        label="Administrative Record request",
+        model=models.AdministrativeRecordRequest, schema=schemas.AdministrativeRecordRequest,
+        create_schema=schemas.AdministrativeRecordRequestCreate,
+    ),
+    FormSpec(
+        path="conversation-partner", name="conversation_partner_request",
+        label="Conversation Partner request",
+        model=models.ConversationPartnerRequest, schema=schemas.ConversationPartnerRequest,
+        create_schema=schemas.ConversationPartnerRequestCreate,
+        program="Conversation Partner",
+    ),
+    FormSpec(
+        path="opt-requests", name="opt_request", label="OPT request",
+        model=models.OPTRequest, schema=schemas.OPTRequest,
+        form_class=forms.OPTRequestSubmission,
+        program="OPT Request", upload_dir=UPLOAD_PATHS["opt_requests"],
+    ),
+    FormSpec(
+        path="document-requests", name="document_request", label="Document request",
+        model=models.DocumentRequest, schema=schemas.DocumentRequest,
+        create_schema=schemas.DocumentRequestCreate,
+        program="Document Request",
+    ),
+    FormSpec(
+        path="english-language-volunteer", name="english_language_volunteer_request",
+        label="English Language Volunteer request",
+        model=models.EnglishLanguageVolunteerRequest,
+        schema=schemas.EnglishLanguageVolunteerRequest,
+        create_schema=schemas.EnglishLanguageVolunteerRequestCreate,
+    ),
+    FormSpec(
+        path="off-campus-housing", name="off_campus_housing_request",
+        label="Off Campus Housing request",
+        model=models.OffCampusHousingRequest, schema=schemas.OffCampusHousingRequest,
+        create_schema=schemas.OffCampusHousingRequestCreate,
+    ),
+    FormSpec(
+        path="florida-statute-101035", name="florida_statute_101035_request",
+        label="Florida Statute 1010.35 request",
+        model=models.FloridaStatute101035Request, schema=schemas.FloridaStatute101035Request,
+        form_class=forms.FloridaStatute101035Submission,
+        program="Florida Statute 1010.35", upload_dir=UPLOAD_PATHS["florida_statute"],
+    ),
+    FormSpec(
+        path="leave-requests", name="leave_request", label="Leave request",
+        model=models.LeaveRequest, schema=schemas.LeaveRequest,
+        form_class=forms.LeaveRequestSubmission,
+        program="Leave Request", upload_dir=UPLOAD_PATHS["leave_requests"],
+    ),
+    FormSpec(
+        path="opt-stem-reports", name="opt_stem_report", label="OPT STEM Extension report",
+        model=models.OptStemExtensionReport, schema=schemas.OptStemExtensionReport,
+        create_schema=schemas.OptStemExtensionReportCreate,
+    ),
+    FormSpec(
+        path="opt-stem-applications", name="opt_stem_application",
+        label="OPT STEM Extension application",
+        model=models.OptStemExtensionApplication, schema=schemas.OptStemExtensionApplication,
+        form_class=forms.OptStemExtensionApplicationSubmission,
+        program="OPT STEM Extension Application",
+        upload_dir=UPLOAD_PATHS["opt_stem_applications"],
+    ),
+    FormSpec(
+        path="exit-forms", name="exit_form", label="Exit Form",
+        model=models.ExitForm, schema=schemas.ExitForm,
+        form_class=forms.ExitFormSubmission,
+        program="Exit Form", upload_dir=UPLOAD_PATHS["exit_forms"],
+    ),
+    FormSpec(
+        path="pathway-programs-intent-to-progress",
+        name="pathway_programs_intent_to_progress_request",
+        label="Pathway Programs Intent to Progress request",
+        model=models.PathwayProgramsIntentToProgress,
+        schema=schemas.PathwayProgramsIntentToProgress,
+        form_class=forms.PathwayProgramsIntentToProgressSubmission,
+        program="Pathway Programs Intent to Progress",
+    ),
+    FormSpec(
+        path="pathway-programs-next-steps", name="pathway_programs_next_steps_request",
+        label="Pathway Programs Next Steps request",
+        model=models.PathwayProgramsNextSteps, schema=schemas.PathwayProgramsNextSteps,
+        form_class=forms.PathwayProgramsNextStepsSubmission,
+        program="Pathway Programs Next Steps",
+    ),
+    FormSpec(
+        path="reduced-course-load", name="reduced_course_load_request",
+        label="Reduced Course Load Request",
+        model=models.ReducedCourseLoadRequest, schema=schemas.ReducedCourseLoadRequest,
+        form_class=forms.ReducedCourseLoadSubmission,
+        program="Reduced Course Load Request",
+    ),
+    FormSpec(
+        path="global-transfer-out", name="global_transfer_out_request",
+        label="Global Transfer Out Request",
+        model=models.GlobalTransferOutRequest, schema=schemas.GlobalTransferOutRequest,
+        form_class=forms.GlobalTransferOutSubmission,
+        program="Global Transfer Out Request", upload_dir=UPLOAD_PATHS["global_transfer_out"],
+    ),
+    FormSpec(
+        path="ucf-global-records-release", name="ucf_global_records_release_form",
+        label="UCF Global Records Release Form",
+        model=models.UCFGlobalRecordsReleaseForm, schema=schemas.UCFGlobalRecordsReleaseForm,
+        create_schema=schemas.UCFGlobalRecordsReleaseFormCreate,
+        program="UCF Global Records Release",
+        build_form_data=_records_release_form_data,
+    ),
+    FormSpec(
+        path="virtual-checkin", name="virtual_checkin_request", label="Virtual Check In request",
+        model=models.VirtualCheckInRequest, schema=schemas.VirtualCheckInRequest,
+        form_class=forms.VirtualCheckInSubmission,
+        program="Virtual Check In", upload_dir=UPLOAD_PATHS["virtual_checkin"],
+        columns=("remarks",),
+    ),
+]
+
+
+def body_limits(prefix: str = "/api") -> Dict[Tuple[str, str], int]:
+    """
+    Body size limits of the create endpoints, for BodyLimitMiddleware.
+
+    Args:
+        prefix: Prefix the form router is mounted under
+
+    Returns:
+        {("POST", "/api/<path>/"): bytes} for every form that takes files
+    """
+    return {
+        ("POST", f"{prefix}/{spec.path}/"): spec.max_body_bytes
+        for spec in FORMS
+        if spec.max_body_bytes != MAX_BODY_BYTES
+    }
+
+
+def submission_paths(prefix: str = "/api") -> Set[str]:
+    """
+    Paths of the create endpoints, for IdempotencyMiddleware.
+
+    Returns:
+        {"/api/<path>/"} for every form
+    """
+    return {f"{prefix}/{spec.path}/" for spec in FORMS}
+
+
+# ============================================================================
+# GENERIC ROUTE IMPLEMENTATION
+# ============================================================================
+
+async def create_record(spec: FormSpec, body: BaseModel, db: Session):
+    """
+    Save a submission's files and persist its record.
+
+    Args:
+        spec: The form being submitted
+        body: The parsed JSON body (create_schema) or form (form_class)
+        db: Database session
+
+    Returns:
+        The created record, or a 202 receipt response in ingest mode
+    """
+    try:
+        # JSON bodies carry student_id; forms (and the records release) ucf_id
+        ucf_id = getattr(body, "student_id", None) or getattr(body, "ucf_id", None)
+
+        if spec.form_class is not None:
+            file_paths = {}
+            if spec.form_class.file_inputs:
+                file_paths = await save_multiple_files(
+                    files_dict=body.files(),
+                    destination_dir=spec.upload_dir,
+                    ucf_id=ucf_id
+                )
+            form_data = body.form_data(**file_paths)
+        elif spec.build_form_data is not None:
+            form_data = spec.build_form_data(body)
+        else:
+            form_data = body.model_dump(exclude=JSON_RECORD_FIELDS | set(spec.columns))
+
+        db_request = create_db_record(
+            spec.model,
+            ucf_id,
+            getattr(body, "given_name", None),
+            getattr(body, "family_name", None),
+            getattr(body, "program", None) or spec.program,
+            form_data,
+            **{column: getattr(body, column) for column in spec.columns}
+        )
+
+        return await run_in_threadpool(submit_record, db, db_request, f"Created {spec.label}")
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.exception(
+            "Error creating record", extra=log_fields(form_type=spec.model.__tablename__))
+        raise HTTPException(
+            status_code=400, detail=f"Error creating {spec.label}: {str(e)}")
+
+
+def list_records(spec: FormSpec, db: Session, skip: int, limit: int, before_id: Optional[int] = None):
+    """
+    A page of records, newest first.
+
+    Pass the last ID of the previous page as before_id to get the next one;
+    unlike skip, that doesn't shift when new records arrive in between.
+    """
+    query = db.query(spec.model)
+    if before_id is not None:
+        query = query.filter(spec.model.id < before_id)
+    records = (
+        # Newest first, so the first page always shows the latest submissions
+        query.order_by(spec.model.id.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    logger.debug(
+        "Returning records",
+        extra=log_fields(form_type=spec.model.__tablename__, count=len(records)))
+    return records
+
+
+def get_record(spec: FormSpec, db: Session, request_id: int):
+    db_request = db.get(spec.model, request_id)
+    if db_request is None:
+        raise HTTPException(status_code=404, detail=f"{spec.label} not found")
+    return db_request
+
+
+def delete_record(spec: FormSpec, db: Session, request_id: int) -> None:
+    db_request = get_record(spec, db, request_id)
+
+    run_in_transaction(db, lambda: db.delete(db_request), f"delete_{spec.name}")
+
+    # Files go only once the row is gone, like delete_all_records()
+    if spec.file_fields and db_request.form_data:
+        delete_multiple_files(db_request.form_data, list(spec.file_fields))
+
+    logger.info(
+        "Deleted record",
+        extra=log_fields(form_type=spec.model.__tablename__, record_id=request_id))
+
+
+def delete_all(spec: FormSpec, db: Session) -> None:
+    try:
+        # One DELETE ... RETURNING; upload files are removed after it commits
+        count = delete_all_records(
+            db, spec.model, f"delete_all_{spec.plural}", file_fields=spec.file_fields)
+    except Exception as e:
+        db.rollback()
+        logger.error(
+            "Error deleting records",
+            extra=log_fields(form_type=spec.model.__tablename__, error=str(e)))
+        raise HTTPException(
+            status_code=500, detail=f"Error deleting {spec.label}s: {str(e)}")
+
+    logger.info(
+        "Deleted records", extra=log_fields(form_type=spec.model.__tablename__, count=count))
+
+
+# ============================================================================
+# ATTACHMENT BUNDLES
+# ============================================================================
+
+def attachment_entries(spec: FormSpec, record, folder: str = "") -> List[Tuple[str, str]]:
+    """
+    (name in the archive, path) of every file of a record.
+
+    Files are named after their input, e.g. "flight_itinerary.pdf".
+    """
+    form_data = record.form_data or {}
+    entries = []
+    for field in spec.file_fields:
+        path = form_data.get(field)
+        if path:
+            name = field[:-len("_path")] + os.path.splitext(path)[1]
+            entries.append((f"{folder}{name}", path))
+    return entries
+
+
+def record_attachments(spec: FormSpec, db: Session, request_id: int):
+    entries = attachment_entries(spec, get_record(spec, db, request_id))
+    if not entries:
+        raise HTTPException(status_code=404, detail=f"{spec.label} has no attachments")
+    return zip_response(entries, f"{spec.name}_{request_id}_attachments.zip")
+
+
+def student_attachments(db: Session, ucf_id: str):
+    """
+    Every file a student uploaded, one folder per submission.
+
+    Archive layout: <form path>/<record id>/<input>.<ext>
+    """
+    entries = []
+    for spec in FORMS:
+        if not spec.file_fields:
+            continue
+        records = (
+            db.query(spec.model)
+            .filter(spec.model.student_id == ucf_id)
+            .order_by(spec.model.id)
+            .all()
+        )
+        for record in records:
+            entries.extend(attachment_entries(spec, record, f"{spec.path}/{record.id}/"))
+    if not entries:
+        raise HTTPException(status_code=404, detail="No attachments for this student")
+    safe_id = "".join(c if c.isalnum() else "_" for c in ucf_id)
+    return zip_response(entries, f"student_{safe_id}_attachments.zip")
+
+
+# ============================================================================
+# ROUTE REGISTRATION
+# ============================================================================
+
+def _named(endpoint, name: str):
+    endpoint.__name__ = endpoint.__qualname__ = name
+    return endpoint
+
+
+def _create_endpoint(spec: FormSpec):
+    if spec.form_class is not None:
+        form_class = spec.form_class
+
+        async def create(form: form_class = Depends(form_class.parse), db: Session = Depends(get_db)):
+            return await create_record(spec, form, db)
+    else:
+        create_schema = spec.create_schema
+
+        async def create(request: create_schema, db: Session = Depends(get_db)):
+            return await create_record(spec, request, db)
+
+    return _named(create, f"create_{spec.name}")
+
+
+def add_form_routes(router: APIRouter, spec: FormSpec) -> None:
+    """
+    Register the create/list/get/delete/delete-all routes of one form, and
+    the attachments download if it has file inputs.
+
+    Args:
+        router: Router to add the routes to (the API router in app/routes.py)
+        spec: The form to expose under /<spec.path>/
+    """
+    collection = f"/{spec.path}/"
+    item = f"/{spec.path}/{{request_id}}"
+
+    create = _create_endpoint(spec)
+    router.add_api_route(
+        collection, create, methods=["POST"], name=create.__name__,
+        response_model=spec.schema, description=f"Submit a {spec.label}",
+        openapi_extra=spec.form_class.openapi_extra() if spec.form_class is not None else None)
+
+    def get_list(
+        skip: int = Query(0, ge=0),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        before_id: Optional[int] = Query(None, ge=1),
+        db: Session = Depends(get_db)
+    ):
+        return list_records(spec, db, skip, limit, before_id)
+
+    router.add_api_route(
+        collection, _named(get_list, f"get_{spec.plural}"), methods=["GET"],
+        name=f"get_{spec.plural}", response_model=List[spec.schema],
+        description=f"List {spec.label}s, newest first")
+
+    def get_one(request_id: int, db: Session = Depends(get_db)):
+        return get_record(spec, db, request_id)
+
+    router.add_api_route(
+        item, _named(get_one, f"get_{spec.name}"), methods=["GET"],
+        name=f"get_{spec.name}", response_model=spec.schema,
+        description=f"Retrieve a specific {spec.label}")
+
+    def delete_one(request_id: int, db: Session = Depends(get_db)):
+        delete_record(spec, db, request_id)
+
+    router.add_api_route(
+        item, _named(delete_one, f"delete_{spec.name}"), methods=["DELETE"],
+        name=f"delete_{spec.name}", status_code=204,
+        description=f"Delete a specific {spec.label} and its uploaded files")
+
+    def delete_every(db: Session = Depends(get_db)):
+        delete_all(spec, db)
+
+    router.add_api_route(
+        collection, _named(delete_every, f"delete_all_{spec.plural}"), methods=["DELETE"],
+        name=f"delete_all_{spec.plural}", status_code=204,
+        description=f"Delete all {spec.label}s and their uploaded files")
+
+    if spec.file_fields:
+        def get_attachments(request_id: int, db: Session = Depends(get_db)):
+            return record_attachments(spec, db, request_id)
+
+        router.add_api_route(
+            f"{item}/attachments.zip", _named(get_attachments, f"get_{spec.name}_attachments"),
+            methods=["GET"], name=f"get_{spec.name}_attachments", response_class=StreamingResponse,
+            description=f"Download the files of a {spec.label} as a ZIP")
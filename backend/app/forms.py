@@ -0,0 +1,439 @@
+"""
+Form submission models for the multipart/urlencoded create endpoints.
+
+One MultipartForm subclass per form (see app/multipart.py). Field order
+follows the form; field names are the form_data keys. Inputs that are
+stored under a different key use validation_alias, e.g. `ucf_email` is
+saved as `email`. FormBool marks checkbox strings, plain bool fields are
+parsed strictly.
+"""
+
+from typing import Optional
+
+from fastapi import UploadFile
+from pydantic import Field
+
+from app.multipart import FormBool, MultipartForm
+
+
+# ============================================================================
+# ACADEMIC TRAINING
+# ============================================================================
+
+class AcademicTrainingSubmission(MultipartForm):
+    record_fields = frozenset({"student_name", "program", "comments"})
+
+    # Required fields
+    student_name: str
+    ucf_id: str = Field(validation_alias="student_id")
+    program: str
+    completion_type: str
+
+    # Personal Information
+    sevis_id: Optional[str] = None
+    given_name: Optional[str] = None
+    family_name: Optional[str] = None
+    legal_sex: Optional[str] = None
+    date_of_birth: Optional[str] = None
+    city_of_birth: Optional[str] = None
+    country_of_birth: Optional[str] = None
+    country_of_citizenship: Optional[str] = None
+    country_of_legal_residence: Optional[str] = None
+
+    # U.S. Address
+    has_us_address: FormBool = True
+    street_address: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    country: Optional[str] = None
+
+    # Contact Information
+    us_telephone: Optional[str] = None
+    non_us_telephone: Optional[str] = None
+
+    # Questionnaire
+    enrolled_full_time: FormBool = None
+    academic_training_start_date: Optional[str] = None
+    academic_training_end_date: Optional[str] = None
+    employed_on_campus: FormBool = None
+    previously_authorized: FormBool = None
+
+    # Statements of Agreement
+    understand_pre_completion: FormBool = None
+    understand_post_completion: FormBool = None
+    understand_medical_insurance: FormBool = None
+    understand_employer_specific: FormBool = None
+    understand_consult_advisor: FormBool = None
+
+    # Submission
+    comments: Optional[str] = None
+    certify_information: FormBool = None
+
+    # File uploads
+    offer_letter: Optional[UploadFile] = None
+    training_authorization: Optional[UploadFile] = None
+
+
+# ============================================================================
+# OPT
+# ============================================================================
+
+class OPTRequestSubmission(MultipartForm):
+    ucf_id: str
+    given_name: str
+    family_name: str
+    date_of_birth: str
+    legal_sex: str
+    country_of_citizenship: str
+    academic_level: str
+    academic_program: str
+    address: str
+    address2: Optional[str] = None
+    city: str
+    state: str
+    postal_code: str
+    email: str = Field(validation_alias="ucf_email_address")
+    secondary_email_address: Optional[str] = None
+    telephone_number: str
+    information_correct: bool
+    full_time_student: Optional[str] = None
+    intent_to_graduate: Optional[str] = None
+    semester_of_graduation: Optional[str] = None
+    desired_opt_start_date: Optional[str] = None
+    desired_opt_end_date: Optional[str] = None
+    currently_employed_on_campus: Optional[str] = None
+    previous_opt_authorization: Optional[str] = None
+
+    # File uploads
+    photo2x2: Optional[UploadFile] = None
+    passport_biographical: Optional[UploadFile] = None
+    f1_visa_or_uscis_notice: Optional[UploadFile] = None
+    i94: Optional[UploadFile] = None
+    form_i765: Optional[UploadFile] = None
+    form_g1145: Optional[UploadFile] = None
+    previous_i20s: Optional[UploadFile] = None
+    previous_ead: Optional[UploadFile] = None
+
+    # Acknowledgements
+    opt_workshop_completed: bool
+    opt_request_timeline: bool
+    ead_card_copy: bool
+    report_changes: bool
+    unemployment_limit: bool
+    employment_start_date: bool
+
+
+class OptStemExtensionApplicationSubmission(MultipartForm):
+    ucf_id: str
+    given_name: str
+    family_name: str
+    date_of_birth: Optional[str] = None
+    gender: Optional[str] = None
+    country_of_citizenship: Optional[str] = None
+    academic_level: Optional[str] = None
+    academic_program: Optional[str] = None
+    address: Optional[str] = None
+    address_2: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    postal_code: Optional[str] = None
+    email: Optional[str] = Field(None, validation_alias="ucf_email_address")
+    secondary_email_address: Optional[str] = None
+    telephone_number: Optional[str] = None
+
+    # Employment
+    job_title: Optional[str] = None
+    employer_name: Optional[str] = None
+    employer_ein: Optional[str] = None
+    employment_street_address: Optional[str] = None
+    employment_city: Optional[str] = None
+    employment_state: Optional[str] = None
+    employment_postal_code: Optional[str] = None
+    supervisor_given_name: Optional[str] = None
+    supervisor_family_name: Optional[str] = None
+    supervisor_email: Optional[str] = None
+    supervisor_telephone: Optional[str] = None
+    hours_per_week: Optional[str] = None
+    is_paid_position: FormBool = None
+    is_staffing_firm: FormBool = None
+    has_e_verify: FormBool = None
+
+    # Eligibility and acknowledgements
+    based_on_previous_stem_degree: FormBool = None
+    completed_stem_workshop: FormBool = None
+    provide_ead_copy: FormBool = None
+    understand_unemployment_limits: FormBool = None
+    notify_changes: FormBool = None
+    submit_updated_i983: FormBool = None
+    comply_reporting_requirements: FormBool = None
+    reviewed_photo_requirements: FormBool = None
+    reviewed_fee_payment: FormBool = None
+
+    # File uploads (all optional)
+    photo_2x2: Optional[UploadFile] = None
+    form_i983: Optional[UploadFile] = None
+    passport: Optional[UploadFile] = None
+    f1_visa: Optional[UploadFile] = None
+    i94: Optional[UploadFile] = None
+    ead_card: Optional[UploadFile] = None
+    form_i765: Optional[UploadFile] = None
+    form_g1145: Optional[UploadFile] = None
+    diploma: Optional[UploadFile] = None
+    transcripts: Optional[UploadFile] = None
+    previous_i20s: Optional[UploadFile] = None
+
+
+# ============================================================================
+# EMPLOYMENT AND LEAVE
+# ============================================================================
+
+class FloridaStatute101035Submission(MultipartForm):
+    ucf_id: str
+    given_name: str
+    family_name: str
+    date_of_birth: str
+    telephone_number: str
+    email: str
+    sevis_number: Optional[str] = None
+    college: str
+    department: str
+    position: str
+    has_passport: str
+    has_ds160: str
+    passport_document: Optional[UploadFile] = None
+
+
+class LeaveRequestSubmission(MultipartForm):
+    ucf_id: str = Field(validation_alias="employee_id")
+    given_name: str
+    family_name: str
+    leave_type: str
+    from_date: str
+    from_time: str
+    to_date: str
+    to_time: str
+    hours_requested: str
+    reason: str
+    course_name: Optional[str] = None
+    documentation: Optional[UploadFile] = None
+
+
+# ============================================================================
+# DEPARTURE AND TRANSFER
+# ============================================================================
+
+class ExitFormSubmission(MultipartForm):
+    ucf_id: str
+    sevis_id: Optional[str] = None
+    visa_type: Optional[str] = None
+    given_name: str
+    family_name: str
+    us_street_address: Optional[str] = None
+    apartment_number: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    postal_code: Optional[str] = None
+    foreign_street_address: Optional[str] = None
+    foreign_city: Optional[str] = None
+    foreign_postal_code: Optional[str] = None
+    country: Optional[str] = None
+    email: str = Field(validation_alias="ucf_email")
+    secondary_email: Optional[str] = None
+    us_telephone: Optional[str] = None
+    foreign_telephone: Optional[str] = None
+    education_level: Optional[str] = None
+    employed_on_campus: Optional[str] = None
+    departure_date: Optional[str] = None
+    flight_itinerary: Optional[UploadFile] = None
+    departure_reason: Optional[str] = None
+    work_authorization_acknowledgment: FormBool = None
+    cpt_opt_acknowledgment: FormBool = None
+    financial_obligations_acknowledgment: FormBool = None
+    remarks: Optional[str] = None
+
+
+class GlobalTransferOutSubmission(MultipartForm):
+    # Student Information
+    ucf_id: str = "Unknown"
+    sevis_id: Optional[str] = None
+    visa_type: Optional[str] = None
+    given_name: Optional[str] = None
+    family_name: Optional[str] = None
+    street_address: Optional[str] = None
+    apartment_number: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    postal_code: Optional[str] = None
+    email: Optional[str] = Field(None, validation_alias="ucf_email_address")
+    secondary_email_address: Optional[str] = None
+    us_telephone_number: Optional[str] = None
+
+    # Current Academic Information
+    ucf_education_level: Optional[str] = None
+    campus_employment: Optional[str] = None
+
+    # New School Information
+    new_school_name: Optional[str] = None
+    new_school_start_date: Optional[str] = None
+    desired_sevis_release_date: Optional[str] = None
+    new_school_international_advisor_name: Optional[str] = None
+    new_school_international_advisor_email: Optional[str] = None
+    new_school_international_advisor_phone: Optional[str] = None
+
+    # Additional Information Checkboxes
+    understanding_sevis_release: FormBool = None
+    permission_to_communicate: FormBool = None
+    understanding_work_authorization: FormBool = None
+    understanding_financial_obligations: FormBool = None
+
+    # File uploads
+    admission_letter: Optional[UploadFile] = None
+
+
+# ============================================================================
+# PATHWAY PROGRAMS
+# ============================================================================
+
+class PathwayProgramsIntentToProgressSubmission(MultipartForm):
+    ucf_id: str = "Unknown"
+    given_name: Optional[str] = None
+    family_name: Optional[str] = None
+    date_of_birth: Optional[str] = None
+    ethnicity: Optional[str] = None
+    street_address: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    postal_code: Optional[str] = None
+    country: Optional[str] = None
+    ucf_global_program: Optional[str] = None
+    emergency_contact_name: Optional[str] = None
+    certification: FormBool = None
+    has_accelerated_credits: FormBool = None
+    attended_other_institutions: FormBool = None
+    disciplinary_action: FormBool = None
+    felony_conviction: FormBool = None
+    criminal_proceedings: FormBool = None
+    expected_progression_term: Optional[str] = None
+    academic_credits_earned: Optional[str] = None
+    intended_major: Optional[str] = None
+    sat_total_score: Optional[str] = None
+    sat_date_taken: Optional[str] = None
+    act_total_score: Optional[str] = None
+    act_date_taken: Optional[str] = None
+    emergency_contact_relationship: Optional[str] = None
+    emergency_contact_street_address: Optional[str] = None
+    emergency_contact_city: Optional[str] = None
+    emergency_contact_state: Optional[str] = None
+    emergency_contact_postal_code: Optional[str] = None
+    emergency_contact_country: Optional[str] = None
+    emergency_contact_phone: Optional[str] = None
+
+
+class PathwayProgramsNextStepsSubmission(MultipartForm):
+    # Personal Information
+    ucf_id: str = "Unknown"
+    given_name: Optional[str] = None
+    family_name: Optional[str] = None
+    legal_sex: Optional[str] = None
+    email: Optional[str] = None
+    phone_number: Optional[str] = None
+
+    # Academic Information
+    academic_program: Optional[str] = None
+    academic_track: Optional[str] = None
+    intended_major: Optional[str] = None
+
+    # Dietary Requirements
+    dietary_requirements: Optional[str] = None
+
+    # Housing
+    housing_selection: Optional[str] = None
+
+    # Acknowledgements
+    program_acknowledgement: FormBool = None
+    housing_acknowledgement: FormBool = None
+    health_insurance_acknowledgement: FormBool = None
+
+
+# ============================================================================
+# ENROLLMENT
+# ============================================================================
+
+class ReducedCourseLoadSubmission(MultipartForm):
+    # Student Information
+    ucf_id: str = "Unknown"
+    sevis_id: Optional[str] = None
+    visa_type: Optional[str] = None
+    given_name: Optional[str] = None
+    family_name: Optional[str] = None
+    street_address: Optional[str] = None
+    apartment_number: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    postal_code: Optional[str] = None
+    email: Optional[str] = Field(None, validation_alias="ucf_email_address")
+    secondary_email_address: Optional[str] = None
+    us_telephone_number: Optional[str] = None
+
+    # Academic Information
+    academic_level: Optional[str] = None
+    academic_program_major: Optional[str] = None
+    rcl_term: Optional[str] = None
+    rcl_year: Optional[str] = None
+    desired_credits: Optional[str] = None
+    in_person_credits: Optional[str] = None
+
+    # RCL Reason
+    rcl_reason: Optional[str] = None
+
+
+class VirtualCheckInSubmission(MultipartForm):
+    record_fields = frozenset({"remarks"})
+
+    # Personal Information
+    ucf_id: str
+    sevis_id: Optional[str] = None
+    given_name: str
+    family_name: str
+    visa_type: str  # F-1 or J-1
+
+    # U.S. Address (required)
+    street_address: str
+    apartment_number: Optional[str] = None
+    city: str
+    state: str
+    postal_code: str
+    us_telephone: Optional[str] = None
+    has_us_telephone: bool = True
+    email: str = Field(validation_alias="ucf_email")
+    secondary_email: Optional[str] = None
+
+    # Emergency Contact
+    emergency_given_name: Optional[str] = None
+    emergency_family_name: Optional[str] = None
+    emergency_relationship: Optional[str] = None
+    emergency_street_address: Optional[str] = None
+    emergency_city: Optional[str] = None
+    emergency_state_province: Optional[str] = None
+    emergency_country: Optional[str] = None
+    emergency_postal_code: Optional[str] = None
+    emergency_us_telephone: Optional[str] = None
+    emergency_non_us_telephone: Optional[str] = None
+    emergency_has_us_telephone: bool = True
+    emergency_has_non_us_telephone: bool = True
+    emergency_email: Optional[str] = None
+
+    # Required Documents
+    visa_notice_of_action: Optional[UploadFile] = None
+    form_i94: Optional[UploadFile] = None
+    passport: Optional[UploadFile] = None
+    other_documents: Optional[UploadFile] = None
+
+    # Dependent(s) Information - placeholder for future expansion
+    has_dependents: bool = False
+
+    # Submission
+    authorization_checked: bool
+
+    # Remarks
+    remarks: Optional[str] = None
@@ -0,0 +1,185 @@
+"""
+Group-commit writer for form inserts.
+
+commit_to_db() normally pays for one COMMIT (and fsync) per submission.
+With GROUP_COMMIT enabled, inserts are handed to a single writer thread
+instead. It collects every insert that arrives within a short window,
+writes them in one transaction using INSERT ... RETURNING, and hands each
+caller back its own primary key.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from app.database import engine
+from app.transactions import is_transient_db_error, retry_transient
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+GROUP_COMMIT = os.getenv("GROUP_COMMIT", "false").lower() in ['true', 'yes', '1', 'on']
+
+# How long the writer waits for more inserts after the first one arrives
+GROUP_COMMIT_WINDOW_MS = float(os.getenv("GROUP_COMMIT_WINDOW_MS", "2"))
+
+# Upper bound on inserts coalesced into a single transaction
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("GROUP_COMMIT_MAX_BATCH", "500"))
+
+
+def record_to_values(record) -> Dict:
+    """
+    Extract the column values that have been set on an unsaved record.
+
+    Unset columns are left out so their column defaults still apply, the
+    same way the ORM would insert the record.
+    """
+    state = record.__dict__
+    return {
+        column.key: state[column.key]
+        for column in record.__table__.columns
+        if column.key in state and not (column.primary_key and state[column.key] is None)
+    }
+
+
+class GroupCommitWriter:
+    """
+    Coalesce concurrent single-row inserts into batched transactions.
+
+    Example:
+        writer = GroupCommitWriter(engine)
+        db_request = create_db_record(models.ExitForm, ...)
+        db_request.id = writer.insert(db_request)
+    """
+
+    def __init__(
+        self,
+        bind: Engine,
+        window_ms: float = GROUP_COMMIT_WINDOW_MS,
+        max_batch: int = GROUP_COMMIT_MAX_BATCH
+    ):
+        self.bind = bind
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Optional[Tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------------
+
+    def submit(self, record) -> Future:
+        """Queue a record for insertion; the future resolves to its new ID."""
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((record.__table__, record_to_values(record), future))
+        return future
+
+    def insert(self, record) -> int:
+        """Insert a record in the next group commit and return its new ID."""
+        return self.submit(record).result()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Flush anything still queued and stop the writer thread."""
+        with self._lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    # ------------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="group-commit-writer", daemon=True)
+                self._thread.start()
+
+    def _collect(self, first: Tuple) -> Tuple[List[Tuple], bool]:
+        """Gather inserts arriving within the window after the first one."""
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, stopping = self._collect(first)
+            self._write(batch)
+            if stopping:
+                # Drain whatever raced in ahead of the stop marker
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        return
+                    if item is not None:
+                        self._write([item])
+
+    def _write(self, batch: List[Tuple]) -> None:
+        """
+        Insert a batch in one transaction.
+
+        Rows are grouped by table and column set so each group is a single
+        executemany INSERT ... RETURNING id. Lock errors are retried with
+        backoff until the retry deadline, after which every caller gets the
+        error at once. Any other failure (e.g. an IntegrityError on one row)
+        retries every row on its own so one bad row only fails its own caller.
+        """
+        groups: Dict[Tuple, List[Tuple]] = {}
+        for table, values, future in batch:
+            groups.setdefault((table, tuple(sorted(values))), []).append((table, values, future))
+
+        def attempt():
+            results = []
+            with self.bind.begin() as conn:
+                for (table, _), items in groups.items():
+                    statement = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+                    ids = conn.execute(statement, [values for _, values, _ in items]).scalars().all()
+                    results.extend(zip(items, ids))
+            return results
+
+        try:
+            results = retry_transient(attempt, "group_commit")
+        except Exception as e:
+            if len(batch) > 1 and not is_transient_db_error(e):
+                for item in batch:
+                    self._write([item])
+            else:
+                # Still locked after the whole retry deadline; writing the rows
+                # one by one would wait out the deadline again for each of them
+                for _, _, future in batch:
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), record_id in results:
+            future.set_result(record_id)
+
+
+group_commit_writer = GroupCommitWriter(engine)
@@ -0,0 +1,409 @@
+"""
+Idempotency-Key support for form submissions.
+
+Clients on flaky connections can send an `Idempotency-Key` header with the
+POST of a form submission. The first request with a given key runs normally
+and its successful response (status, headers and body) is stored in the
+idempotency_keys table, together with a hash of the request body. Retries
+with the same key get the stored response back without the route running
+again, so files aren't re-saved and no duplicate row is created. A retry
+that arrives while the first request is still running waits for it to
+finish instead of racing it.
+
+A key reused with a different body gets 422 instead of someone else's
+response. The random multipart boundary is left out of the hash, so a
+browser resending the same form still matches.
+
+Stored keys expire after IDEMPOTENCY_TTL_SECONDS.
+"""
+
+import asyncio
+import hashlib
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+from starlette.formparsers import parse_options_header
+from starlette.responses import JSONResponse, Response
+
+from app import models
+from app.database import SessionLocal
+from app.transactions import transactional
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+
+# How long a completed response is replayed for
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 60 * 60)))
+
+# An in-flight claim older than this is assumed dead and can be taken over
+IDEMPOTENCY_LOCK_TIMEOUT_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT_SECONDS", "120"))
+
+# How long a duplicate waits for the in-flight request before giving up with 409
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "60"))
+
+# How often a waiting duplicate re-checks the table (requests in other workers)
+IDEMPOTENCY_POLL_SECONDS = 0.1
+
+MAX_KEY_LENGTH = 255
+
+# Response headers not stored for replay (recomputed for the replayed body)
+UNSTORED_RESPONSE_HEADERS = {"content-length", "transfer-encoding", "connection"}
+
+# Expired keys are purged at most this often
+PURGE_INTERVAL_SECONDS = 300
+
+KEY_IN_PROGRESS = "in_progress"
+KEY_COMPLETED = "completed"
+
+# Claim outcomes
+CLAIMED = "claimed"
+REPLAY = "replay"
+BUSY = "busy"
+MISMATCH = "mismatch"
+
+
+# ============================================================================
+# REQUEST FINGERPRINT
+# ============================================================================
+
+class RequestFingerprint:
+    """
+    SHA-256 of a request's media type and body, fed as the body streams in.
+
+    A multipart boundary is random per request, so every occurrence of it
+    is hashed as a bare "--"; the same form sent again hashes the same.
+
+    Example:
+        fingerprint = RequestFingerprint("multipart/form-data; boundary=xyz")
+        fingerprint.update(b"--xyz\r\n...")
+        fingerprint.hexdigest()
+    """
+
+    def __init__(self, content_type: Optional[str]):
+        media_type, options = parse_options_header(content_type)
+        self._hash = hashlib.sha256(media_type + b"\n")
+        boundary = options.get(b"boundary") if media_type.startswith(b"multipart/") else None
+        self._boundary = b"--" + boundary if boundary else None
+        # Tail that may hold the start of a boundary split across chunks
+        self._pending = b""
+        self.complete = False
+
+    def update(self, chunk: bytes) -> None:
+        if self._boundary is None:
+            self._hash.update(chunk)
+            return
+        data = (self._pending + chunk).replace(self._boundary, b"--")
+        keep = len(self._boundary) - 1
+        self._hash.update(data[:-keep])
+        self._pending = data[-keep:]
+
+    def hexdigest(self) -> str:
+        self._hash.update(self._pending)
+        self._pending = b""
+        return self._hash.hexdigest()
+
+    def wrap(self, receive):
+        """An ASGI receive callable that feeds the body to this fingerprint."""
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request":
+                self.update(message.get("body", b""))
+                if not message.get("more_body", False):
+                    self.complete = True
+            return message
+        return receive_wrapper
+
+    async def read_rest(self, receive) -> None:
+        """Receive whatever the app left unread (stops early on disconnect)."""
+        while not self.complete:
+            message = await receive()
+            if message["type"] != "http.request":
+                return
+            self.update(message.get("body", b""))
+            self.complete = not message.get("more_body", False)
+
+
+# ============================================================================
+# KEY STORE (synchronous - run via run_in_threadpool)
+# ============================================================================
+
+_last_purge = datetime.min
+
+
+def _purge_expired(db, now: datetime) -> None:
+    global _last_purge
+    if (now - _last_purge).total_seconds() < PURGE_INTERVAL_SECONDS:
+        return
+    _last_purge = now
+    db.execute(delete(models.IdempotencyRecord).where(
+        models.IdempotencyRecord.expires_at < now))
+    db.commit()
+
+
+@transactional("idempotency_claim")
+def claim_key(key: str, path: str) -> Tuple[str, Optional[models.IdempotencyRecord]]:
+    """
+    Try to claim an idempotency key for a new request.
+
+    Args:
+        key: Idempotency-Key header value
+        path: Request path the key is being used for
+
+    Returns:
+        (outcome, record) where outcome is one of:
+        CLAIMED   - this request owns the key and should run
+        REPLAY    - a completed response is stored in record
+        BUSY      - another request with this key is still running
+        MISMATCH  - the key was already used for a different endpoint
+    """
+    now = datetime.now()
+    db = SessionLocal()
+    try:
+        _purge_expired(db, now)
+
+        db.add(models.IdempotencyRecord(
+            key=key,
+            request_path=path,
+            status=KEY_IN_PROGRESS,
+            locked_at=now,
+            expires_at=now + timedelta(seconds=IDEMPOTENCY_TTL_SECONDS),
+        ))
+        try:
+            db.commit()
+            return CLAIMED, None
+        except IntegrityError:
+            db.rollback()
+
+        existing = db.query(models.IdempotencyRecord).filter(
+            models.IdempotencyRecord.key == key).first()
+        if existing is None:
+            # Released between our insert and this read - try again
+            return BUSY, None
+
+        if existing.expires_at < now:
+            db.delete(existing)
+            db.commit()
+            return BUSY, None
+
+        if existing.request_path != path:
+            return MISMATCH, existing
+
+        if existing.status == KEY_COMPLETED:
+            return REPLAY, existing
+
+        # Take over a claim whose owner appears to have died
+        stale_before = now - timedelta(seconds=IDEMPOTENCY_LOCK_TIMEOUT_SECONDS)
+        if existing.locked_at < stale_before:
+            result = db.execute(
+                update(models.IdempotencyRecord)
+                .where(models.IdempotencyRecord.key == key)
+                .where(models.IdempotencyRecord.locked_at == existing.locked_at)
+                .values(locked_at=now)
+            )
+            db.commit()
+            if result.rowcount == 1:
+                return CLAIMED, None
+
+        return BUSY, None
+    finally:
+        db.close()
+
+
+@transactional("idempotency_complete")
+def complete_key(
+    key: str,
+    request_hash: str,
+    status_code: int,
+    headers: List[List[str]],
+    body: bytes
+) -> None:
+    """
+    Store the response for a claimed key so retries can replay it.
+
+    Args:
+        key: Idempotency-Key header value
+        request_hash: RequestFingerprint of the request that claimed the key
+        status_code: Response status
+        headers: Response headers as [name, value] pairs
+        body: Response body
+    """
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(models.IdempotencyRecord)
+            .where(models.IdempotencyRecord.key == key)
+            .values(
+                status=KEY_COMPLETED,
+                request_hash=request_hash,
+                response_status=status_code,
+                response_headers=headers,
+                response_body=body.decode("utf-8"),
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+@transactional("idempotency_release")
+def release_key(key: str) -> None:
+    """Drop a claim whose request failed, so a retry runs the request again."""
+    db = SessionLocal()
+    try:
+        db.execute(delete(models.IdempotencyRecord).where(
+            models.IdempotencyRecord.key == key))
+        db.commit()
+    finally:
+        db.close()
+
+
+# ============================================================================
+# ASGI MIDDLEWARE
+# ============================================================================
+
+class IdempotencyMiddleware:
+    """
+    Apply Idempotency-Key semantics to form submissions that send the header.
+
+    Other requests, and submissions without the header, are passed straight
+    through. Only 2xx responses are stored; any other outcome releases the
+    key so the client can retry.
+
+    Args:
+        paths: POST paths to apply it to, e.g. "/api/exit-forms/"
+            (see submission_paths() in app/form_registry.py)
+    """
+
+    def __init__(self, app, paths: Iterable[str]):
+        self.app = app
+        self.paths = frozenset(paths)
+        # Requests in this process currently running for a key
+        self._inflight: Dict[str, asyncio.Event] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        key = (_header(scope, IDEMPOTENCY_HEADER) or "").strip()
+        if not key:
+            await self.app(scope, receive, send)
+            return
+
+        if len(key) > MAX_KEY_LENGTH:
+            response = JSONResponse(
+                status_code=400,
+                content={"detail": f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters"})
+            await response(scope, receive, send)
+            return
+
+        path = scope["path"]
+        fingerprint = RequestFingerprint(_header(scope, b"content-type"))
+        outcome, record = await self._wait_for_claim(key, path)
+
+        if outcome == REPLAY:
+            await fingerprint.read_rest(receive)
+            if record.request_hash != fingerprint.hexdigest():
+                response = JSONResponse(
+                    status_code=422,
+                    content={"detail": "Idempotency-Key was already used with a different request body"})
+                await response(scope, receive, send)
+                return
+            response = Response(content=record.response_body, status_code=record.response_status)
+            response.raw_headers.extend(
+                (name.encode("latin-1"), value.encode("latin-1"))
+                for name, value in record.response_headers or [])
+            response.raw_headers.append((b"idempotent-replayed", b"true"))
+            await response(scope, receive, send)
+            return
+
+        if outcome == MISMATCH:
+            response = JSONResponse(
+                status_code=422,
+                content={"detail": "Idempotency-Key was already used for a different endpoint"})
+            await response(scope, receive, send)
+            return
+
+        if outcome == BUSY:
+            response = JSONResponse(
+                status_code=409,
+                content={"detail": "A request with this Idempotency-Key is still being processed"})
+            await response(scope, receive, send)
+            return
+
+        await self._run_and_store(key, fingerprint, scope, receive, send)
+
+    async def _wait_for_claim(self, key: str, path: str):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + IDEMPOTENCY_WAIT_SECONDS
+        while True:
+            event = self._inflight.get(key)
+            if event is not None:
+                # Same-process duplicate: wait for the owner to finish
+                remaining = deadline - loop.time()
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=max(remaining, 0))
+                except asyncio.TimeoutError:
+                    return BUSY, None
+                continue
+
+            self._inflight[key] = asyncio.Event()
+            try:
+                outcome, record = await run_in_threadpool(claim_key, key, path)
+            except BaseException:
+                # A failed or cancelled claim must not leave waiters blocked on the key
+                self._inflight.pop(key).set()
+                raise
+            if outcome != CLAIMED:
+                self._inflight.pop(key).set()
+            if outcome != BUSY or loop.time() >= deadline:
+                return outcome, record
+
+            # Owned by another worker process - poll until it completes
+            await asyncio.sleep(IDEMPOTENCY_POLL_SECONDS)
+
+    async def _run_and_store(self, key: str, fingerprint: RequestFingerprint, scope, receive, send):
+        status_code = None
+        headers: List[List[str]] = []
+        body = bytearray()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers.extend(
+                    [name.decode("latin-1"), value.decode("latin-1")]
+                    for name, value in message.get("headers", [])
+                    if name.decode("latin-1").lower() not in UNSTORED_RESPONSE_HEADERS)
+            elif message["type"] == "http.response.body":
+                body.extend(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, fingerprint.wrap(receive), send_wrapper)
+        finally:
+            try:
+                if status_code is not None and 200 <= status_code < 300:
+                    # The hash covers the whole body, including anything the route didn't read
+                    await fingerprint.read_rest(receive)
+                    await run_in_threadpool(
+                        complete_key, key, fingerprint.hexdigest(), status_code, headers, bytes(body))
+                else:
+                    await run_in_threadpool(release_key, key)
+            finally:
+                self._inflight.pop(key).set()
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for header, value in scope["headers"]:
+        if header == name:
+            return value.decode("latin-1")
+    return None
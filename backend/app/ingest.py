@@ -0,0 +1,275 @@
+"""
+Durable submission ingest queue.
+
+When INGEST_MODE is enabled, create routes no longer insert into the form
+tables directly. The validated record is appended to the ingest journal
+(a separate SQLite file, see app.database) and the client gets a receipt ID
+back immediately. A background worker drains queued receipts into the form
+tables in batched transactions, and the receipt status can be polled at
+GET /api/ingest/receipts/{receipt_id}.
+
+Delivery is at-least-once: if the process dies after the form rows are
+committed but before the receipts are marked, those receipts are drained
+again on the next start.
+"""
+
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import DateTime
+
+from app import models
+from app.database import Base, IngestSessionLocal, SessionLocal
+from app.logging_config import log_fields
+from app.transactions import is_transient_db_error
+
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+INGEST_MODE = os.getenv("INGEST_MODE", "false").lower() in ['true', 'yes', '1', 'on']
+
+# Maximum number of receipts drained into the form tables per transaction
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "200"))
+
+# Seconds the worker sleeps when the queue is empty and nothing wakes it
+INGEST_POLL_INTERVAL = float(os.getenv("INGEST_POLL_INTERVAL", "0.5"))
+
+RECEIPT_QUEUED = "queued"
+RECEIPT_COMMITTED = "committed"
+RECEIPT_FAILED = "failed"
+
+# Form models that can be drained, keyed by class name
+FORM_MODELS = {
+    mapper.class_.__name__: mapper.class_ for mapper in Base.registry.mappers
+}
+
+
+# ============================================================================
+# PAYLOAD (DE)SERIALIZATION
+# ============================================================================
+
+def record_to_payload(record) -> Dict[str, Any]:
+    """
+    Extract the column values of an unsaved form record as JSON-safe data.
+
+    Args:
+        record: Transient SQLAlchemy model instance (e.g. from create_db_record)
+
+    Returns:
+        Dictionary of column name to value, without the primary key
+    """
+    payload = {}
+    for column in record.__table__.columns:
+        if column.primary_key:
+            continue
+        value = getattr(record, column.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        payload[column.key] = value
+    return payload
+
+
+def payload_to_record(form_type: str, payload: Dict[str, Any]):
+    """
+    Rebuild a form record from a journal payload.
+
+    Args:
+        form_type: Model class name stored on the receipt
+        payload: Column values produced by record_to_payload()
+
+    Returns:
+        Transient model instance ready to be added to a session
+    """
+    model_class = FORM_MODELS[form_type]
+    values = dict(payload)
+    for column in model_class.__table__.columns:
+        if isinstance(column.type, DateTime) and isinstance(values.get(column.key), str):
+            values[column.key] = datetime.fromisoformat(values[column.key])
+    return model_class(**values)
+
+
+# ============================================================================
+# ENQUEUE
+# ============================================================================
+
+# Set whenever something is enqueued so the worker drains without waiting
+_work_available = threading.Event()
+
+
+def enqueue_record(record) -> models.IngestReceipt:
+    """
+    Append a form record to the durable ingest journal.
+
+    The journal commit is the acknowledgement point: once this returns, the
+    submission survives a crash and will be drained into its form table.
+
+    Args:
+        record: Transient SQLAlchemy model instance to persist later
+
+    Returns:
+        The committed IngestReceipt
+    """
+    receipt = models.IngestReceipt(
+        id=uuid.uuid4().hex,
+        form_type=type(record).__name__,
+        status=RECEIPT_QUEUED,
+        created_at=datetime.now(),
+        payload=record_to_payload(record),
+    )
+
+    ingest_db = IngestSessionLocal()
+    try:
+        ingest_db.add(receipt)
+        ingest_db.commit()
+    finally:
+        ingest_db.close()
+
+    _work_available.set()
+    return receipt
+
+
+# ============================================================================
+# DRAIN
+# ============================================================================
+
+def _insert_batch(receipts: List[models.IngestReceipt]) -> Dict[str, Any]:
+    """
+    Insert the records for a batch of receipts into the form tables.
+
+    The whole batch goes in one transaction. If that fails, the records are
+    retried one by one so a single bad payload can't block the rest.
+    Transient lock errors ("database is locked", see
+    app.transactions.is_transient_db_error) are raised instead, so the
+    receipts stay queued and are picked up on the next pass. Any other
+    error, including a non-transient OperationalError such as a missing
+    table or column, fails the receipt rather than retrying it forever.
+
+    Returns:
+        Dictionary mapping receipt ID to the new record ID or an Exception
+    """
+    results: Dict[str, Any] = {}
+    db = SessionLocal()
+    try:
+        records = [payload_to_record(r.form_type, r.payload) for r in receipts]
+        db.add_all(records)
+        db.flush()
+        ids = [record.id for record in records]
+        db.commit()
+        return {receipt.id: record_id for receipt, record_id in zip(receipts, ids)}
+    except Exception as e:
+        db.rollback()
+        if is_transient_db_error(e):
+            raise
+    finally:
+        db.close()
+
+    for receipt in receipts:
+        db = SessionLocal()
+        try:
+            record = payload_to_record(receipt.form_type, receipt.payload)
+            db.add(record)
+            db.flush()
+            record_id = record.id
+            db.commit()
+            results[receipt.id] = record_id
+        except Exception as e:
+            db.rollback()
+            if is_transient_db_error(e):
+                raise
+            results[receipt.id] = e
+        finally:
+            db.close()
+    return results
+
+
+def drain_ingest_queue(batch_size: int = INGEST_BATCH_SIZE) -> int:
+    """
+    Move up to batch_size queued submissions into their form tables.
+
+    Args:
+        batch_size: Maximum number of receipts to process in this pass
+
+    Returns:
+        Number of receipts processed (committed or failed)
+    """
+    ingest_db = IngestSessionLocal()
+    try:
+        receipts = ingest_db.query(models.IngestReceipt).filter(
+            models.IngestReceipt.status == RECEIPT_QUEUED
+        ).order_by(models.IngestReceipt.created_at).limit(batch_size).all()
+
+        if not receipts:
+            return 0
+
+        results = _insert_batch(receipts)
+
+        processed_at = datetime.now()
+        for receipt in receipts:
+            result = results[receipt.id]
+            receipt.processed_at = processed_at
+            if isinstance(result, Exception):
+                receipt.status = RECEIPT_FAILED
+                receipt.error = str(result)
+            else:
+                receipt.status = RECEIPT_COMMITTED
+                receipt.record_id = result
+        ingest_db.commit()
+
+        logger.info("Drained ingest receipts", extra=log_fields(count=len(receipts)))
+        return len(receipts)
+    finally:
+        ingest_db.close()
+
+
+# ============================================================================
+# BACKGROUND WORKER
+# ============================================================================
+
+class IngestWorker:
+    """Background thread that keeps draining the ingest queue."""
+
+    def __init__(self, batch_size: int = INGEST_BATCH_SIZE, poll_interval: float = INGEST_POLL_INTERVAL):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ingest-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the worker after draining whatever is still queued."""
+        self._stop.set()
+        _work_available.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            _work_available.clear()
+            try:
+                drained = drain_ingest_queue(self.batch_size)
+            except Exception:
+                logger.exception("Ingest worker error")
+                drained = 0
+
+            if drained:
+                continue
+            if self._stop.is_set():
+                return
+            _work_available.wait(self.poll_interval)
+
+
+ingest_worker = IngestWorker()
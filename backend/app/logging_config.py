@@ -0,0 +1,266 @@
+"""
+Structured, non-blocking logging.
+
+Request handlers log through the standard `logging` module. The records are
+put on an in-memory queue by a QueueHandler and written out by a
+QueueListener thread, so stdout I/O never happens on the request thread or
+the event loop. Formatting (JSON lines) and PII redaction also run on the
+listener thread.
+
+Usage in a module:
+    logger = logging.getLogger(__name__)
+    logger.info("Deleted OPT request", extra=log_fields(record_id=request_id))
+
+Structured values go in `log_fields(...)`. Keys that look like personal data
+(names, emails, phone numbers, dates of birth, addresses, passport/SEVIS
+numbers) are redacted, student IDs are masked and the student folder in
+upload paths is masked before anything is written.
+
+Configuration:
+    LOG_LEVEL        Minimum level for app.* loggers (default INFO)
+    LOG_SAMPLE_RATE  Fraction of DEBUG/INFO records kept (default 1.0);
+                     WARNING and above are never sampled out
+    LOG_QUEUE_SIZE   Records buffered before new ones are dropped (default 10000)
+"""
+
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Logger namespace configured by setup_logging() - every app module logs
+# through logging.getLogger(__name__), i.e. "app.routes", "app.ingest", ...
+APP_LOGGER_NAME = "app"
+
+REDACTED = "[REDACTED]"
+
+# Field names containing any of these fragments are fully redacted
+PII_KEY_FRAGMENTS = (
+    "name", "email", "phone", "telephone", "birth", "address",
+    "street", "passport", "sevis", "ssn",
+)
+
+# Identifier fields that are masked down to their last two characters
+ID_KEYS = {"ucf_id", "student_id", "employee_id"}
+
+# SQLAlchemy error strings end with the SQL and its bound parameters
+_SQL_DETAIL = re.compile(r"\s*\[(SQL|parameters): .*", re.DOTALL)
+
+
+def log_fields(**fields) -> Dict[str, Dict[str, Any]]:
+    """
+    Build the `extra` argument for a structured log call.
+
+    Example:
+        logger.info("Saved file", extra=log_fields(field="passport", path=path))
+    """
+    return {"fields": fields}
+
+
+# ============================================================================
+# REDACTION
+# ============================================================================
+
+def mask_id(value: Any) -> str:
+    """Mask an identifier, keeping only its last two characters."""
+    text = str(value)
+    if len(text) <= 2:
+        return "*" * len(text)
+    return "*" * (len(text) - 2) + text[-2:]
+
+
+def mask_path(path: Any) -> str:
+    """Mask the student folder (the file's parent directory) in an upload path."""
+    text = str(path)
+    directory, filename = os.path.split(text)
+    if not directory:
+        return text
+    parent, student_folder = os.path.split(directory)
+    return os.path.join(parent, mask_id(student_folder), filename)
+
+
+def redact_value(key: str, value: Any) -> Any:
+    """Return the loggable version of a single structured field."""
+    if value is None:
+        return None
+    lowered = key.lower()
+    if isinstance(value, dict):
+        return {k: redact_value(k, v) for k, v in value.items()}
+    if lowered in ID_KEYS:
+        return mask_id(value)
+    if lowered == "path" or lowered.endswith("_path"):
+        return mask_path(value)
+    if lowered == "error":
+        return _SQL_DETAIL.sub("", str(value))
+    if any(fragment in lowered for fragment in PII_KEY_FRAGMENTS):
+        return REDACTED
+    return value
+
+
+class RedactingFilter(logging.Filter):
+    """Redact structured fields before a record is formatted."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        fields = getattr(record, "fields", None)
+        if fields:
+            record.fields = {key: redact_value(key, value) for key, value in fields.items()}
+        return True
+
+
+# ============================================================================
+# SAMPLING
+# ============================================================================
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of DEBUG/INFO records; WARNING and above always pass."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+# ============================================================================
+# FORMATTING
+# ============================================================================
+
+class JsonFormatter(logging.Formatter):
+    """Render a record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+# ============================================================================
+# QUEUE HANDLER
+# ============================================================================
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks the caller.
+
+    Only the message interpolation (and the traceback, for exceptions) is
+    done on the calling thread. If the queue is full the record is dropped
+    and counted rather than waiting for the listener.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._exc_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+# ============================================================================
+# SETUP
+# ============================================================================
+
+_listener: Optional[logging.handlers.QueueListener] = None
+# Writes app.* records synchronously once the listener has stopped
+_direct_handler: Optional[logging.Handler] = None
+_setup_lock = threading.Lock()
+
+
+def _output_handler() -> logging.Handler:
+    """stdout handler writing redacted JSON lines."""
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter())
+    output.addFilter(RedactingFilter())
+    return output
+
+
+def setup_logging() -> None:
+    """
+    Route all app.* loggers through the background queue listener.
+
+    Safe to call more than once; only the first call installs handlers.
+    """
+    global _listener, _direct_handler
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+
+        queue_handler = NonBlockingQueueHandler(log_queue)
+        queue_handler.addFilter(SamplingFilter(LOG_SAMPLE_RATE))
+
+        app_logger = logging.getLogger(APP_LOGGER_NAME)
+        app_logger.setLevel(LOG_LEVEL)
+        if _direct_handler is not None:
+            app_logger.removeHandler(_direct_handler)
+            _direct_handler = None
+        app_logger.addHandler(queue_handler)
+        app_logger.propagate = False
+
+        _listener = logging.handlers.QueueListener(
+            log_queue, _output_handler(), respect_handler_level=True)
+        _listener.start()
+
+
+def shutdown_logging() -> None:
+    """
+    Flush queued records and stop the listener thread.
+
+    app.* records logged after this (the rest of shutdown) are written
+    directly, still formatted and redacted.
+    """
+    global _listener, _direct_handler
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        _listener = None
+        app_logger = logging.getLogger(APP_LOGGER_NAME)
+        for handler in list(app_logger.handlers):
+            if isinstance(handler, NonBlockingQueueHandler):
+                app_logger.removeHandler(handler)
+        _direct_handler = _output_handler()
+        _direct_handler.addFilter(SamplingFilter(LOG_SAMPLE_RATE))
+        app_logger.addHandler(_direct_handler)
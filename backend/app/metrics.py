@@ -0,0 +1,256 @@
+"""
+Request metrics in Prometheus text format.
+
+MetricsMiddleware records, per route template (e.g.
+"/api/opt-requests/{request_id}") and method:
+    - latency histogram
+    - request and response body size histograms
+    - request count by status code
+and a gauge of requests currently in flight. GET /metrics renders them
+together with the DB lock-retry counters from app.transactions.
+
+Request metrics are only updated from the event loop thread, so the
+middleware takes no locks: recording a request is a few dict lookups and
+integer increments.
+
+Configuration:
+    METRICS_ENABLED  Set to false to skip the middleware entirely (default true)
+"""
+
+import os
+import time
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+from starlette.responses import Response
+
+from app.transactions import transaction_metrics
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ['true', 'yes', '1', 'on']
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds - tuned for a mix of fast JSON reads and multi-file uploads
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Bytes - from small JSON bodies up to large document uploads
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+# Label used for requests that did not match any route (keeps cardinality bounded)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+# ============================================================================
+# METRIC TYPES
+# ============================================================================
+
+class Histogram:
+    """Fixed-bucket histogram; render() emits cumulative Prometheus buckets."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.bounds, self.counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{key}="{_label_value(str(value))}"' for key, value in labels.items())
+
+
+class RouteStats:
+    """All metrics for one (method, route template) pair."""
+
+    __slots__ = ("latency", "request_size", "response_size", "statuses")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.request_size = Histogram(SIZE_BUCKETS)
+        self.response_size = Histogram(SIZE_BUCKETS)
+        self.statuses: Dict[int, int] = {}
+
+
+class RequestMetrics:
+    """Registry of per-route request metrics."""
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteStats] = {}
+        self.in_flight = 0
+
+    def record(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        duration: float,
+        request_bytes: int,
+        response_bytes: int
+    ) -> None:
+        stats = self.routes.get((method, route))
+        if stats is None:
+            stats = self.routes[(method, route)] = RouteStats()
+        stats.latency.observe(duration)
+        stats.request_size.observe(request_bytes)
+        stats.response_size.observe(response_bytes)
+        stats.statuses[status_code] = stats.statuses.get(status_code, 0) + 1
+
+    def render(self) -> str:
+        """Render request and DB transaction metrics in Prometheus text format."""
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being handled",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+        ]
+
+        routes = sorted(self.routes.items())
+        sections = (
+            ("http_request_duration_seconds", "Request latency in seconds", "latency"),
+            ("http_request_size_bytes", "Request body size in bytes", "request_size"),
+            ("http_response_size_bytes", "Response body size in bytes", "response_size"),
+        )
+        for name, help_text, attribute in sections:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (method, route), stats in routes:
+                lines.extend(getattr(stats, attribute).render(name, _labels(method=method, route=route)))
+
+        lines.append("# HELP http_requests_total Requests handled, by status code")
+        lines.append("# TYPE http_requests_total counter")
+        for (method, route), stats in routes:
+            for status_code, count in sorted(stats.statuses.items()):
+                labels = _labels(method=method, route=route, status=status_code)
+                lines.append(f"http_requests_total{{{labels}}} {count}")
+
+        lines.extend(_render_transaction_metrics())
+        return "\n".join(lines) + "\n"
+
+
+def _render_transaction_metrics() -> List[str]:
+    snapshot = sorted(transaction_metrics.snapshot().items())
+    counters = (
+        ("db_transactions_total", "Write transactions run through the retry layer", "transactions"),
+        ("db_lock_retries_total", "Retries caused by transient SQLite lock errors", "retries"),
+        ("db_retried_transactions_total", "Transactions that needed at least one retry", "retried_transactions"),
+        ("db_retry_exhausted_total", "Transactions that gave up after the retry deadline", "exhausted"),
+    )
+    lines = []
+    for name, help_text, key in counters:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for label, values in snapshot:
+            lines.append(f"{name}{{{_labels(label=label)}}} {values[key]}")
+    return lines
+
+
+request_metrics = RequestMetrics()
+
+
+# ============================================================================
+# ASGI MIDDLEWARE
+# ============================================================================
+
+def route_template(scope) -> str:
+    """
+    Return the matched route's path template, e.g. "/api/opt-requests/{request_id}".
+
+    Depending on the FastAPI version, scope["route"] of an included router
+    may or may not carry the include prefix, so the prefix is recovered by
+    comparing the rendered template against the actual request path.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if template is None:
+        return UNMATCHED_ROUTE
+    path = scope["path"]
+    try:
+        rendered = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    if rendered != path and path.endswith(rendered):
+        return path[:-len(rendered)] + template
+    return template
+
+
+class MetricsMiddleware:
+    """
+    Time every HTTP request and record it under its route template.
+
+    The route template is read from scope["route"], which the router fills
+    in while dispatching, so it is only known once the request has run.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        start = time.perf_counter()
+        status_code = 500
+        request_bytes = 0
+        response_bytes = 0
+
+        async def receive_wrapper():
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        metrics.in_flight += 1
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            metrics.in_flight -= 1
+            metrics.record(
+                scope["method"],
+                route_template(scope),
+                status_code,
+                time.perf_counter() - start,
+                request_bytes,
+                response_bytes,
+            )
+
+
+async def metrics_endpoint() -> Response:
+    """GET /metrics - Prometheus scrape endpoint."""
+    return Response(content=request_metrics.render(), media_type=CONTENT_TYPE)
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON, Text
-from app.database import Base
+from app.database import Base, IngestBase
 
 class I20Request(Base):
     __tablename__ = "i20_requests"
@@ -296,4 +296,43 @@ class VirtualCheckInRequest(Base):
     form_data = Column(JSON, nullable=True)
     
     # Store remarks separately for better handling
-    remarks = Column(Text, nullable=True)
\ No newline at end of file
+    remarks = Column(Text, nullable=True)
+
+class IngestReceipt(IngestBase):
+    __tablename__ = "ingest_receipts"
+
+    # Receipt ID handed back to the client when a submission is acknowledged
+    id = Column(String, primary_key=True)
+
+    # Model class name the payload is drained into (e.g. "OPTRequest")
+    form_type = Column(String, index=True)
+    status = Column(String, index=True, default="queued")  # queued, committed, failed
+    created_at = Column(DateTime, index=True)
+    processed_at = Column(DateTime, nullable=True)
+
+    # Column values for the form record, stored as JSON until drained
+    payload = Column(JSON)
+
+    # Filled in by the drain worker
+    record_id = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+
+class IdempotencyRecord(Base):
+    __tablename__ = "idempotency_keys"
+
+    # Client-supplied Idempotency-Key header value
+    key = Column(String, primary_key=True)
+    request_path = Column(String)
+    status = Column(String, default="in_progress")  # in_progress, completed
+
+    # SHA-256 of the request body; a retry with a different body is refused
+    request_hash = Column(String, nullable=True)
+
+    # Stored response replayed for retries
+    response_status = Column(Integer, nullable=True)
+    response_headers = Column(JSON, nullable=True)  # [[name, value], ...]
+    response_body = Column(Text, nullable=True)
+
+    # locked_at is refreshed when a stale in-flight claim is taken over
+    locked_at = Column(DateTime)
+    expires_at = Column(DateTime, index=True)
@@ -0,0 +1,299 @@
+"""
+Parse form submissions into one Pydantic model per form type.
+
+A handler declared with forty `Form(...)` and `File(...)` parameters makes
+FastAPI resolve and validate every parameter separately on each request,
+and the handler then packs them back into a dict with
+create_form_data_dict() and convert_multiple_bools(). MultipartForm
+replaces that: declare one field per form input on a subclass (see
+app/forms.py) and depend on its `parse` classmethod. The body is parsed
+once, all fields are validated by a single model_validate() call, and what
+to do with each input is worked out once per class, not per request:
+
+- UploadFile fields are file inputs: form.files() hands them to
+  save_multiple_files() and form_data() leaves them out
+- FormBool fields are checkbox strings coerced with the
+  convert_multiple_bools() rules ("true"/"yes"/"1"/"on" are True, anything
+  else False) before validation; plain bool fields keep Pydantic's
+  stricter parsing, like `bool = Form(...)` did
+- empty strings count as missing, as they do for Form(...) parameters
+- fields named in record_fields become model columns, not form_data
+
+Missing or invalid fields produce the same 422 response FastAPI gives for
+Form(...) parameters. The body is read with size limits (see
+app/body_limits.py): a file larger than the form's max_file_bytes, or any
+other field larger than MAX_FIELD_BYTES, stops the upload with a 413. A
+file input may also carry the ID of a completed resumable upload instead
+of a file (see app/resumable.py). The type of every file is detected from
+its first bytes while it streams in (see app/file_types.py): a disallowed
+one stops the upload with a 415, and an allowed one gets the detected type
+as its content_type.
+
+Since the handler itself declares no body, pass
+`openapi_extra=YourForm.openapi_extra()` to the route decorator so the
+OpenAPI document still describes the form.
+
+Example:
+    @router.post("/exit-forms/", response_model=schemas.ExitForm,
+                 openapi_extra=forms.ExitFormSubmission.openapi_extra())
+    async def create_exit_form(
+        form: forms.ExitFormSubmission = Depends(forms.ExitFormSubmission.parse),
+        db: Session = Depends(get_db)
+    ):
+        file_paths = await save_multiple_files(form.files(), UPLOAD_PATHS["exit_forms"], form.ucf_id)
+        form_data = form.form_data(**file_paths)
+"""
+
+from contextlib import aclosing
+from typing import Annotated, Any, AsyncIterator, ClassVar, Dict, FrozenSet, Optional, Union, get_args, get_origin
+
+from fastapi import HTTPException, Request, UploadFile
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+from starlette.datastructures import FormData, Headers
+from starlette.formparsers import FormParser, MultiPartException, MultiPartParser, parse_options_header
+
+from app.body_limits import MAX_FIELD_BYTES, MAX_FILE_BYTES, RequestTooLarge
+from app.file_types import SNIFF_BYTES, check_file_type
+from app.resumable import attach_uploads
+from app.route_helpers import create_form_data_dict, str_to_bool
+
+
+# ============================================================================
+# FIELD MARKERS
+# ============================================================================
+
+class _CheckboxBool:
+    """Annotated marker for FormBool fields."""
+
+    def __repr__(self) -> str:
+        return "CheckboxBool"
+
+
+CHECKBOX_BOOL = _CheckboxBool()
+
+# A checkbox-style boolean: any string is accepted, see str_to_bool()
+FormBool = Annotated[Optional[bool], CHECKBOX_BOOL]
+
+
+def _is_upload(annotation) -> bool:
+    """True for UploadFile and Optional[UploadFile] annotations."""
+    if annotation is UploadFile:
+        return True
+    if get_origin(annotation) is Union:
+        return any(_is_upload(arg) for arg in get_args(annotation))
+    return False
+
+
+# ============================================================================
+# SIZE-LIMITED PARSING
+# ============================================================================
+
+class _LimitedMultiPartParser(MultiPartParser):
+    """Starlette's multipart parser with a per-file byte limit and type check."""
+
+    def __init__(self, headers, stream, *, max_file_bytes: int, max_field_bytes: int):
+        super().__init__(headers, stream, max_part_size=max_field_bytes)
+        self.max_file_bytes = max_file_bytes
+        self._current_file_bytes = 0
+        # First bytes of the current file, held back until its type is known
+        self._head: Optional[bytearray] = None
+
+    def on_part_begin(self) -> None:
+        super().on_part_begin()
+        self._current_file_bytes = 0
+        self._head = bytearray()
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        # Checked per chunk, before the data is spooled
+        if self._current_part.file is not None:
+            self._current_file_bytes += end - start
+            if self._current_file_bytes > self.max_file_bytes:
+                raise RequestTooLarge(f"File '{self._current_part.field_name}'", self.max_file_bytes)
+            if self._head is not None:
+                self._head.extend(data[start:end])
+                if len(self._head) < SNIFF_BYTES:
+                    return
+                data, start, end = self._release_head()
+        elif len(self._current_part.data) + end - start > self.max_part_size:
+            raise RequestTooLarge(f"Field '{self._current_part.field_name}'", self.max_part_size)
+        super().on_part_data(data, start, end)
+
+    def on_part_end(self) -> None:
+        # A file shorter than SNIFF_BYTES
+        if self._current_part.file is not None and self._head is not None:
+            super().on_part_data(*self._release_head())
+        super().on_part_end()
+
+    def _release_head(self):
+        """Check the file's type (415 if disallowed) and return the held-back bytes."""
+        head, self._head = bytes(self._head), None
+        upload = self._current_part.file
+        # A file input left empty is sent with no filename; it is skipped later
+        if upload.filename:
+            content_type = check_file_type(head, upload.filename, f"File '{self._current_part.field_name}'")
+            upload.headers = Headers(raw=[
+                *((name, value) for name, value in self._current_part.item_headers if name != b"content-type"),
+                (b"content-type", content_type.encode("latin-1")),
+            ])
+        return head, 0, len(head)
+
+
+class _LimitedFormParser(FormParser):
+    """Starlette's urlencoded parser, answering 413 for an oversized field."""
+
+    def on_field_name(self, data: bytes, start: int, end: int) -> None:
+        if self._current_field_size + end - start > self.max_part_size:
+            raise RequestTooLarge("Field", self.max_part_size)
+        super().on_field_name(data, start, end)
+
+    def on_field_data(self, data: bytes, start: int, end: int) -> None:
+        if self._current_field_size + end - start > self.max_part_size:
+            raise RequestTooLarge("Field", self.max_part_size)
+        super().on_field_data(data, start, end)
+
+
+async def read_form(request: Request, max_file_bytes: int = MAX_FILE_BYTES,
+                    max_field_bytes: int = MAX_FIELD_BYTES) -> FormData:
+    """
+    Parse a multipart or urlencoded body like request.form(), with limits.
+
+    Raises:
+        RequestTooLarge: A file or field crossed its limit (413)
+        UnsupportedFileType: A file isn't of an accepted type (415)
+        HTTPException: Malformed multipart data (400)
+    """
+    content_type, _ = parse_options_header(request.headers.get("content-type"))
+    try:
+        async with aclosing(request.stream()) as stream:
+            if content_type == b"multipart/form-data":
+                parser = _LimitedMultiPartParser(
+                    request.headers, stream,
+                    max_file_bytes=max_file_bytes, max_field_bytes=max_field_bytes)
+            elif content_type == b"application/x-www-form-urlencoded":
+                parser = _LimitedFormParser(request.headers, stream, max_part_size=max_field_bytes)
+            else:
+                return FormData()
+            return await parser.parse()
+    except MultiPartException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+
+
+# ============================================================================
+# FORM MODEL BASE CLASS
+# ============================================================================
+
+class MultipartForm(BaseModel):
+    """
+    Base class for form-encoded submissions.
+
+    Subclasses declare one field per form input. Inputs whose name differs
+    from the form_data key (e.g. `ucf_email` stored as `email`) use
+    `Field(validation_alias="ucf_email")`.
+    """
+
+    # Inputs stored on the model row instead of in form_data
+    record_fields: ClassVar[FrozenSet[str]] = frozenset()
+
+    # Size limit of each uploaded file; larger uploads are rejected with 413
+    max_file_bytes: ClassVar[int] = MAX_FILE_BYTES
+
+    # Worked out once per subclass in __pydantic_init_subclass__
+    file_inputs: ClassVar[Dict[str, str]] = {}
+    checkbox_inputs: ClassVar[FrozenSet[str]] = frozenset()
+    form_data_exclude: ClassVar[FrozenSet[str]] = frozenset()
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs):
+        super().__pydantic_init_subclass__(**kwargs)
+        file_inputs = {}
+        checkbox_inputs = set()
+        for name, field in cls.model_fields.items():
+            key = field.validation_alias if isinstance(field.validation_alias, str) else name
+            if _is_upload(field.annotation):
+                file_inputs[key] = name
+            elif CHECKBOX_BOOL in field.metadata:
+                checkbox_inputs.add(key)
+        cls.file_inputs = file_inputs
+        cls.checkbox_inputs = frozenset(checkbox_inputs)
+        cls.form_data_exclude = frozenset(cls.record_fields) | frozenset(file_inputs.values())
+
+    @classmethod
+    def from_form(cls, form) -> "MultipartForm":
+        """
+        Validate parsed form data (a Starlette FormData) into the model.
+
+        Raises:
+            RequestValidationError: Missing or invalid fields (422)
+        """
+        checkbox_inputs = cls.checkbox_inputs
+        values: Dict[str, Any] = {}
+        for key, value in form.multi_items():
+            if isinstance(value, str):
+                if not value:
+                    # Like Form(...): an empty value means "not sent"
+                    values.pop(key, None)
+                    continue
+                if key in checkbox_inputs:
+                    value = str_to_bool(value)
+            values[key] = value
+
+        try:
+            return cls.model_validate(values)
+        except ValidationError as e:
+            raise RequestValidationError(_body_errors(e))
+
+    @classmethod
+    async def parse(cls, request: Request) -> AsyncIterator["MultipartForm"]:
+        """
+        FastAPI dependency: parse the request body into the model.
+
+        Uploaded files stay open until the response has been sent. Upload
+        IDs sent in file inputs are replaced with the completed uploads.
+        """
+        form = await read_form(request, max_file_bytes=cls.max_file_bytes)
+        try:
+            form = attach_uploads(form, cls.file_inputs, cls.max_file_bytes)
+            yield cls.from_form(form)
+        finally:
+            await form.close()
+
+    @classmethod
+    def openapi_extra(cls) -> Dict[str, Any]:
+        """Request body description for the route's openapi_extra."""
+        schema = cls.model_json_schema(by_alias=True)
+        media_type = "multipart/form-data" if cls.file_inputs else "application/x-www-form-urlencoded"
+        return {
+            "requestBody": {
+                "required": bool(schema.get("required")),
+                "content": {media_type: {"schema": schema}},
+            }
+        }
+
+    def files(self) -> Dict[str, Optional[UploadFile]]:
+        """File inputs by field name, for save_multiple_files()."""
+        return {name: getattr(self, name) for name in self.file_inputs.values()}
+
+    def form_data(self, **extra_fields) -> Dict[str, Any]:
+        """
+        Build the form_data JSON for the record.
+
+        Args:
+            **extra_fields: Additional entries, usually the saved file paths
+
+        Returns:
+            Every input except files and record_fields, via create_form_data_dict()
+        """
+        fields = self.model_dump(exclude=self.form_data_exclude)
+        return create_form_data_dict(**fields, **extra_fields)
+
+
+def _body_errors(error: ValidationError) -> list:
+    """Pydantic errors in the shape FastAPI reports for body parameters."""
+    errors = []
+    for item in error.errors(include_url=False):
+        item["loc"] = ("body", *item["loc"])
+        if item["type"] == "missing":
+            item["input"] = None
+        errors.append(item)
+    return errors
@@ -0,0 +1,198 @@
+"""
+Serve the build-time OpenAPI document instead of generating it per worker.
+
+tools/build_openapi.py writes openapi.json and a gzip-compressed
+openapi.json.gz next to it. When that document exists, main.py creates the
+app with FastAPI's own /openapi.json, /docs and /redoc routes switched off
+and registers the ones from this module instead:
+
+- /openapi.json returns the stored bytes as-is: gzip-encoded when the
+  client accepts it, never parsed or re-serialized
+- every response carries a strong ETag (SHA-256 of the document; the gzip
+  variant gets its own tag) and Cache-Control: no-cache, so browsers
+  revalidate and get a 304 until the next deploy changes the document
+- /docs and /redoc point at it as usual
+- app.openapi() returns the parsed document (parsed on first call only)
+
+Without the file nothing changes and FastAPI generates the schema at
+runtime, which is what you want while editing routes locally. The document
+does not include a root_path "servers" entry; build it with the servers
+your deployment needs if the API sits behind a path prefix.
+
+Configuration:
+    OPENAPI_PATH  Precomputed document (default openapi.json next to main.py)
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+from typing import Optional
+
+from fastapi import Request
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+from fastapi.responses import Response
+
+from app.logging_config import log_fields
+
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+OPENAPI_PATH = os.getenv("OPENAPI_PATH", os.path.join(BACKEND_DIR, "openapi.json"))
+
+OPENAPI_URL = "/openapi.json"
+
+# Revalidate on every use; the ETag makes that a cheap 304
+CACHE_CONTROL = "no-cache"
+
+GZIP_LEVEL = 9
+
+
+def gzip_document(document: bytes) -> bytes:
+    """Compress reproducibly (no timestamp, so rebuilding gives identical bytes)."""
+    return gzip.compress(document, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+# ============================================================================
+# DOCUMENT
+# ============================================================================
+
+class PrecomputedOpenAPI:
+    """
+    The serialized OpenAPI document plus its gzip variant and ETags.
+
+    Example:
+        openapi = PrecomputedOpenAPI.load("openapi.json")
+        if openapi is not None:
+            openapi.install(app)
+    """
+
+    def __init__(self, document: bytes, compressed: Optional[bytes] = None):
+        self.document = document
+        self.compressed = compressed if compressed is not None else gzip_document(document)
+        digest = hashlib.sha256(document).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+        self._schema: Optional[dict] = None
+
+    @classmethod
+    def load(cls, path: str = OPENAPI_PATH) -> Optional["PrecomputedOpenAPI"]:
+        """
+        Read the document (and openapi.json.gz if it is at least as new).
+
+        Returns:
+            The loaded document, or None if the file doesn't exist
+        """
+        try:
+            with open(path, "rb") as handle:
+                document = handle.read()
+        except FileNotFoundError:
+            return None
+
+        compressed = None
+        gz_path = path + ".gz"
+        if os.path.exists(gz_path) and os.path.getmtime(gz_path) >= os.path.getmtime(path):
+            with open(gz_path, "rb") as handle:
+                compressed = handle.read()
+        else:
+            logger.warning("No up-to-date openapi.json.gz, compressing at startup",
+                           extra=log_fields(path=gz_path))
+
+        return cls(document, compressed)
+
+    def schema(self) -> dict:
+        """The parsed document, for code that calls app.openapi()."""
+        if self._schema is None:
+            self._schema = json.loads(self.document)
+        return self._schema
+
+    def response(self, request: Request) -> Response:
+        """The document, gzip-encoded if accepted, or 304 if the client has it."""
+        use_gzip = accepts_gzip(request.headers.get("accept-encoding"))
+        etag = self.gzip_etag if use_gzip else self.etag
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+
+        if_none_match = parse_if_none_match(request.headers.get("if-none-match"))
+        if etag in if_none_match or "*" in if_none_match:
+            return Response(status_code=304, headers=headers)
+
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+            return Response(self.compressed, media_type="application/json", headers=headers)
+        return Response(self.document, media_type="application/json", headers=headers)
+
+    def install(self, app) -> None:
+        """
+        Register /openapi.json, /docs and /redoc serving this document.
+
+        The app must be created with openapi_url=None so FastAPI doesn't add
+        its own versions of these routes first.
+        """
+        title = app.title
+
+        async def openapi_json(request: Request) -> Response:
+            return self.response(request)
+
+        async def swagger_ui(request: Request):
+            root_path = request.scope.get("root_path", "").rstrip("/")
+            return get_swagger_ui_html(openapi_url=root_path + OPENAPI_URL, title=f"{title} - Swagger UI")
+
+        async def redoc(request: Request):
+            root_path = request.scope.get("root_path", "").rstrip("/")
+            return get_redoc_html(openapi_url=root_path + OPENAPI_URL, title=f"{title} - ReDoc")
+
+        app.add_route(OPENAPI_URL, openapi_json, include_in_schema=False)
+        app.add_route("/docs", swagger_ui, include_in_schema=False)
+        app.add_route("/redoc", redoc, include_in_schema=False)
+        # FastAPI's documented hook for replacing the generated schema
+        app.openapi = self.schema
+
+
+def parse_if_none_match(value: Optional[str]) -> set:
+    """Entity tags listed in an If-None-Match header."""
+    if not value:
+        return set()
+    tags = set()
+    for tag in value.split(","):
+        tag = tag.strip()
+        # A weak comparison is fine for If-None-Match (RFC 9110 13.1.2)
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        tags.add(tag)
+    return tags
+
+
+def accepts_gzip(value: Optional[str]) -> bool:
+    """
+    Whether an Accept-Encoding header allows a gzip response (RFC 9110 12.5.3).
+
+    Example:
+        accepts_gzip("br, gzip;q=0")
+        # Result: False
+    """
+    qualities = {}
+    for item in (value or "").split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, number = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    for coding in ("gzip", "x-gzip"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return qualities.get("*", 0.0) > 0
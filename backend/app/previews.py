@@ -0,0 +1,304 @@
+"""
+Thumbnails and previews of uploaded photos and PDFs.
+
+Uploads are stored as the student sent them: full-resolution photos and
+multi-megabyte scans. For every image or PDF that is saved, a process pool
+renders two small JPEGs in the background:
+
+    thumbnail  fits in THUMBNAIL_PX x THUMBNAIL_PX, for lists and cards
+    preview    fits in PREVIEW_PX x PREVIEW_PX, for the review screen
+
+Both are normalized the same way: the first page of a PDF, photos rotated
+upright by their EXIF orientation, transparency flattened onto white,
+RGB, metadata stripped, progressive JPEG. They are written next to the
+original as <uuid>.thumbnail.jpg and <uuid>.preview.jpg, so deleting a
+student's folder deletes them too, and are served as
+GET /api/attachments/<attachment_id>?variant=thumbnail (app/attachments.py).
+
+With S3 storage (app/storage.py) the worker downloads the original into a
+temporary directory, renders there and uploads the derivatives next to the
+original's key.
+
+Rendering is CPU-bound and decoding a large photo holds the GIL, so it runs
+in a separate process pool (PREVIEW_WORKERS processes) and never blocks the
+event loop. Each original is rendered once: a request for a derivative that
+is still being rendered waits for the same job.
+
+Images are decoded with Pillow and PDFs rendered with pypdfium2; both are
+imported in the worker processes only.
+
+Configuration:
+    PREVIEWS_ENABLED  Render derivatives of new uploads (default true)
+    PREVIEW_WORKERS   Processes in the rendering pool (default 2)
+    THUMBNAIL_PX      Longest side of thumbnails (default 256)
+    PREVIEW_PX        Longest side of previews (default 1600)
+    PREVIEW_QUALITY   JPEG quality of both (default 80)
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.logging_config import log_fields
+from app.storage import storage
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PREVIEWS_ENABLED = os.getenv("PREVIEWS_ENABLED", "true").lower() in ['true', 'yes', '1', 'on']
+
+PREVIEW_WORKERS = int(os.getenv("PREVIEW_WORKERS", "2"))
+
+THUMBNAIL_PX = int(os.getenv("THUMBNAIL_PX", "256"))
+PREVIEW_PX = int(os.getenv("PREVIEW_PX", "1600"))
+PREVIEW_QUALITY = int(os.getenv("PREVIEW_QUALITY", "80"))
+
+# Derivative name -> longest side in pixels
+VARIANTS = {"thumbnail": THUMBNAIL_PX, "preview": PREVIEW_PX}
+
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".tif", ".tiff"})
+PDF_EXTENSIONS = frozenset({".pdf"})
+
+
+# Renders that failed on bad content are remembered (not retried) for this many uploads
+FAILED_CACHE_SIZE = 4096
+
+
+def is_derivative(path: str) -> bool:
+    """Whether a path is a thumbnail or preview rather than an upload."""
+    stem = os.path.splitext(path)[0]
+    return any(stem.endswith(f".{variant}") for variant in VARIANTS)
+
+
+def has_previews(path: str) -> bool:
+    """Whether derivatives are rendered for this file type (never for derivatives themselves)."""
+    extension = os.path.splitext(path)[1].lower()
+    return (extension in IMAGE_EXTENSIONS or extension in PDF_EXTENSIONS) and not is_derivative(path)
+
+
+def derivative_path(path: str, variant: str) -> str:
+    """
+    Where a derivative of an upload is stored.
+
+    Example:
+        derivative_path("uploads/opt_requests/1234567/a1b2c3d4-uuid.jpg", "thumbnail")
+        # Result: "uploads/opt_requests/1234567/a1b2c3d4-uuid.thumbnail.jpg"
+    """
+    return f"{os.path.splitext(path)[0]}.{variant}.jpg"
+
+
+def derivative_paths(path: str) -> List[str]:
+    """Every derivative path of an upload, rendered or not."""
+    return [derivative_path(path, variant) for variant in VARIANTS]
+
+
+# ============================================================================
+# RENDERING (runs in the worker processes)
+# ============================================================================
+
+class UndecodableUpload(Exception):
+    """The upload's content can't be decoded; rendering it again won't help."""
+
+
+def _open_source(path: str, longest_side: int):
+    """The image to derive from: the photo, or the PDF's first page."""
+    from PIL import Image, ImageOps
+
+    if os.path.splitext(path)[1].lower() in PDF_EXTENSIONS:
+        import pypdfium2
+
+        document = pypdfium2.PdfDocument(path)
+        try:
+            page = document[0]
+            scale = longest_side / max(page.get_size())
+            return page.render(scale=scale).to_pil()
+        finally:
+            document.close()
+
+    image = Image.open(path)
+    # Let the JPEG decoder downscale while decoding instead of after
+    image.draft("RGB", (longest_side, longest_side))
+    return ImageOps.exif_transpose(image)
+
+
+def render_derivatives(path: str, variants: Dict[str, int], quality: int) -> List[str]:
+    """
+    Render the JPEG derivatives of one upload.
+
+    Args:
+        path: The uploaded file's storage key
+        variants: Derivative name -> longest side in pixels
+        quality: JPEG quality
+
+    Returns:
+        Keys of the written derivatives
+    """
+    if storage.is_local:
+        return _render_files(path, variants, quality)
+
+    with tempfile.TemporaryDirectory(prefix="preview-") as directory:
+        source = os.path.join(directory, f"source{os.path.splitext(path)[1].lower()}")
+        storage.download(path, source)
+        written = []
+        for variant, rendered in zip(variants, _render_files(source, variants, quality)):
+            target = derivative_path(path, variant)
+            with open(rendered, "rb") as handle:
+                storage.save(target, handle, "image/jpeg")
+            written.append(target)
+        return written
+
+
+def _render_files(path: str, variants: Dict[str, int], quality: int) -> List[str]:
+    """Render the derivatives of a local file next to it, in the order of variants."""
+    from PIL import Image
+
+    # A missing or unreadable file is an I/O error worth retrying; anything
+    # raised while decoding means the content itself is bad
+    with open(path, "rb"):
+        pass
+    try:
+        image = _open_source(path, max(variants.values()))
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, "white")
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+        image.load()
+    except Exception as e:
+        raise UndecodableUpload(f"{type(e).__name__}: {e}") from e
+
+    # Largest first, so each smaller one is resized from the previous
+    for variant, longest_side in sorted(variants.items(), key=lambda item: -item[1]):
+        image.thumbnail((longest_side, longest_side), Image.Resampling.LANCZOS)
+        target = derivative_path(path, variant)
+        temporary = f"{target}.tmp"
+        image.save(temporary, "JPEG", quality=quality, optimize=True, progressive=True)
+        # Readers never see a half-written file
+        os.replace(temporary, target)
+    return [derivative_path(path, variant) for variant in variants]
+
+
+# ============================================================================
+# PROCESS POOL
+# ============================================================================
+
+class PreviewRenderer:
+    """
+    Render derivatives in a process pool, at most once per upload.
+
+    Example:
+        renderer = PreviewRenderer()
+        renderer.schedule("uploads/opt_requests/1234567/a1b2c3d4-uuid.jpg")
+    """
+
+    def __init__(self, workers: int = PREVIEW_WORKERS):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # Upload path -> its rendering job, while it runs
+        self._pending: Dict[str, Future] = {}
+        # Uploads whose content couldn't be decoded, oldest first
+        self._failed: "OrderedDict[str, None]" = OrderedDict()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def schedule(self, path: str) -> Optional[Future]:
+        """
+        Start rendering the derivatives of an upload.
+
+        Returns:
+            The rendering job (the running one if there is one already), or
+            None if the file has no derivatives
+        """
+        if not has_previews(path):
+            return None
+        with self._lock:
+            if path in self._failed:
+                return None
+            future = self._pending.get(path)
+            if future is None:
+                executor = self._pool()
+                try:
+                    future = executor.submit(render_derivatives, path, VARIANTS, PREVIEW_QUALITY)
+                except RuntimeError as e:
+                    # Broken or shut down pool: the upload itself must not fail,
+                    # start a fresh pool for the next one
+                    self._executor = None
+                    logger.warning("Preview pool unavailable", extra=log_fields(path=path, error=str(e)))
+                    return None
+                self._pending[path] = future
+                future.add_done_callback(lambda done: self._finished(path, done, executor))
+            return future
+
+    def _finished(self, path: str, future: Future, executor: ProcessPoolExecutor) -> None:
+        error = None if future.cancelled() else future.exception()
+        with self._lock:
+            self._pending.pop(path, None)
+            if isinstance(error, BrokenProcessPool):
+                # Not the file's fault; it is rendered again when next asked for
+                if self._executor is executor:
+                    self._executor = None
+            elif isinstance(error, UndecodableUpload):
+                # Other errors (a failed download, a full disk) may pass; those are retried
+                self._failed[path] = None
+                if len(self._failed) > FAILED_CACHE_SIZE:
+                    self._failed.popitem(last=False)
+        if error is not None:
+            logger.warning("Preview rendering failed", extra=log_fields(path=path, error=str(error)))
+
+    async def get(self, path: str, variant: str, timeout: float) -> Optional[str]:
+        """
+        Path of a derivative, rendering it first if needed.
+
+        Returns:
+            The derivative's path, or None if the upload has no derivatives
+
+        Raises:
+            asyncio.TimeoutError: Still rendering after timeout seconds
+        """
+        if not has_previews(path):
+            return None
+        target = derivative_path(path, variant)
+        if await run_in_threadpool(storage.exists, target):
+            return target
+        future = self.schedule(path)
+        if future is None:
+            return None
+        try:
+            # shield: a client giving up doesn't cancel the job for everyone else
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except asyncio.TimeoutError:
+            raise
+        except Exception:
+            return None
+        return target
+
+    def shutdown(self) -> None:
+        """Stop the pool: renders still queued are dropped, running ones finish."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+preview_renderer = PreviewRenderer()
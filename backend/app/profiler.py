@@ -0,0 +1,286 @@
+"""
+Sampling profiler for live workers.
+
+StackSampler runs a background thread that reads every thread's current
+stack with sys._current_frames() at a fixed interval and aggregates
+identical stacks. The result is exported in speedscope's file format
+(https://www.speedscope.app), one sampled profile per thread.
+
+Two ways to use it (both admin-only, see app.admin):
+    - GET /api/admin/profile?seconds=10 samples the whole worker for N seconds
+    - sending "X-Profile: true" on a single request profiles just that
+      request; the response gets an X-Profile-Id header and the profile is
+      fetched from GET /api/admin/profiles/{profile_id}
+
+For a single request only the event loop thread and the threadpool thread
+running a sync endpoint (see TimedRoute) are sampled. That keeps out
+threadpool threads serving other sync requests, but it is not an
+isolated profile:
+    - the event loop thread is shared by every in-flight async request, so
+      their stacks show up whenever they run while this request is profiled
+    - work an async endpoint hands to run_in_threadpool runs on a thread
+      that isn't sampled; the profile only shows the loop awaiting it
+Profile on a quiet worker for a clean picture.
+"""
+
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.admin import is_admin_token
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Shortest time between samples; below it the sampler thread spins and
+# holds the GIL, slowing the worker it is profiling
+PROFILE_MIN_INTERVAL_MS = 1.0
+
+# Default time between samples
+PROFILE_INTERVAL_MS = max(float(os.getenv("PROFILE_INTERVAL_MS", "5")), PROFILE_MIN_INTERVAL_MS)
+
+# Upper bound for GET /api/admin/profile?seconds=N
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+
+# Per-request profiles kept in memory for retrieval
+PROFILE_HISTORY_SIZE = int(os.getenv("PROFILE_HISTORY_SIZE", "20"))
+
+PROFILE_HEADER = b"x-profile"
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+# (filename, function name, first line) from the outermost frame inwards
+StackKey = Tuple[Tuple[str, str, int], ...]
+
+
+# ============================================================================
+# SAMPLER
+# ============================================================================
+
+class StackSampler:
+    """
+    Periodically sample thread stacks from a background thread.
+
+    Example:
+        sampler = StackSampler(interval_ms=5)
+        sampler.start()
+        ...
+        profile = sampler.stop("submission spike")
+    """
+
+    def __init__(self, interval_ms: float = PROFILE_INTERVAL_MS, thread_ids: Optional[Iterable[int]] = None):
+        """
+        Args:
+            interval_ms: Time between samples
+            thread_ids: Threads to sample; None samples every thread
+        """
+        self.interval = interval_ms / 1000.0
+        self.thread_ids = set(thread_ids) if thread_ids is not None else None
+        self.samples: Dict[int, Dict[StackKey, int]] = {}
+        self.started_at = 0.0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_thread(self, thread_id: int) -> None:
+        if self.thread_ids is not None:
+            self.thread_ids.add(thread_id)
+
+    def discard_thread(self, thread_id: int) -> None:
+        if self.thread_ids is not None:
+            self.thread_ids.discard(thread_id)
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self, name: str) -> dict:
+        """Stop sampling and return the collected profile in speedscope format."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.duration = time.perf_counter() - self.started_at
+        return self.to_speedscope(name)
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            targets = self.thread_ids
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (targets is not None and thread_id not in targets):
+                    continue
+                stacks = self.samples.setdefault(thread_id, {})
+                key = _stack_key(frame)
+                stacks[key] = stacks.get(key, 0) + 1
+
+    def to_speedscope(self, name: str) -> dict:
+        """Export the samples as a speedscope file (one profile per thread)."""
+        frames: List[dict] = []
+        frame_index: Dict[Tuple[str, str, int], int] = {}
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        interval_ms = self.interval * 1000
+        profiles = []
+
+        for thread_id, stacks in sorted(self.samples.items()):
+            samples, weights = [], []
+            for stack, count in stacks.items():
+                indexes = []
+                for frame in stack:
+                    if frame not in frame_index:
+                        frame_index[frame] = len(frames)
+                        frames.append({"name": frame[1], "file": frame[0], "line": frame[2]})
+                    indexes.append(frame_index[frame])
+                samples.append(indexes)
+                weights.append(count * interval_ms)
+            profiles.append({
+                "type": "sampled",
+                "name": thread_names.get(thread_id, f"thread {thread_id}"),
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            })
+
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "app.profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+
+def _stack_key(frame) -> StackKey:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_filename, code.co_name, code.co_firstlineno))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+# ============================================================================
+# WORKER-WIDE PROFILING
+# ============================================================================
+
+_worker_profile_lock = threading.Lock()
+
+
+def profile_worker(seconds: float, interval_ms: float = PROFILE_INTERVAL_MS) -> Optional[dict]:
+    """
+    Sample every thread of this worker for the given number of seconds.
+
+    Blocking - run it via run_in_threadpool.
+
+    Returns:
+        Speedscope profile, or None if another worker profile is running
+    """
+    if not _worker_profile_lock.acquire(blocking=False):
+        return None
+    try:
+        sampler = StackSampler(interval_ms)
+        sampler.start()
+        time.sleep(seconds)
+        return sampler.stop(f"worker pid {os.getpid()} ({seconds:g}s)")
+    finally:
+        _worker_profile_lock.release()
+
+
+# ============================================================================
+# PER-REQUEST PROFILING
+# ============================================================================
+
+_request_sampler: ContextVar[Optional[StackSampler]] = ContextVar("request_sampler", default=None)
+
+# Most recent per-request profiles, oldest first
+_request_profiles: "OrderedDict[str, dict]" = OrderedDict()
+_request_profiles_lock = threading.Lock()
+
+
+@contextmanager
+def track_current_thread():
+    """
+    Include the current thread in the request's profile while the block runs.
+
+    Used around sync endpoints, which run on a threadpool thread rather than
+    the event loop thread the request started on.
+    """
+    sampler = _request_sampler.get()
+    if sampler is None:
+        yield
+        return
+    thread_id = threading.get_ident()
+    sampler.add_thread(thread_id)
+    try:
+        yield
+    finally:
+        sampler.discard_thread(thread_id)
+
+
+def get_request_profile(profile_id: str) -> Optional[dict]:
+    with _request_profiles_lock:
+        return _request_profiles.get(profile_id)
+
+
+def _store_request_profile(profile_id: str, profile: dict) -> None:
+    with _request_profiles_lock:
+        _request_profiles[profile_id] = profile
+        while len(_request_profiles) > PROFILE_HISTORY_SIZE:
+            _request_profiles.popitem(last=False)
+
+
+class RequestProfilerMiddleware:
+    """
+    Profile individual requests that send "X-Profile: true" with a valid
+    X-Admin-Token. Other requests pass straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _wants_profile(scope["headers"]):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+        sampler = StackSampler(thread_ids=[threading.get_ident()])
+        token = _request_sampler.set(sampler)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile_id.encode("latin-1"))]
+            await send(message)
+
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_sampler.reset(token)
+            name = f"{scope['method']} {scope['path']}"
+            _store_request_profile(profile_id, sampler.stop(name))
+
+
+def _wants_profile(headers) -> bool:
+    wants = False
+    admin_token = None
+    for name, value in headers:
+        if name == PROFILE_HEADER:
+            wants = value.decode("latin-1").strip().lower() in ['true', 'yes', '1', 'on']
+        elif name == b"x-admin-token":
+            admin_token = value.decode("latin-1")
+    return wants and is_admin_token(admin_token)
@@ -0,0 +1,419 @@
+"""
+Resumable uploads (tus 1.0 core protocol with the creation, checksum,
+expiration and termination extensions).
+
+A large document is uploaded ahead of the form in as many PATCH requests as
+the connection needs. After a dropped connection the client asks for the
+offset the server has and resends only the missing bytes, instead of
+restarting a multipart POST with every file of the form:
+
+    POST   /api/uploads/        Upload-Length: 5242880
+                                Upload-Metadata: filename dHJhbnNjcmlwdC5wZGY=,filetype YXBwbGljYXRpb24vcGRm
+                                -> 201, Location: /api/uploads/<upload_id>
+    PATCH  /api/uploads/<id>    Upload-Offset: 0, Content-Type: application/offset+octet-stream
+                                Upload-Checksum: sha256 <base64 digest of this chunk> (optional)
+                                -> 204, Upload-Offset: <new offset>
+    HEAD   /api/uploads/<id>    -> Upload-Offset / Upload-Length (resume from here)
+    DELETE /api/uploads/<id>    -> 204, upload discarded
+
+A PATCH whose Upload-Offset isn't the stored offset gets 409, and one whose
+chunk doesn't match its Upload-Checksum gets 460; either way nothing of it
+is kept. Without a checksum, the bytes that arrived before a dropped
+connection are kept and the client resumes after them.
+
+The first SNIFF_BYTES of the first PATCH are held back until the file's
+type is detected from them (app/file_types.py); an upload of a disallowed
+type gets 415 and nothing of it is kept.
+
+Once Upload-Offset reaches Upload-Length, the upload ID is sent in the
+form's file input in place of the file (e.g. `transcripts=<upload_id>` in
+the POST to /api/opt-stem-applications/) and saved like an uploaded file
+(see attach_uploads()). Uploads are kept until they expire, so a failed
+form POST can be retried with the same IDs.
+
+Chunks are stored as uploads/resumable/<upload_id>.part, next to a
+<upload_id>.json with the declared length and metadata; the offset is the
+size of the .part file. Appends to one upload are serialized within a
+worker; clients send one PATCH at a time per upload, as the protocol
+requires.
+
+Configuration:
+    RESUMABLE_UPLOAD_DIR          Where chunks are stored (default uploads/resumable)
+    RESUMABLE_UPLOAD_TTL_SECONDS  How long an upload is kept after creation (default 24h)
+"""
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from fastapi import APIRouter, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from starlette.datastructures import FormData, Headers, UploadFile
+from starlette.requests import ClientDisconnect
+
+from app.body_limits import MAX_FILE_BYTES, RequestTooLarge
+from app.file_types import SNIFF_BYTES, check_file_type
+from app.logging_config import log_fields
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+RESUMABLE_UPLOAD_DIR = os.getenv("RESUMABLE_UPLOAD_DIR", "uploads/resumable")
+RESUMABLE_UPLOAD_TTL_SECONDS = int(os.getenv("RESUMABLE_UPLOAD_TTL_SECONDS", str(24 * 60 * 60)))
+
+TUS_VERSION = "1.0.0"
+TUS_EXTENSIONS = "creation,checksum,expiration,termination"
+TUS_HEADERS = {"Tus-Resumable": TUS_VERSION}
+
+CHUNK_CONTENT_TYPE = "application/offset+octet-stream"
+CHECKSUM_ALGORITHMS = ("sha1", "sha256", "md5")
+
+# tus status for a chunk that doesn't match its Upload-Checksum
+CHECKSUM_MISMATCH = 460
+
+# Expired uploads are purged at most this often
+PURGE_INTERVAL_SECONDS = 300
+
+_UPLOAD_ID = re.compile(r"[0-9a-f]{32}")
+
+
+# ============================================================================
+# STORAGE
+# ============================================================================
+
+def _data_path(upload_id: str) -> str:
+    return os.path.join(RESUMABLE_UPLOAD_DIR, f"{upload_id}.part")
+
+
+def _info_path(upload_id: str) -> str:
+    return os.path.join(RESUMABLE_UPLOAD_DIR, f"{upload_id}.json")
+
+
+def _parse_metadata(header: Optional[str]) -> Dict[str, str]:
+    """Upload-Metadata: comma-separated "key base64value" pairs."""
+    metadata = {}
+    for pair in (header or "").split(","):
+        if not pair.strip():
+            continue
+        key, _, value = pair.strip().partition(" ")
+        try:
+            metadata[key] = base64.b64decode(value, validate=True).decode("utf-8") if value else ""
+        except (binascii.Error, UnicodeDecodeError):
+            raise HTTPException(status_code=400, detail=f"Invalid Upload-Metadata value for '{key}'",
+                                headers=TUS_HEADERS)
+    return metadata
+
+
+def create_upload(length: int, metadata: Dict[str, str]) -> str:
+    """Register a new upload and return its ID."""
+    os.makedirs(RESUMABLE_UPLOAD_DIR, exist_ok=True)
+    upload_id = uuid.uuid4().hex
+    info = {
+        "length": length,
+        "metadata": metadata,
+        "expires": time.time() + RESUMABLE_UPLOAD_TTL_SECONDS,
+    }
+    open(_data_path(upload_id), "wb").close()
+    with open(_info_path(upload_id), "w") as handle:
+        json.dump(info, handle)
+    return upload_id
+
+
+def load_upload(upload_id: str) -> Optional[Dict[str, Any]]:
+    """The upload's info with its current offset, or None if unknown or expired."""
+    if not _UPLOAD_ID.fullmatch(upload_id):
+        return None
+    try:
+        with open(_info_path(upload_id)) as handle:
+            info = json.load(handle)
+        info["offset"] = os.path.getsize(_data_path(upload_id))
+    except (OSError, ValueError):
+        return None
+    if info["expires"] < time.time():
+        delete_upload(upload_id)
+        return None
+    return info
+
+
+def delete_upload(upload_id: str) -> None:
+    for path in (_data_path(upload_id), _info_path(upload_id)):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+_last_purge = 0.0
+
+
+def _purge_expired() -> None:
+    """Delete expired uploads, at most once per PURGE_INTERVAL_SECONDS."""
+    global _last_purge
+    now = time.time()
+    if now - _last_purge < PURGE_INTERVAL_SECONDS:
+        return
+    _last_purge = now
+    try:
+        names = os.listdir(RESUMABLE_UPLOAD_DIR)
+    except FileNotFoundError:
+        return
+    for name in names:
+        upload_id, extension = os.path.splitext(name)
+        if extension == ".json":
+            # load_upload() deletes it if it has expired
+            load_upload(upload_id)
+
+
+def _expires_header(info: Dict[str, Any]) -> str:
+    return time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(info["expires"]))
+
+
+def _get_upload(upload_id: str) -> Dict[str, Any]:
+    info = load_upload(upload_id)
+    if info is None:
+        raise HTTPException(status_code=404, detail="Upload not found", headers=TUS_HEADERS)
+    return info
+
+
+# ============================================================================
+# ROUTES
+# ============================================================================
+
+router = APIRouter(prefix="/uploads")
+
+# Uploads with a PATCH in progress in this worker
+_writing: Dict[str, asyncio.Lock] = {}
+
+
+def body_limits(prefix: str = "/api") -> Dict[Tuple[str, str], int]:
+    """Largest PATCH body, by path prefix, for BodyLimitMiddleware."""
+    return {("PATCH", f"{prefix}{router.prefix}/"): MAX_FILE_BYTES}
+
+
+@router.options("/")
+def upload_options():
+    """tus discovery: supported version, extensions and limits"""
+    return Response(status_code=204, headers={
+        **TUS_HEADERS,
+        "Tus-Version": TUS_VERSION,
+        "Tus-Extension": TUS_EXTENSIONS,
+        "Tus-Max-Size": str(MAX_FILE_BYTES),
+        "Tus-Checksum-Algorithm": ",".join(CHECKSUM_ALGORITHMS),
+    })
+
+
+@router.post("/", status_code=201)
+def create_resumable_upload(
+    request: Request,
+    upload_length: int = Header(..., ge=0),
+    upload_metadata: Optional[str] = Header(None)
+):
+    """Start a resumable upload of Upload-Length bytes"""
+    if upload_length > MAX_FILE_BYTES:
+        raise RequestTooLarge("Upload-Length", MAX_FILE_BYTES)
+
+    _purge_expired()
+    upload_id = create_upload(upload_length, _parse_metadata(upload_metadata))
+    info = load_upload(upload_id)
+    logger.info("Created resumable upload", extra=log_fields(upload_id=upload_id, length=upload_length))
+    return Response(status_code=201, headers={
+        **TUS_HEADERS,
+        "Location": f"{request.url.path.rstrip('/')}/{upload_id}",
+        "Upload-Offset": "0",
+        "Upload-Expires": _expires_header(info),
+    })
+
+
+@router.head("/{upload_id}")
+def get_upload_offset(upload_id: str):
+    """Current offset of an upload, to resume from"""
+    info = _get_upload(upload_id)
+    return Response(status_code=200, headers={
+        **TUS_HEADERS,
+        "Upload-Offset": str(info["offset"]),
+        "Upload-Length": str(info["length"]),
+        "Upload-Expires": _expires_header(info),
+        "Cache-Control": "no-store",
+    })
+
+
+@router.patch("/{upload_id}", status_code=204)
+async def append_upload_chunk(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., ge=0),
+    upload_checksum: Optional[str] = Header(None)
+):
+    """Append the request body to an upload at Upload-Offset"""
+    if request.headers.get("content-type") != CHUNK_CONTENT_TYPE:
+        raise HTTPException(status_code=415, detail=f"Content-Type must be {CHUNK_CONTENT_TYPE}",
+                            headers=TUS_HEADERS)
+
+    hasher, expected_digest = None, None
+    if upload_checksum:
+        algorithm, _, encoded = upload_checksum.partition(" ")
+        if algorithm not in CHECKSUM_ALGORITHMS:
+            raise HTTPException(status_code=400, detail=f"Unsupported checksum algorithm '{algorithm}'",
+                                headers=TUS_HEADERS)
+        try:
+            expected_digest = base64.b64decode(encoded, validate=True)
+        except binascii.Error:
+            raise HTTPException(status_code=400, detail="Invalid Upload-Checksum", headers=TUS_HEADERS)
+        hasher = hashlib.new(algorithm)
+
+    lock = _writing.setdefault(upload_id, asyncio.Lock())
+    if lock.locked():
+        raise HTTPException(status_code=409, detail="Upload is being written by another request",
+                            headers=TUS_HEADERS)
+    async with lock:
+        try:
+            info = await run_in_threadpool(_get_upload, upload_id)
+            offset = info["offset"]
+            if upload_offset != offset:
+                raise HTTPException(status_code=409, detail="Upload-Offset does not match",
+                                    headers={**TUS_HEADERS, "Upload-Offset": str(offset)})
+
+            written = await _append(upload_id, request, offset, info, hasher)
+
+            if hasher is not None and hasher.digest() != expected_digest:
+                await run_in_threadpool(os.truncate, _data_path(upload_id), offset)
+                raise HTTPException(status_code=CHECKSUM_MISMATCH, detail="Checksum mismatch",
+                                    headers=TUS_HEADERS)
+        finally:
+            _writing.pop(upload_id, None)
+
+    new_offset = offset + written
+    if new_offset == info["length"]:
+        logger.info("Completed resumable upload", extra=log_fields(upload_id=upload_id, length=new_offset))
+    return Response(status_code=204, headers={
+        **TUS_HEADERS,
+        "Upload-Offset": str(new_offset),
+        "Upload-Expires": _expires_header(info),
+    })
+
+
+async def _append(upload_id: str, request: Request, offset: int, info: Dict[str, Any], hasher) -> int:
+    """Stream the body onto the .part file; returns the bytes written."""
+    path = _data_path(upload_id)
+    length = info["length"]
+    filename = info["metadata"].get("filename")
+    # The start of the file is held back until its type is checked
+    head = bytearray() if offset == 0 else None
+    handle = await run_in_threadpool(open, path, "ab")
+    written = 0
+    try:
+        async for chunk in request.stream():
+            written += len(chunk)
+            if offset + written > length:
+                raise RequestTooLarge("Chunk past Upload-Length", length - offset)
+            if hasher is not None:
+                hasher.update(chunk)
+            if head is not None:
+                head.extend(chunk)
+                if len(head) < SNIFF_BYTES:
+                    continue
+                chunk, head = bytes(head), None
+                check_file_type(chunk, filename, "Upload")
+            await run_in_threadpool(handle.write, chunk)
+        if head:
+            # A first chunk shorter than SNIFF_BYTES
+            check_file_type(bytes(head), filename, "Upload")
+            await run_in_threadpool(handle.write, bytes(head))
+    except ClientDisconnect:
+        # Keep what arrived unless it can't be verified against the checksum
+        await run_in_threadpool(handle.close)
+        if hasher is not None:
+            await run_in_threadpool(os.truncate, path, offset)
+        raise
+    except BaseException:
+        await run_in_threadpool(handle.close)
+        await run_in_threadpool(os.truncate, path, offset)
+        raise
+    await run_in_threadpool(handle.close)
+    return written
+
+
+@router.delete("/{upload_id}", status_code=204)
+def delete_resumable_upload(upload_id: str):
+    """Discard an upload (tus termination)"""
+    _get_upload(upload_id)
+    delete_upload(upload_id)
+    return Response(status_code=204, headers=TUS_HEADERS)
+
+
+# ============================================================================
+# FORM HANDOFF
+# ============================================================================
+
+def attach_uploads(form: FormData, file_inputs: Iterable[str], max_file_bytes: int) -> FormData:
+    """
+    Replace upload IDs sent in file inputs with the completed uploads.
+
+    Args:
+        form: Parsed form body
+        file_inputs: Names of the form's file inputs
+        max_file_bytes: Size limit of each file of the form
+
+    Returns:
+        The form, with an UploadFile for every upload ID
+
+    Raises:
+        RequestValidationError: An ID that isn't a completed upload (422)
+        RequestTooLarge: An upload larger than the form accepts (413)
+        UnsupportedFileType: An upload that isn't of an accepted type (415)
+    """
+    file_inputs = set(file_inputs)
+    references = [(key, value) for key, value in form.multi_items()
+                  if key in file_inputs and isinstance(value, str) and value]
+    if not references:
+        return form
+
+    uploads = {}
+    errors = []
+    for key, upload_id in references:
+        info = load_upload(upload_id)
+        if info is None or info["offset"] != info["length"]:
+            errors.append({
+                "type": "upload_incomplete",
+                "loc": ("body", key),
+                "msg": "Not a completed upload",
+                "input": upload_id,
+            })
+        elif info["length"] > max_file_bytes:
+            raise RequestTooLarge(f"File '{key}'", max_file_bytes)
+        else:
+            info["filename"] = info["metadata"].get("filename") or upload_id
+            # Checked when the first chunk arrived; read again for the detected
+            # type, before any handle is handed out, so a refusal leaks nothing
+            with open(_data_path(upload_id), "rb") as handle:
+                info["content_type"] = check_file_type(
+                    handle.read(SNIFF_BYTES), info["filename"], f"File '{key}'")
+            uploads[upload_id] = info
+    if errors:
+        raise RequestValidationError(errors)
+
+    items = []
+    for key, value in form.multi_items():
+        if key in file_inputs and isinstance(value, str) and value in uploads:
+            info = uploads[value]
+            value = UploadFile(
+                file=open(_data_path(value), "rb"),
+                size=info["length"],
+                filename=info["filename"],
+                headers=Headers({"content-type": info["content_type"]}),
+            )
+        items.append((key, value))
+    return FormData(items)
@@ -1,13 +1,27 @@
 
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
+import logging
 from datetime import datetime
 from fastapi import UploadFile
+import hashlib
 import os
+import re
 import uuid
-from pathlib import Path
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from app import group_commit, ingest
+from app.file_types import stored_extension
+from app.previews import PREVIEWS_ENABLED, derivative_paths, preview_renderer
+from app.storage import storage
+from app.logging_config import log_fields
+from app.transactions import run_in_transaction
+
+
+logger = logging.getLogger(__name__)
 
 
 # ============================================================================
@@ -41,6 +55,38 @@ def create_student_name(given_name: Optional[str], family_name: Optional[str]) -
 # FILE HANDLING UTILITIES
 # ============================================================================
 
+# Levels of hashed fan-out directories between a form's upload directory
+# and the student folders (0 = uploads/form_name/ucf_id/). Each level is
+# two hex digits, so 2 levels spread students over 65536 directories.
+# tools/migrate_upload_layout.py moves existing files after a change.
+UPLOAD_SHARD_LEVELS = int(os.getenv("UPLOAD_SHARD_LEVELS", "0"))
+
+_SHARD_NAME = re.compile(r"[0-9a-f]{2}")
+
+
+def student_upload_dir(destination_dir: str, ucf_id: str, levels: Optional[int] = None) -> str:
+    """
+    Folder of one student's files under a form's upload directory.
+    
+    Args:
+        destination_dir: Base directory (e.g., "uploads/exit_forms")
+        ucf_id: Student's UCF ID
+        levels: Fan-out levels (default UPLOAD_SHARD_LEVELS)
+    
+    Returns:
+        Path of the student folder
+        
+    Example:
+        student_upload_dir("uploads/exit_forms", "1234567", levels=2)
+        # Result: "uploads/exit_forms/20/ea/1234567"
+    """
+    if levels is None:
+        levels = UPLOAD_SHARD_LEVELS
+    digest = hashlib.sha1(str(ucf_id).encode("utf-8")).hexdigest()
+    shards = [digest[2 * level:2 * level + 2] for level in range(levels)]
+    return os.path.join(destination_dir, *shards, str(ucf_id))
+
+
 async def save_upload_file(
     upload_file: UploadFile, 
     destination_dir: str,
@@ -49,7 +95,10 @@ async def save_upload_file(
     """
     Save an uploaded file to student-specific subfolder and return its path.
     
-    File Organization: uploads/form_name/ucf_id/filename.ext
+    File Organization: uploads/form_name/ucf_id/filename.ext, with hashed
+    fan-out directories before ucf_id if UPLOAD_SHARD_LEVELS is set. The
+    path is the file's key in the storage backend (app/storage.py): a path
+    on local disk, or the object key in the S3 bucket.
     
     Args:
         upload_file: FastAPI UploadFile object
@@ -67,28 +116,69 @@ async def save_upload_file(
         return None
     
     # Always create student-specific subfolder with UCF ID
-    full_destination = os.path.join(destination_dir, str(ucf_id))
+    full_destination = student_upload_dir(destination_dir, ucf_id)
     
-    # Create directory structure including UCF ID subfolder
-    Path(full_destination).mkdir(parents=True, exist_ok=True)
-    
-    # Generate unique filename
-    file_extension = os.path.splitext(upload_file.filename)[1]
+    # Generate unique filename; the extension follows the type detected
+    # from the content (app/file_types.py), not the client's filename
+    file_extension = stored_extension(upload_file.content_type, upload_file.filename)
     unique_filename = f"{uuid.uuid4()}{file_extension}"
     file_path = os.path.join(full_destination, unique_filename)
     
-    # Save file
-    with open(file_path, "wb") as buffer:
-        content = await upload_file.read()
-        buffer.write(content)
+    # Stream the spooled upload to storage in chunks (multipart parts on S3)
+    # on a worker thread instead of reading the whole file on the event loop
+    await run_in_threadpool(storage.save, file_path, upload_file.file, upload_file.content_type)
+
+    # Thumbnail and preview are rendered in the background (app/previews.py)
+    if PREVIEWS_ENABLED:
+        preview_renderer.schedule(file_path)
     
-    print(f"Saved file for student {ucf_id}: {file_path} (original: {upload_file.filename})")
+    logger.debug(
+        "Saved upload",
+        extra=log_fields(ucf_id=ucf_id, path=file_path, content_type=upload_file.content_type))
     return file_path
 
 
+def file_keys(form_data: Dict[str, Any], file_field_names: list[str]) -> list[str]:
+    """
+    Storage keys of the uploaded files of a form record, with their thumbnails and previews.
+    
+    Args:
+        form_data: Dictionary containing form data with file paths
+        file_field_names: List of field names that contain file paths
+    """
+    keys = []
+    for field in file_field_names:
+        file_path = form_data.get(field)
+        if file_path:
+            keys.append(file_path)
+            keys.extend(derivative_paths(file_path))
+    return keys
+
+
+def delete_files(keys: list[str]) -> int:
+    """
+    Delete many stored files at once (one DeleteObjects request per 1000 keys on S3).
+    
+    Errors are logged, never raised: the records are gone already and
+    leftover files are collected by app/upload_gc.py.
+    
+    Returns:
+        Number of files deleted
+    """
+    if not keys:
+        return 0
+    try:
+        deleted = storage.delete_many(keys)
+        logger.debug("Deleted files", extra=log_fields(requested=len(keys), deleted=deleted))
+        return deleted
+    except Exception as e:
+        logger.warning("Error deleting files", extra=log_fields(count=len(keys), error=str(e)))
+        return 0
+
+
 def delete_file_if_exists(file_path: Optional[str]) -> bool:
     """
-    Delete a file if it exists.
+    Delete a file if it exists, along with its thumbnail and preview.
     
     Args:
         file_path: Path to file to delete
@@ -96,15 +186,9 @@ def delete_file_if_exists(file_path: Optional[str]) -> bool:
     Returns:
         True if file was deleted, False otherwise
     """
-    if file_path and os.path.exists(file_path):
-        try:
-            os.remove(file_path)
-            print(f"Deleted file: {file_path}")
-            return True
-        except Exception as e:
-            print(f"Error deleting file {file_path}: {str(e)}")
-            return False
-    return False
+    if not file_path:
+        return False
+    return delete_files([file_path, *derivative_paths(file_path)]) > 0
 
 
 def delete_student_folder(destination_dir: str, ucf_id: str) -> bool:
@@ -112,6 +196,10 @@ def delete_student_folder(destination_dir: str, ucf_id: str) -> bool:
     Delete entire student folder and all files within it.
     Use this when deleting a student's form submission.
     
+    Both the folder of the current layout and the unsharded one are removed,
+    so files not yet moved by a layout migration go too. On S3 the folder's
+    objects are listed and removed with batched multi-object deletes.
+    
     Args:
         destination_dir: Base directory (e.g., "uploads/exit_forms")
         ucf_id: Student's UCF ID
@@ -123,18 +211,21 @@ def delete_student_folder(destination_dir: str, ucf_id: str) -> bool:
         # Deletes uploads/exit_forms/1234567/ and all files inside
         delete_student_folder("uploads/exit_forms", "1234567")
     """
-    student_folder = os.path.join(destination_dir, str(ucf_id))
+    folders = {student_upload_dir(destination_dir, ucf_id)}
+    # An ID that looks like a fan-out directory ("3f") would name a whole shard
+    if not (UPLOAD_SHARD_LEVELS and _SHARD_NAME.fullmatch(str(ucf_id))):
+        folders.add(student_upload_dir(destination_dir, ucf_id, levels=0))
     
-    if os.path.exists(student_folder):
+    deleted = False
+    for student_folder in folders:
         try:
-            import shutil
-            shutil.rmtree(student_folder)
-            print(f"Deleted student folder: {student_folder}")
-            return True
+            if storage.delete_prefix(student_folder):
+                logger.debug("Deleted student folder", extra=log_fields(ucf_id=ucf_id))
+                deleted = True
         except Exception as e:
-            print(f"Error deleting folder {student_folder}: {str(e)}")
-            return False
-    return False
+            logger.warning(
+                "Error deleting student folder", extra=log_fields(ucf_id=ucf_id, error=str(e)))
+    return deleted
 
 
 def delete_multiple_files(form_data: Dict[str, Any], file_field_names: list[str]) -> None:
@@ -142,14 +233,13 @@ def delete_multiple_files(form_data: Dict[str, Any], file_field_names: list[str]
     Delete multiple individual files from form data.
     Note: Consider using delete_student_folder() instead for cleaner bulk deletion.
     
+    All files go in one batched delete_files() call.
+    
     Args:
         form_data: Dictionary containing form data with file paths
         file_field_names: List of field names that contain file paths
     """
-    for field in file_field_names:
-        file_path = form_data.get(field)
-        if file_path:
-            delete_file_if_exists(file_path)
+    delete_files(file_keys(form_data, file_field_names))
 
 
 # ============================================================================
@@ -164,6 +254,7 @@ UPLOAD_PATHS = {
     "leave_requests": "uploads/leave_requests",
     "opt_stem_applications": "uploads/opt_stem_applications",
     "exit_forms": "uploads/exit_forms",
+    "global_transfer_out": "uploads/global_transfer_out",
     "virtual_checkin": "uploads/virtual_checkin",
 }
 
@@ -228,9 +319,6 @@ async def save_multiple_files(
         # Determine the key name for the result
         result_key = f"{field_name}_path" if add_path_suffix else field_name
         file_paths[result_key] = file_path
-        
-        if file_path:
-            print(f"Saved {field_name} for student {ucf_id}: {file_path}")
     
     return file_paths
 
@@ -271,15 +359,24 @@ def convert_multiple_bools(fields_dict: Dict[str, Optional[str]]) -> Dict[str, O
 
 def commit_to_db(db: Session, record, success_message: Optional[str] = None):
     """
-    Add, commit, and refresh a database record with error handling.
+    Add and commit a database record with error handling.
+    
+    Transient "database is locked" errors are retried with backoff (see
+    app.transactions) before giving up with a 500.
+    
+    With group commit enabled (GROUP_COMMIT=true) the insert is coalesced with
+    other concurrent inserts into one transaction by the group-commit writer,
+    and the new ID comes back from INSERT ... RETURNING instead of a refresh.
+    This call blocks until that transaction commits, so async routes should
+    run it in the threadpool.
     
     Args:
         db: Database session
         record: SQLAlchemy model instance to commit
-        success_message: Optional message to print on success
+        success_message: Optional message to log on success
     
     Returns:
-        The refreshed record
+        The committed record
         
     Raises:
         HTTPException: If database operation fails
@@ -293,24 +390,120 @@ def commit_to_db(db: Session, record, success_message: Optional[str] = None):
         )
     """
     try:
-        db.add(record)
-        db.commit()
-        db.refresh(record)
-        
-        if success_message:
-            print(success_message)
+        if group_commit.GROUP_COMMIT:
+            record.id = group_commit.group_commit_writer.insert(record)
         else:
-            print(f"Successfully committed record ID: {record.id}")
+            # The INSERT fills in the ID and the session doesn't expire on
+            # commit, so the record is complete without a refresh SELECT
+            run_in_transaction(db, lambda: db.add(record), f"create_{record.__tablename__}")
+        
+        logger.info(
+            success_message or "Committed record",
+            extra=log_fields(table=record.__tablename__, record_id=record.id))
             
         return record
     except Exception as e:
         db.rollback()
-        print(f"Database commit error: {str(e)}")
+        logger.error(
+            "Database commit error",
+            extra=log_fields(table=record.__tablename__, error=str(e)))
         raise HTTPException(
             status_code=500,
             detail=f"Database error: {str(e)}"
         )
 
+
+def delete_all_records(
+    db: Session,
+    model_class,
+    label: str,
+    file_fields: tuple = ()
+) -> int:
+    """
+    Delete every row of a form table in a single DELETE statement.
+    
+    Rows are never loaded into the session. When file_fields is given the
+    statement uses DELETE ... RETURNING form_data to collect the upload paths
+    of the deleted rows, and those files are removed only after the delete
+    has committed, in one batched delete.
+    
+    Args:
+        db: Database session
+        model_class: The SQLAlchemy model class (e.g., models.ExitForm)
+        label: Name used for retry metrics (usually the route name)
+        file_fields: form_data keys holding paths of uploaded files to delete
+    
+    Returns:
+        Number of deleted rows
+        
+    Example:
+        count = delete_all_records(
+            db, models.ExitForm, "delete_all_exit_forms",
+            file_fields=("flight_itinerary_path",))
+    """
+    if not file_fields:
+        return run_in_transaction(db, lambda: db.query(model_class).delete(), label)
+    
+    statement = (
+        delete(model_class)
+        .returning(model_class.form_data)
+        .execution_options(synchronize_session=False)
+    )
+    deleted_form_data = run_in_transaction(db, lambda: db.execute(statement).scalars().all(), label)
+    
+    # One batched delete for the files of every deleted row
+    delete_files([
+        key for form_data in deleted_form_data if form_data
+        for key in file_keys(form_data, list(file_fields))
+    ])
+    return len(deleted_form_data)
+
+
+def submit_record(db: Session, record, success_message: Optional[str] = None):
+    """
+    Persist a new form submission.
+    
+    Normally this is just commit_to_db(). When ingest mode is enabled
+    (INGEST_MODE=true) the record is appended to the durable ingest journal
+    instead and the client gets a 202 with a receipt ID right away; the
+    ingest worker inserts it into the form table later.
+    
+    Args:
+        db: Database session
+        record: SQLAlchemy model instance to persist
+        success_message: Optional message to log on success
+    
+    Returns:
+        The committed record, or a 202 JSONResponse with the receipt in ingest mode
+        
+    Example:
+        db_request = create_db_record(models.OPTRequest, ...)
+        return submit_record(db, db_request)
+    """
+    if not ingest.INGEST_MODE:
+        return commit_to_db(db, record, success_message)
+    
+    try:
+        receipt = ingest.enqueue_record(record)
+    except Exception as e:
+        logger.error("Ingest journal error", extra=log_fields(error=str(e)))
+        raise HTTPException(
+            status_code=500,
+            detail=f"Database error: {str(e)}"
+        )
+    
+    logger.info(
+        "Queued submission",
+        extra=log_fields(form_type=receipt.form_type, receipt_id=receipt.id))
+    return JSONResponse(
+        status_code=202,
+        content={
+            "receipt_id": receipt.id,
+            "status": receipt.status,
+            "status_url": f"/api/ingest/receipts/{receipt.id}"
+        }
+    )
+
 # ============================================================================
 # COMMON FORM FIELDS DATA CLASS
 # ============================================================================
@@ -1046,4 +1046,17 @@ class VirtualCheckInRequest(VirtualCheckInRequestBase):
 
     class Config:
         from_attributes = True
-        populate_by_name = True
\ No newline at end of file
+        populate_by_name = True
+
+class IngestReceipt(BaseModel):
+    # Receipt returned when a submission is queued in ingest mode
+    id: str
+    form_type: str
+    status: str  # queued, committed or failed
+    created_at: datetime
+    processed_at: Optional[datetime] = None
+    record_id: Optional[int] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
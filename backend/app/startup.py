@@ -0,0 +1,103 @@
+"""
+Worker startup: table creation and route warm-up.
+
+Two modes, picked with LAZY_INIT:
+
+- Default (eager): tables are created when main is imported, and the
+  lifespan startup warms every route handler before the worker accepts
+  traffic, so the first real request doesn't pay for FastAPI's analysis
+  of the big Form(...) signatures.
+- LAZY_INIT=true: boot does as little as possible. Table creation becomes
+  a single existence check at startup and routes are prepared on the
+  first request.
+
+In both modes /openapi.json is served from the document written by
+tools/build_openapi.py when it exists (see app.openapi_cache), so workers
+don't generate it at runtime.
+
+benchmarks/bench_startup.py measures import time and time-to-first-request
+for both modes.
+
+Configuration:
+    LAZY_INIT     Defer startup work (default false)
+"""
+
+import logging
+import os
+
+from sqlalchemy import inspect
+
+from app.logging_config import log_fields
+
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+LAZY_INIT = os.getenv("LAZY_INIT", "false").lower() in ['true', 'yes', '1', 'on']
+
+
+# ============================================================================
+# TABLES
+# ============================================================================
+
+def create_tables() -> None:
+    """Create any missing tables (CREATE TABLE IF NOT EXISTS per table)."""
+    from app import models
+    from app.database import engine, ingest_engine
+
+    models.Base.metadata.create_all(bind=engine)
+    models.IngestBase.metadata.create_all(bind=ingest_engine)
+
+
+def ensure_tables() -> None:
+    """
+    Create tables only if some are missing.
+
+    One sqlite_master lookup per database instead of a PRAGMA per table;
+    on an already-migrated database nothing else runs.
+    """
+    from app import models
+    from app.database import engine, ingest_engine
+
+    for base, bind in ((models.Base, engine), (models.IngestBase, ingest_engine)):
+        existing = set(inspect(bind).get_table_names())
+        missing = set(base.metadata.tables) - existing
+        if missing:
+            logger.info("Creating missing tables", extra=log_fields(tables=sorted(missing)))
+            base.metadata.create_all(bind=bind)
+
+
+# ============================================================================
+# ROUTE WARM-UP
+# ============================================================================
+
+async def warm_routes(app) -> None:
+    """
+    Prepare every route handler before the first request arrives.
+
+    FastAPI builds the handlers of included routers the first time a
+    request is matched against them. Routing a path that matches nothing
+    walks every router once, so all of them get built here instead of on
+    a user's request. Goes straight to the router, so no middleware
+    (metrics, logging) sees it.
+    """
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/__warmup__", "raw_path": b"/__warmup__",
+        "root_path": "", "query_string": b"", "headers": [],
+        "client": None, "server": None,
+    }
+    # No "app" in the scope, so the unmatched path gets a plain 404
+    # response instead of an HTTPException meant for the middleware
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app.router(scope, receive, send)
@@ -0,0 +1,339 @@
+"""
+Where uploaded files are stored.
+
+Form records keep a storage key for every uploaded file, e.g.
+"uploads/exit_forms/1234567/<uuid>.pdf". Everything that reads, writes or
+deletes uploads goes through the `storage` backend selected with
+STORAGE_BACKEND, so the API isn't tied to one node's disk:
+
+    local  Keys are paths relative to backend/ (the default, and the layout
+           every existing deployment has)
+    s3     Keys are object keys in S3_BUCKET on AWS S3 or any S3-compatible
+           server (MinIO, Ceph, moto); every API worker on every node sees
+           the same files
+
+Both backends implement the same methods:
+
+    save(key, source, content_type)  stream a file object in
+    open(key)                        file object to read from
+    stat(key)                        size, modification time and ETag
+    download(key, path)              copy to a local file
+    delete_many(keys)                remove many files in few requests
+    delete_prefix(prefix)            remove everything under a folder
+    list(prefix)                     every file under a folder, streamed
+
+With S3 the spooled upload is sent as a multipart upload in
+S3_MULTIPART_CHUNK_BYTES parts, several at a time, without reading the
+whole file into memory. Deletes use DeleteObjects, which removes up to
+1000 keys per request. Downloads are redirects to a presigned URL, so
+browsers fetch the file from S3 directly, or are proxied through the API
+with S3_PRESIGNED_DOWNLOADS=false (see app/attachments.py).
+
+boto3 is needed for the s3 backend only and is imported on first use.
+
+Configuration:
+    STORAGE_BACKEND             local or s3 (default local)
+    S3_BUCKET                   Bucket holding the uploads
+    S3_ENDPOINT_URL             Endpoint of an S3-compatible server, e.g. http://localhost:9000
+    S3_REGION                   Region of the bucket
+    S3_KEY_PREFIX               Prepended to every object key (default none)
+    S3_MULTIPART_CHUNK_BYTES    Part size of multipart uploads (default 8 MB)
+    S3_UPLOAD_CONCURRENCY       Parts uploaded at once per file (default 4)
+    S3_PRESIGNED_DOWNLOADS      Redirect downloads to presigned URLs (default true)
+    S3_PRESIGN_EXPIRES_SECONDS  Lifetime of a presigned URL (default 300)
+
+Credentials come from the usual AWS sources (AWS_ACCESS_KEY_ID and
+AWS_SECRET_ACCESS_KEY, a profile, or an instance role).
+"""
+
+import logging
+import os
+import shutil
+import threading
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional
+
+from app.logging_config import log_fields
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local").lower()
+
+S3_BUCKET = os.getenv("S3_BUCKET")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
+S3_REGION = os.getenv("S3_REGION")
+S3_KEY_PREFIX = os.getenv("S3_KEY_PREFIX", "")
+S3_MULTIPART_CHUNK_BYTES = int(os.getenv("S3_MULTIPART_CHUNK_BYTES", str(8 * 1024 * 1024)))
+S3_UPLOAD_CONCURRENCY = int(os.getenv("S3_UPLOAD_CONCURRENCY", "4"))
+S3_PRESIGNED_DOWNLOADS = os.getenv("S3_PRESIGNED_DOWNLOADS", "true").lower() in ['true', 'yes', '1', 'on']
+S3_PRESIGN_EXPIRES_SECONDS = int(os.getenv("S3_PRESIGN_EXPIRES_SECONDS", "300"))
+
+# Files are copied in chunks of this size
+COPY_CHUNK_BYTES = 1024 * 1024
+
+# Most keys one DeleteObjects request accepts
+S3_DELETE_BATCH = 1000
+
+
+@dataclass
+class StoredFile:
+    key: str
+    size: int
+    modified: float  # Unix time
+    etag: Optional[str] = None  # Quoted; set by backends that keep one
+
+
+# ============================================================================
+# LOCAL DISK
+# ============================================================================
+
+class LocalStorage:
+    """Files on the local filesystem; keys are paths relative to the working directory."""
+
+    is_local = True
+
+    def save(self, key: str, source: BinaryIO, content_type: Optional[str] = None) -> None:
+        os.makedirs(os.path.dirname(key), exist_ok=True)
+        with open(key, "wb") as target:
+            shutil.copyfileobj(source, target, COPY_CHUNK_BYTES)
+
+    def open(self, key: str) -> BinaryIO:
+        return open(key, "rb")
+
+    def stat(self, key: str) -> Optional[StoredFile]:
+        try:
+            stat_result = os.stat(key)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return StoredFile(key, stat_result.st_size, stat_result.st_mtime)
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(key)
+
+    def download(self, key: str, path: str) -> None:
+        shutil.copyfile(key, path)
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Remove files; returns how many existed."""
+        deleted = 0
+        for key in keys:
+            try:
+                os.remove(key)
+                deleted += 1
+            except FileNotFoundError:
+                pass
+        return deleted
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Remove a folder and everything in it; returns the files removed."""
+        folder = prefix.rstrip("/")
+        if not os.path.isdir(folder):
+            return 0
+        count = sum(1 for _ in self.list(folder))
+        shutil.rmtree(folder)
+        return count
+
+    def list(self, prefix: str) -> Iterator[StoredFile]:
+        """Every file below a folder, streamed from os.scandir."""
+        pending = [prefix.rstrip("/")]
+        while pending:
+            try:
+                scanner = os.scandir(pending.pop())
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            with scanner:
+                for entry in scanner:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        try:
+                            stat_result = entry.stat(follow_symlinks=False)
+                        except FileNotFoundError:
+                            continue
+                        yield StoredFile(entry.path, stat_result.st_size, stat_result.st_mtime)
+
+
+# ============================================================================
+# S3-COMPATIBLE OBJECT STORAGE
+# ============================================================================
+
+class S3Storage:
+    """
+    Files as objects in an S3 bucket.
+
+    Example:
+        storage = S3Storage("ucf-global-uploads", endpoint_url="http://localhost:9000")
+        storage.save("uploads/exit_forms/1234567/a1b2.pdf", handle, "application/pdf")
+    """
+
+    is_local = False
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        key_prefix: str = ""
+    ):
+        if not bucket:
+            raise ValueError("S3_BUCKET must be set for STORAGE_BACKEND=s3")
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url
+        self.region = region
+        self.key_prefix = key_prefix
+        self._client = None
+        self._transfer_config = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        # Created on first use: worker processes and tools that never touch
+        # uploads don't pay for importing boto3
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import boto3
+                    from boto3.s3.transfer import TransferConfig
+                    from botocore.config import Config
+
+                    self._transfer_config = TransferConfig(
+                        multipart_threshold=S3_MULTIPART_CHUNK_BYTES,
+                        multipart_chunksize=S3_MULTIPART_CHUNK_BYTES,
+                        max_concurrency=S3_UPLOAD_CONCURRENCY,
+                    )
+                    self._client = boto3.client(
+                        "s3", endpoint_url=self.endpoint_url, region_name=self.region,
+                        # Room for every request thread plus the parts of a multipart upload
+                        config=Config(max_pool_connections=max(10, 4 * S3_UPLOAD_CONCURRENCY)),
+                    )
+        return self._client
+
+    def object_key(self, key: str) -> str:
+        return self.key_prefix + key.replace(os.sep, "/")
+
+    def _key(self, object_key: str) -> str:
+        return object_key[len(self.key_prefix):]
+
+    def _not_found(self, error) -> bool:
+        return error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+    def save(self, key: str, source: BinaryIO, content_type: Optional[str] = None) -> None:
+        client = self.client
+        extra = {"ContentType": content_type} if content_type else None
+        # Multipart above S3_MULTIPART_CHUNK_BYTES; parts are read from the
+        # file object one at a time
+        client.upload_fileobj(source, self.bucket, self.object_key(key),
+                              ExtraArgs=extra, Config=self._transfer_config)
+
+    def open(self, key: str) -> BinaryIO:
+        return self.get(key)["Body"]
+
+    def get(self, key: str, byte_range: Optional[str] = None) -> Dict:
+        """
+        GetObject response; byte_range is a Range header value.
+
+        Raises:
+            FileNotFoundError: No such object
+            ValueError: The range is outside the object
+        """
+        from botocore.exceptions import ClientError
+
+        arguments = {"Bucket": self.bucket, "Key": self.object_key(key)}
+        if byte_range:
+            arguments["Range"] = byte_range
+        try:
+            return self.client.get_object(**arguments)
+        except ClientError as e:
+            if self._not_found(e):
+                raise FileNotFoundError(key) from e
+            if e.response.get("Error", {}).get("Code") == "InvalidRange":
+                raise ValueError(f"Range not satisfiable: {byte_range}") from e
+            raise
+
+    def stat(self, key: str) -> Optional[StoredFile]:
+        from botocore.exceptions import ClientError
+
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=self.object_key(key))
+        except ClientError as e:
+            if self._not_found(e):
+                return None
+            raise
+        return StoredFile(key, head["ContentLength"], head["LastModified"].timestamp(), head.get("ETag"))
+
+    def exists(self, key: str) -> bool:
+        return self.stat(key) is not None
+
+    def download(self, key: str, path: str) -> None:
+        self.client.download_file(self.bucket, self.object_key(key), path, Config=self._transfer_config)
+
+    def presigned_url(self, key: str, filename: str, content_disposition_type: str = "inline") -> str:
+        """Time-limited URL to download an object straight from S3."""
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": self.object_key(key),
+                "ResponseContentDisposition": f'{content_disposition_type}; filename="{filename}"',
+            },
+            ExpiresIn=S3_PRESIGN_EXPIRES_SECONDS,
+        )
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Remove objects with DeleteObjects, S3_DELETE_BATCH keys per request."""
+        deleted = 0
+        batch = []
+        for key in keys:
+            batch.append({"Key": self.object_key(key)})
+            if len(batch) == S3_DELETE_BATCH:
+                deleted += self._delete_batch(batch)
+                batch = []
+        if batch:
+            deleted += self._delete_batch(batch)
+        return deleted
+
+    def _delete_batch(self, batch) -> int:
+        response = self.client.delete_objects(Bucket=self.bucket, Delete={"Objects": batch, "Quiet": True})
+        errors = response.get("Errors", [])
+        for error in errors:
+            logger.warning("Error deleting object", extra=log_fields(
+                key=error.get("Key"), error=error.get("Message") or error.get("Code")))
+        return len(batch) - len(errors)
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Remove every object under a folder; returns the objects removed."""
+        return self.delete_many(stored.key for stored in self.list(prefix))
+
+    def list(self, prefix: str) -> Iterator[StoredFile]:
+        """Every object under a folder, one ListObjectsV2 page at a time."""
+        prefix = self.object_key(prefix.rstrip("/") + "/")
+        for page in self.client.get_paginator("list_objects_v2").paginate(Bucket=self.bucket, Prefix=prefix):
+            for item in page.get("Contents", []):
+                yield StoredFile(
+                    self._key(item["Key"]), item["Size"], item["LastModified"].timestamp(), item.get("ETag"))
+
+
+# ============================================================================
+# SELECTED BACKEND
+# ============================================================================
+
+def create_storage(backend: str = STORAGE_BACKEND):
+    """
+    The storage backend named by STORAGE_BACKEND.
+
+    Raises:
+        ValueError: Unknown backend, or S3 without a bucket
+    """
+    if backend == "local":
+        return LocalStorage()
+    if backend == "s3":
+        return S3Storage(S3_BUCKET, endpoint_url=S3_ENDPOINT_URL, region=S3_REGION, key_prefix=S3_KEY_PREFIX)
+    raise ValueError(f"Unknown STORAGE_BACKEND '{backend}' (expected local or s3)")
+
+
+storage = create_storage()
@@ -0,0 +1,150 @@
+"""
+Per-request timing breakdown, reported as a Server-Timing header.
+
+ServerTimingMiddleware starts a RequestTimings for each HTTP request and
+publishes it through a context variable. The SQLAlchemy cursor hooks in
+app.database add every query's duration to it, and TimedRoute marks when
+the endpoint function returned, so the response carries:
+
+    Server-Timing: db;dur=4.1;desc="3 queries", serialize;dur=0.8, total;dur=9.6
+
+- db: time spent executing SQL (summed over all queries of the request)
+- serialize: time from the endpoint returning to the response starting,
+  i.e. response_model validation and JSON encoding (omitted when the
+  endpoint raised)
+- total: time spent in the app for the whole request
+
+The RequestTimings object is shared by reference, so queries made from
+sync endpoints running in the threadpool are counted too.
+
+Configuration:
+    SERVER_TIMING_ENABLED  Set to false to omit the header (default true)
+"""
+
+import functools
+import inspect
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi.routing import APIRoute
+
+from app.profiler import track_current_thread
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() in ['true', 'yes', '1', 'on']
+
+
+# ============================================================================
+# PER-REQUEST STATE
+# ============================================================================
+
+class RequestTimings:
+    """Timing counters for the request currently being handled."""
+
+    __slots__ = ("start", "query_count", "query_seconds", "endpoint_done")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.query_count = 0
+        self.query_seconds = 0.0
+        self.endpoint_done: Optional[float] = None
+
+    def add_query(self, seconds: float) -> None:
+        self.query_count += 1
+        self.query_seconds += seconds
+
+    def server_timing(self, now: float) -> str:
+        """Build the Server-Timing header value (durations in milliseconds)."""
+        parts = [f'db;dur={self.query_seconds * 1000:.1f};desc="{self.query_count} queries"']
+        if self.endpoint_done is not None:
+            parts.append(f"serialize;dur={(now - self.endpoint_done) * 1000:.1f}")
+        parts.append(f"total;dur={(now - self.start) * 1000:.1f}")
+        return ", ".join(parts)
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Return the RequestTimings of the request being handled, if any."""
+    return _current_timings.get()
+
+
+# ============================================================================
+# ROUTE CLASS
+# ============================================================================
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute that records when the endpoint function returns (and lets the
+    per-request profiler follow sync endpoints onto their threadpool thread).
+
+    Usage:
+        router = APIRouter(route_class=TimedRoute)
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _mark_endpoint_done(endpoint), **kwargs)
+
+
+def _mark_endpoint_done(endpoint):
+    # functools.wraps keeps the signature FastAPI inspects for parameters
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            result = await endpoint(*args, **kwargs)
+            _mark_done()
+            return result
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def sync_wrapper(*args, **kwargs):
+        # Sync endpoints run on a threadpool thread - include it in a
+        # per-request profile (X-Profile) if one is running
+        with track_current_thread():
+            result = endpoint(*args, **kwargs)
+        _mark_done()
+        return result
+    return sync_wrapper
+
+
+def _mark_done() -> None:
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.endpoint_done = time.perf_counter()
+
+
+# ============================================================================
+# ASGI MIDDLEWARE
+# ============================================================================
+
+class ServerTimingMiddleware:
+    """Collect per-request timings and add the Server-Timing response header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                header = timings.server_timing(time.perf_counter()).encode("latin-1")
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", header)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_timings.reset(token)
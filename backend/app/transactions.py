@@ -0,0 +1,194 @@
+"""
+Retry layer for transient SQLite lock errors.
+
+SQLite reports write contention as OperationalError("database is locked").
+Those failures are transient - the same transaction usually succeeds a few
+milliseconds later - so instead of turning them into HTTP 500s, write paths
+run through run_in_transaction() (or the @transactional decorator), which
+retries only those errors with jittered exponential backoff until a
+deadline. Every other exception is raised immediately.
+
+Retry counts per label are kept in transaction_metrics.
+"""
+
+import functools
+import logging
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, TypeVar
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.logging_config import log_fields
+
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Give up retrying once this much time has passed since the first attempt
+DB_RETRY_DEADLINE_SECONDS = float(os.getenv("DB_RETRY_DEADLINE_SECONDS", "10"))
+
+# Backoff starts at the base delay and doubles per attempt, capped at the max
+DB_RETRY_BASE_DELAY_SECONDS = float(os.getenv("DB_RETRY_BASE_DELAY_SECONDS", "0.01"))
+DB_RETRY_MAX_DELAY_SECONDS = float(os.getenv("DB_RETRY_MAX_DELAY_SECONDS", "0.5"))
+
+TRANSIENT_ERROR_MESSAGES = (
+    "database is locked",
+    "database table is locked",
+    "database is busy",
+)
+
+T = TypeVar("T")
+
+
+def is_transient_db_error(exc: BaseException) -> bool:
+    """Return True for lock/busy errors that are worth retrying."""
+    if not isinstance(exc, OperationalError):
+        return False
+    message = str(exc.orig if exc.orig is not None else exc).lower()
+    return any(fragment in message for fragment in TRANSIENT_ERROR_MESSAGES)
+
+
+# ============================================================================
+# METRICS
+# ============================================================================
+
+class TransactionMetrics:
+    """Thread-safe counters of transactions and lock retries per label."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def record(self, label: str, retries: int, exhausted: bool = False) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(
+                label, {"transactions": 0, "retries": 0, "retried_transactions": 0, "exhausted": 0})
+            counters["transactions"] += 1
+            counters["retries"] += retries
+            if retries:
+                counters["retried_transactions"] += 1
+            if exhausted:
+                counters["exhausted"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {label: dict(counters) for label, counters in self._counters.items()}
+
+
+transaction_metrics = TransactionMetrics()
+
+
+# ============================================================================
+# RETRY HELPERS
+# ============================================================================
+
+def retry_transient(
+    work: Callable[[], T],
+    label: str,
+    deadline_seconds: Optional[float] = None
+) -> T:
+    """
+    Call work(), retrying it while it fails with a transient lock error.
+
+    work must be safe to call again after a failure, i.e. it has to roll
+    back whatever it started.
+
+    Args:
+        work: Zero-argument callable performing one complete attempt
+        label: Name the retries are recorded under in transaction_metrics
+        deadline_seconds: Total time budget (defaults to DB_RETRY_DEADLINE_SECONDS)
+
+    Returns:
+        Whatever work() returns
+
+    Raises:
+        The last OperationalError once the deadline passes, or any
+        non-transient exception immediately
+    """
+    budget = DB_RETRY_DEADLINE_SECONDS if deadline_seconds is None else deadline_seconds
+    deadline = time.monotonic() + budget
+    retries = 0
+    while True:
+        try:
+            result = work()
+        except Exception as e:
+            if not is_transient_db_error(e):
+                transaction_metrics.record(label, retries)
+                raise
+            # Full jitter: sleep a random amount up to the exponential cap
+            delay = random.uniform(
+                0, min(DB_RETRY_MAX_DELAY_SECONDS, DB_RETRY_BASE_DELAY_SECONDS * (2 ** retries)))
+            if time.monotonic() + delay > deadline:
+                transaction_metrics.record(label, retries, exhausted=True)
+                logger.warning(
+                    "Giving up after lock retries",
+                    extra=log_fields(label=label, retries=retries, error=str(e)))
+                raise
+            retries += 1
+            time.sleep(delay)
+            continue
+
+        transaction_metrics.record(label, retries)
+        return result
+
+
+def run_in_transaction(db: Session, work: Callable[[], T], label: str) -> T:
+    """
+    Run work() and commit it, retrying the whole transaction on lock errors.
+
+    The session is rolled back before each retry, so work() must redo all
+    of its changes (add/delete/bulk query) each time it is called.
+
+    Args:
+        db: Database session
+        work: Zero-argument callable that stages changes on db
+        label: Name used for retry metrics (usually the route name)
+
+    Returns:
+        Whatever work() returns
+
+    Example:
+        run_in_transaction(db, lambda: db.delete(db_request), "delete_exit_form")
+
+        count = run_in_transaction(
+            db, lambda: db.query(models.ExitForm).delete(), "delete_all_exit_forms")
+    """
+    def attempt():
+        try:
+            result = work()
+            db.commit()
+            return result
+        except Exception:
+            db.rollback()
+            raise
+
+    return retry_transient(attempt, label)
+
+
+def transactional(label: Optional[str] = None):
+    """
+    Decorator version of retry_transient() for functions that manage their
+    own session (open, commit, close) and can simply be called again.
+
+    Example:
+        @transactional("claim_idempotency_key")
+        def claim_key(key, path):
+            db = SessionLocal()
+            ...
+    """
+    def decorator(func):
+        name = label or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return retry_transient(lambda: func(*args, **kwargs), name)
+        return wrapper
+    return decorator
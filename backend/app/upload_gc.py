@@ -0,0 +1,335 @@
+"""
+Garbage collection of orphaned upload files.
+
+A file can outlive its row: an exception between save_multiple_files() and
+the commit leaves a saved file that no record points to, and so can a
+crash between a delete and the file cleanup after it. collect_orphans()
+reconciles the upload directories with the database:
+
+1. One UNION ALL query projects every "<input>_path" value out of the
+   form_data of every form with file inputs (json_extract in SQLite, no
+   rows are loaded). Submissions still waiting in the ingest queue count as
+   referenced too. The result is a set of referenced paths.
+2. Each directory in UPLOAD_PATHS is listed through the storage backend
+   (app/storage.py): walked with os.scandir on local disk, one
+   ListObjectsV2 page at a time on S3. Entries are streamed and never
+   collected into a list, so memory holds the referenced set and one page
+   or the directories still to visit, however many files there are.
+3. A file nobody references that was last modified more than the grace
+   period ago is deleted, or moved into a local quarantine directory (same
+   relative path) if one is configured. Deletes are batched
+   (GC_DELETE_BATCH files, one DeleteObjects request on S3). The grace
+   period protects files of submissions that are being saved while the
+   collector runs.
+
+Thumbnails and previews (app/previews.py) are kept as long as their
+original is referenced. Student folders left empty are removed.
+
+tools/migrate_upload_layout.py rewrites paths while it runs, so the
+referenced set taken at the start goes stale. It keeps MIGRATION_MARKER
+fresh for as long as it runs; a collection doesn't start while the marker
+is there and stops before its next delete if one appears.
+
+Run it from the command line (tools/gc_uploads.py) or let every worker run
+it on a schedule with UPLOAD_GC_INTERVAL_HOURS.
+
+Configuration:
+    UPLOAD_GC_GRACE_HOURS      Minimum age of a file before it is collected (default 24)
+    UPLOAD_GC_INTERVAL_HOURS   Run the collector in the background this often (default 0, off)
+    UPLOAD_GC_QUARANTINE_DIR   Move orphans here instead of deleting them
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Set
+
+from sqlalchemy import inspect, select, union_all
+from sqlalchemy.orm import Session
+
+from app import models
+from app.attachments import UPLOAD_ROOT
+from app.database import IngestSessionLocal, SessionLocal, ingest_engine
+from app.form_registry import FORMS
+from app.ingest import RECEIPT_QUEUED
+from app.logging_config import log_fields
+from app.previews import VARIANTS
+from app.route_helpers import UPLOAD_PATHS
+from app.storage import StoredFile, storage
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+UPLOAD_GC_GRACE_HOURS = float(os.getenv("UPLOAD_GC_GRACE_HOURS", "24"))
+UPLOAD_GC_INTERVAL_HOURS = float(os.getenv("UPLOAD_GC_INTERVAL_HOURS", "0"))
+UPLOAD_GC_QUARANTINE_DIR = os.getenv("UPLOAD_GC_QUARANTINE_DIR")
+
+# Rows fetched per round trip while reading referenced paths
+REFERENCE_BATCH_SIZE = 10000
+
+# Orphans deleted per batch
+GC_DELETE_BATCH = 1000
+
+# Present while tools/migrate_upload_layout.py moves files
+MIGRATION_MARKER = os.path.join(UPLOAD_ROOT, ".layout-migration")
+
+# A marker not touched for this long was left behind by a crashed migration
+MIGRATION_MARKER_TTL_SECONDS = 3600
+
+_DERIVATIVE_SUFFIXES = tuple(f".{variant}" for variant in VARIANTS)
+
+
+@dataclass
+class CollectionStats:
+    scanned: int = 0
+    orphans: int = 0
+    orphan_bytes: int = 0
+    collected: int = 0
+    seconds: float = 0.0
+    # Stopped (or never started) because a layout migration is running
+    interrupted: bool = False
+
+
+# ============================================================================
+# LAYOUT MIGRATION MARKER
+# ============================================================================
+
+def migration_running() -> bool:
+    """Whether tools/migrate_upload_layout.py is moving files right now."""
+    try:
+        touched = os.path.getmtime(MIGRATION_MARKER)
+    except FileNotFoundError:
+        return False
+    return time.time() - touched < MIGRATION_MARKER_TTL_SECONDS
+
+
+def touch_migration_marker() -> None:
+    """Create the marker or refresh its age; call it at least once per batch."""
+    os.makedirs(UPLOAD_ROOT, exist_ok=True)
+    with open(MIGRATION_MARKER, "a"):
+        os.utime(MIGRATION_MARKER)
+
+
+@contextmanager
+def migration_marker():
+    """
+    Keep collections from running while the block moves files.
+
+    Example:
+        with migration_marker():
+            migrate()
+    """
+    touch_migration_marker()
+    try:
+        yield
+    finally:
+        try:
+            os.remove(MIGRATION_MARKER)
+        except FileNotFoundError:
+            pass
+
+
+# ============================================================================
+# REFERENCED FILES
+# ============================================================================
+
+def _file_key(path: str) -> str:
+    """
+    Path without extension, shared by an upload and its derivatives.
+
+    Example:
+        _file_key("uploads/opt_requests/1234567/a1b2.thumbnail.jpg")
+        # Result: "uploads/opt_requests/1234567/a1b2"
+    """
+    stem = os.path.splitext(os.path.normpath(path))[0]
+    for suffix in _DERIVATIVE_SUFFIXES:
+        if stem.endswith(suffix):
+            return stem[:-len(suffix)]
+    return stem
+
+
+def referenced_keys(db: Session) -> Set[str]:
+    """Keys (see _file_key) of every file a form record or queued submission references."""
+    projections = [
+        select(spec.model.form_data[field].as_string().label("path"))
+        .where(spec.model.form_data[field].as_string().isnot(None))
+        for spec in FORMS
+        for field in spec.file_fields
+    ]
+    statement = union_all(*projections).execution_options(yield_per=REFERENCE_BATCH_SIZE)
+    keys = {_file_key(path) for path in db.execute(statement).scalars() if path}
+
+    # No journal yet means nothing is queued
+    if not inspect(ingest_engine).has_table(models.IngestReceipt.__tablename__):
+        return keys
+    ingest_db = IngestSessionLocal()
+    try:
+        queued = ingest_db.execute(
+            select(models.IngestReceipt.payload)
+            .where(models.IngestReceipt.status == RECEIPT_QUEUED)
+            .execution_options(yield_per=REFERENCE_BATCH_SIZE)
+        ).scalars()
+        for payload in queued:
+            form_data = (payload or {}).get("form_data") or {}
+            keys.update(
+                _file_key(value) for key, value in form_data.items()
+                if key.endswith("_path") and isinstance(value, str)
+            )
+    finally:
+        ingest_db.close()
+    return keys
+
+
+# ============================================================================
+# COLLECTION
+# ============================================================================
+
+def _quarantine(stored: StoredFile, quarantine_dir: str) -> None:
+    target = os.path.join(quarantine_dir, os.path.relpath(stored.key, UPLOAD_ROOT))
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if storage.is_local:
+        shutil.move(stored.key, target)
+    else:
+        storage.download(stored.key, target)
+        storage.delete_many([stored.key])
+
+
+def _delete(batch: List[StoredFile]) -> int:
+    try:
+        return storage.delete_many(stored.key for stored in batch)
+    except Exception as e:
+        logger.warning("Could not collect orphans", extra=log_fields(count=len(batch), error=str(e)))
+        return 0
+
+
+def _migration_started(stats: CollectionStats) -> bool:
+    """Check for a layout migration before deleting; the referenced set is stale once one runs."""
+    if not migration_running():
+        return False
+    if not stats.interrupted:
+        logger.warning("Upload layout migration running, leaving orphans for the next collection")
+    stats.interrupted = True
+    return True
+
+
+def collect_orphans(
+    db: Session,
+    grace_hours: float = UPLOAD_GC_GRACE_HOURS,
+    quarantine_dir: Optional[str] = UPLOAD_GC_QUARANTINE_DIR,
+    dry_run: bool = False
+) -> CollectionStats:
+    """
+    Delete or quarantine upload files that no record references.
+
+    Args:
+        db: Database session (only read from)
+        grace_hours: Files modified more recently are never collected
+        quarantine_dir: Move orphans here instead of deleting them
+        dry_run: Only count the orphans
+
+    Returns:
+        Counts of scanned, orphaned and collected files; interrupted is set
+        if a layout migration kept it from finishing
+
+    Example:
+        stats = collect_orphans(db, grace_hours=48, dry_run=True)
+    """
+    start = time.perf_counter()
+    stats = CollectionStats()
+    if _migration_started(stats):
+        return stats
+    keys = referenced_keys(db)
+    cutoff = time.time() - grace_hours * 3600
+    roots = {os.path.normpath(directory) for directory in UPLOAD_PATHS.values()}
+    emptied = set()
+    batch: List[StoredFile] = []
+
+    for directory in sorted(roots):
+        if stats.interrupted:
+            break
+        for stored in storage.list(directory):
+            stats.scanned += 1
+            if _file_key(stored.key) in keys or stored.modified > cutoff:
+                continue
+
+            stats.orphans += 1
+            stats.orphan_bytes += stored.size
+            if dry_run:
+                continue
+            emptied.add(os.path.dirname(stored.key))
+            if not quarantine_dir:
+                batch.append(stored)
+                if len(batch) == GC_DELETE_BATCH:
+                    if _migration_started(stats):
+                        break
+                    stats.collected += _delete(batch)
+                    batch = []
+                continue
+            if _migration_started(stats):
+                break
+            try:
+                _quarantine(stored, quarantine_dir)
+            except Exception as e:
+                logger.warning("Could not collect orphan", extra=log_fields(path=stored.key, error=str(e)))
+                continue
+            stats.collected += 1
+    if batch and not stats.interrupted and not _migration_started(stats):
+        stats.collected += _delete(batch)
+
+    # Remove student folders that are empty now (rmdir fails on the others);
+    # object storage has no folders
+    if storage.is_local:
+        for directory in emptied - roots:
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
+
+    stats.seconds = time.perf_counter() - start
+    logger.info("Collected orphaned uploads", extra=log_fields(dry_run=dry_run, **asdict(stats)))
+    return stats
+
+
+# ============================================================================
+# SCHEDULED COLLECTION
+# ============================================================================
+
+class UploadCollector:
+    """Background thread running collect_orphans() every interval_hours."""
+
+    def __init__(self, interval_hours: float = UPLOAD_GC_INTERVAL_HOURS):
+        self.interval_hours = interval_hours
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="upload-gc", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_hours * 3600):
+            db = SessionLocal()
+            try:
+                collect_orphans(db)
+            except Exception:
+                logger.exception("Upload collector error")
+            finally:
+                db.close()
+
+
+upload_collector = UploadCollector()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request commit vs. group commit for form inserts.
+
+Runs the same concurrent insert workload twice against a scratch SQLite
+database:
+  - commit_to_db style: add + COMMIT + refresh SELECT for every record
+  - GroupCommitWriter: inserts coalesced into shared transactions
+
+Usage (from backend/):
+    python benchmarks/bench_group_commit.py --threads 32 --records 200
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.group_commit import GroupCommitWriter
+
+
+def make_record(thread_index: int, n: int) -> models.OPTRequest:
+    ucf_id = f"{thread_index:03d}{n:04d}"
+    return models.OPTRequest(
+        student_name="Bench Student",
+        student_id=ucf_id,
+        program="OPT Request",
+        submission_date=datetime.now(),
+        status="pending",
+        form_data={"ucf_id": ucf_id, "given_name": "Bench", "family_name": "Student"},
+    )
+
+
+def run_threads(threads: int, records: int, insert_one) -> dict:
+    errors = []
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(thread_index):
+        barrier.wait()
+        for n in range(records):
+            try:
+                insert_one(make_record(thread_index, n))
+            except Exception as e:
+                errors.append(e)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    total = threads * records
+    return {
+        "inserted": total - len(errors),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "per_second": (total - len(errors)) / elapsed,
+    }
+
+
+def bench_per_request_commit(url: str, threads: int, records: int) -> dict:
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def insert_one(record):
+        db = Session()
+        try:
+            db.add(record)
+            db.commit()
+            db.refresh(record)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    try:
+        return run_threads(threads, records, insert_one)
+    finally:
+        engine.dispose()
+
+
+def bench_group_commit(url: str, threads: int, records: int, window_ms: float) -> dict:
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    writer = GroupCommitWriter(engine, window_ms=window_ms)
+    try:
+        return run_threads(threads, records, writer.insert)
+    finally:
+        writer.stop()
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32, help="Concurrent submitters")
+    parser.add_argument("--records", type=int, default=200, help="Inserts per submitter")
+    parser.add_argument("--window-ms", type=float, default=2.0, help="Group commit window")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for name in ("per_request_commit", "group_commit"):
+            url = f"sqlite:///{os.path.join(tmp, name + '.db')}"
+            engine = create_engine(url)
+            models.Base.metadata.create_all(bind=engine)
+            engine.dispose()
+
+            if name == "per_request_commit":
+                results[name] = bench_per_request_commit(url, args.threads, args.records)
+            else:
+                results[name] = bench_group_commit(url, args.threads, args.records, args.window_ms)
+
+    print(f"{args.threads} threads x {args.records} inserts")
+    for name, r in results.items():
+        print(f"  {name:<20} {r['per_second']:>9.0f} inserts/s  "
+              f"({r['inserted']} ok, {r['errors']} errors, {r['seconds']:.2f}s)")
+    speedup = results["group_commit"]["per_second"] / results["per_request_commit"]["per_second"]
+    print(f"  speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
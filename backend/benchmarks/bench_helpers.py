@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the per-submission helpers and request schemas.
+
+Times the code every form submission runs through, in isolation:
+  - route_helpers: create_form_data_dict, convert_multiple_bools,
+    create_db_record, save_upload_file (writes to a temp directory)
+  - schemas: I20RequestCreate with 10 dependents and both addresses,
+    VirtualCheckInRequestBase, and model_validate of a fully populated
+    payload for every *Create schema (payloads from tools/seed.py)
+
+Each case is run in batches until --min-time has passed; the best batch over
+--rounds is reported as microseconds per call. Results can be saved as a
+baseline (benchmarks/baselines/micro_helpers.json) and compared later - a
+case slower than baseline * (1 + --tolerance) fails the run with status 1,
+so a schema change that doubles validation cost shows up immediately.
+
+Usage (from backend/):
+    python benchmarks/bench_helpers.py --save-baseline
+    python benchmarks/bench_helpers.py --compare
+    python benchmarks/bench_helpers.py --filter schema: --compare
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app import models, schemas
+from app.route_helpers import (
+    convert_multiple_bools,
+    create_db_record,
+    create_form_data_dict,
+    save_upload_file,
+)
+from tools import seed
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "micro_helpers.json")
+
+UPLOAD_SIZE = 256 * 1024
+
+# (name, function taking no arguments)
+Case = Tuple[str, Callable[[], object]]
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+def student_fields(faker: seed.Faker) -> Dict[str, str]:
+    student = seed.make_students(faker, 1)[0]
+    return {
+        "ucf_id": student["ucf_id"],
+        "given_name": student["given_name"],
+        "family_name": student["family_name"],
+    }
+
+
+def full_payload(schema, faker: seed.Faker) -> dict:
+    """A payload with every generatable field of the schema filled in."""
+    student = seed.make_students(faker, 1)[0]
+    payload = {name: generator(faker, student) for name, generator in seed._schema_generators(schema)}
+    payload.update({
+        "student_name": f"{student['given_name']} {student['family_name']}",
+        "student_id": student["ucf_id"],
+        "program": "Benchmark",
+    })
+    return payload
+
+
+def opt_form_fields(faker: seed.Faker) -> Dict[str, object]:
+    """form_data extras as the OPT route builds them (strings plus converted bools)."""
+    student = seed.make_students(faker, 1)[0]
+    fields = {name: generator(faker, student)
+              for name, generator in seed._schema_generators(schemas.OPTRequestCreate)}
+    for key in ("ucf_id", "given_name", "family_name", "email"):
+        fields.pop(key, None)
+    return fields
+
+
+# ============================================================================
+# CASES
+# ============================================================================
+
+def helper_cases(faker: seed.Faker, upload_dir: str) -> List[Case]:
+    common = student_fields(faker)
+    extras = opt_form_fields(faker)
+    form_data = create_form_data_dict(email="bench@ucf.edu", **common, **extras)
+    bool_fields = {f"checkbox_{i}": ["true", "false", "on", None][i % 4] for i in range(24)}
+    content = b"%PDF-1.4\n" + b"0" * (UPLOAD_SIZE - 9)
+
+    def build_record():
+        return create_db_record(
+            model_class=models.OPTRequest,
+            ucf_id=common["ucf_id"],
+            given_name=common["given_name"],
+            family_name=common["family_name"],
+            program="OPT Request",
+            form_data=form_data,
+        )
+
+    def save_upload():
+        upload = UploadFile(
+            file=io.BytesIO(content), filename="passport.pdf",
+            headers=Headers({"content-type": "application/pdf"}))
+        path = asyncio.run(save_upload_file(upload, upload_dir, ucf_id=common["ucf_id"]))
+        # Keep disk usage flat; the unlink is part of the measured time
+        os.remove(path)
+
+    return [
+        ("helpers:create_form_data_dict", lambda: create_form_data_dict(email="bench@ucf.edu", **common, **extras)),
+        ("helpers:convert_multiple_bools[24]", lambda: convert_multiple_bools(bool_fields)),
+        ("helpers:create_db_record", build_record),
+        (f"helpers:save_upload_file[{UPLOAD_SIZE // 1024}KB]", save_upload),
+    ]
+
+
+def schema_cases(faker: seed.Faker) -> List[Case]:
+    i20 = full_payload(schemas.I20RequestCreate, faker)
+    i20["us_address"] = faker.us_address()
+    i20["non_us_address"] = faker.foreign_address()
+    i20["dependents"] = [faker.dependent() for _ in range(10)]
+    i20_json = json.dumps(i20)
+
+    checkin = full_payload(schemas.VirtualCheckInRequestBase, faker)
+
+    cases = [
+        ("schema:I20RequestCreate[10 dependents]", lambda: schemas.I20RequestCreate.model_validate(i20)),
+        ("schema:I20RequestCreate[10 dependents] json",
+         lambda: schemas.I20RequestCreate.model_validate_json(i20_json)),
+        ("schema:VirtualCheckInRequestBase", lambda: schemas.VirtualCheckInRequestBase.model_validate(checkin)),
+    ]
+
+    for name in sorted(dir(schemas)):
+        schema = getattr(schemas, name)
+        if name.endswith("Create") and isinstance(schema, type) and issubclass(schema, schemas.BaseModel):
+            payload = full_payload(schema, faker)
+            cases.append((f"schema:{name}", lambda schema=schema, payload=payload: schema.model_validate(payload)))
+    return cases
+
+
+# ============================================================================
+# TIMING
+# ============================================================================
+
+def time_case(func: Callable[[], object], rounds: int, min_time: float) -> float:
+    """Best microseconds per call over the given number of rounds."""
+    func()  # warm up caches / lazy imports
+
+    # Grow the batch until one batch takes at least min_time
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+    best = elapsed / number
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best * 1e6
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark route helpers and request schemas.")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed batches per case (best is reported)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per batch")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for payloads")
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as the baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare against the stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3,
+                        help="Allowed slowdown before a case counts as regressed (0.3 = 30%%)")
+    args = parser.parse_args()
+
+    faker = seed.Faker(args.seed)
+    upload_dir = tempfile.mkdtemp(prefix="bench_uploads_")
+    baseline = {}
+    if args.compare:
+        if not os.path.exists(BASELINE_PATH):
+            print(f"No baseline at {BASELINE_PATH}; run with --save-baseline first")
+            sys.exit(2)
+        with open(BASELINE_PATH) as handle:
+            baseline = json.load(handle)["cases"]
+
+    results: Dict[str, float] = {}
+    regressions = []
+    try:
+        cases = [case for case in helper_cases(faker, upload_dir) + schema_cases(faker)
+                 if args.filter in case[0]]
+        header = f"{'case':<58}{'us/call':>10}"
+        print(header + (f"{'baseline':>10}{'change':>9}" if args.compare else ""))
+        for name, func in cases:
+            micros = time_case(func, args.rounds, args.min_time)
+            results[name] = round(micros, 3)
+            line = f"{name:<58}{micros:>10.2f}"
+            if name in baseline:
+                change = micros / baseline[name] - 1
+                line += f"{baseline[name]:>10.2f}{change:>+9.0%}"
+                if change > args.tolerance:
+                    line += "  REGRESSED"
+                    regressions.append(name)
+            print(line)
+    finally:
+        shutil.rmtree(upload_dir, ignore_errors=True)
+
+    if args.save_baseline:
+        saved = {}
+        if args.filter and os.path.exists(BASELINE_PATH):
+            with open(BASELINE_PATH) as handle:
+                saved = json.load(handle)["cases"]
+        saved.update(results)
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, "w") as handle:
+            json.dump({
+                "recorded_at": datetime.now().isoformat(timespec="seconds"),
+                "python": sys.version.split()[0],
+                "cases": saved,
+            }, handle, indent=2)
+        print(f"\nBaseline saved to {BASELINE_PATH}")
+
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request cost of MetricsMiddleware.
+
+Drives a small FastAPI app directly through its ASGI interface (no sockets,
+no HTTP parsing) so the middleware's own overhead isn't hidden by network
+noise:
+  - baseline: the app without MetricsMiddleware
+  - metrics: the same app wrapped in MetricsMiddleware
+Also times a /metrics render with the recorded routes.
+
+Usage (from backend/):
+    python benchmarks/bench_metrics_middleware.py --requests 20000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import APIRouter, FastAPI
+
+from app.metrics import MetricsMiddleware, RequestMetrics
+
+
+def build_app(with_metrics: bool, metrics: RequestMetrics) -> FastAPI:
+    router = APIRouter()
+
+    @router.get("/opt-requests/{request_id}")
+    async def get_request(request_id: int):
+        return {"id": request_id, "status": "pending"}
+
+    @router.post("/opt-requests/")
+    async def create_request(payload: dict):
+        return payload
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware, metrics=metrics)
+    return app
+
+
+def make_scope(method: str, path: str, body: bytes) -> dict:
+    headers = [(b"host", b"bench")]
+    if body:
+        headers += [(b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode())]
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": method, "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"", "headers": headers,
+        "client": ("127.0.0.1", 1234), "server": ("bench", 80),
+    }
+
+
+async def drive(app: FastAPI, requests: int) -> float:
+    body = b'{"given_name": "Bench", "program": "OPT"}'
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for i in range(requests):
+        if i % 2:
+            scope, payload = make_scope("POST", "/api/opt-requests/", body), body
+        else:
+            scope, payload = make_scope("GET", f"/api/opt-requests/{i}", b""), b""
+
+        async def receive():
+            return {"type": "http.request", "body": payload, "more_body": False}
+
+        await app(scope, receive, send)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=20000, help="Requests per run")
+    parser.add_argument("--rounds", type=int, default=3, help="Runs per variant (best is reported)")
+    args = parser.parse_args()
+
+    metrics = RequestMetrics()
+    baseline_app = build_app(False, metrics)
+    metrics_app = build_app(True, metrics)
+
+    async def run():
+        # Warm up routing and pydantic caches
+        await drive(baseline_app, 200)
+        await drive(metrics_app, 200)
+        baseline = min([await drive(baseline_app, args.requests) for _ in range(args.rounds)])
+        measured = min([await drive(metrics_app, args.requests) for _ in range(args.rounds)])
+        return baseline, measured
+
+    baseline, measured = asyncio.run(run())
+    per_baseline = baseline / args.requests * 1e6
+    per_metrics = measured / args.requests * 1e6
+
+    render_start = time.perf_counter()
+    text = metrics.render()
+    render_ms = (time.perf_counter() - render_start) * 1000
+
+    print(f"{'variant':<12}{'us/request':>12}{'requests/s':>14}")
+    print(f"{'baseline':<12}{per_baseline:>12.1f}{args.requests / baseline:>14.0f}")
+    print(f"{'metrics':<12}{per_metrics:>12.1f}{args.requests / measured:>14.0f}")
+    print(f"\nmiddleware overhead: {per_metrics - per_baseline:.1f} us/request "
+          f"({(per_metrics / per_baseline - 1) * 100:.1f}%)")
+    print(f"/metrics render: {render_ms:.2f} ms for {len(metrics.routes)} routes "
+          f"({len(text.splitlines())} lines)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Benchmark: form parsing with one Form(...) parameter per field vs MultipartForm.
+
+For every form model in app/forms.py two endpoints are mounted on a bare
+FastAPI app (no middleware, no database):
+  - legacy: the old handler shape, generated from the model - one Form(...)
+    or File(None) parameter per input, then convert_multiple_bools() and
+    create_form_data_dict() in the handler
+  - model: Depends(<form>.parse) and form.form_data(), as the routes do now
+
+Both get the same fully populated multipart body (urlencoded for forms
+without files), built once and sent straight to the ASGI app, and both
+build the same form_data (checked before timing). Files are not saved, so
+the numbers are parsing, validation and dict building only.
+
+Reports the best microseconds per request over --rounds batches (the three
+endpoints take turns each round, so machine noise hits all of them), the same
+for an endpoint that only runs `await request.form()` (the multipart parse
+both approaches share, so the difference to it is the per-field overhead),
+and the peak memory allocated while handling one request (tracemalloc).
+
+Usage (from backend/):
+    python benchmarks/bench_multipart.py
+    python benchmarks/bench_multipart.py --filter OptStem --file-kb 64
+"""
+
+import argparse
+import asyncio
+import inspect
+import os
+import sys
+import tracemalloc
+import time
+from typing import Callable, Dict, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import httpx
+from fastapi import Depends, FastAPI, File, Form, Request, UploadFile
+from fastapi.responses import Response
+
+from app import forms
+from app.multipart import MultipartForm
+from app.route_helpers import convert_multiple_bools, create_form_data_dict
+
+
+# The last form_data each endpoint built, to check both sides agree
+BUILT: Dict[str, dict] = {}
+
+
+# ============================================================================
+# ENDPOINTS
+# ============================================================================
+
+def input_names(form_class) -> Dict[str, str]:
+    """Form input name -> field name."""
+    return {
+        field.validation_alias if isinstance(field.validation_alias, str) else name: name
+        for name, field in form_class.model_fields.items()
+    }
+
+
+def legacy_endpoint(form_class):
+    """A handler with one Form/File parameter per input, like the old routes."""
+    inputs = input_names(form_class)
+    parameters = []
+    for key, name in inputs.items():
+        field = form_class.model_fields[name]
+        if key in form_class.file_inputs:
+            annotation, default = UploadFile, File(None)
+        elif field.is_required():
+            annotation, default = (bool if field.annotation is bool else str), Form(...)
+        elif key in form_class.checkbox_inputs:
+            # Checkboxes arrived as strings and were converted by hand
+            annotation = str
+            default = Form(None if field.default is None else str(field.default).lower())
+        else:
+            annotation, default = (bool if field.annotation is bool else str), Form(field.default)
+        parameters.append(inspect.Parameter(key, inspect.Parameter.KEYWORD_ONLY,
+                                            default=default, annotation=annotation))
+
+    async def endpoint(**values):
+        for key in form_class.file_inputs:
+            values.pop(key)
+        bool_fields = convert_multiple_bools({key: values.pop(key) for key in form_class.checkbox_inputs})
+        fields = {inputs[key]: value for key, value in values.items()
+                  if inputs[key] not in form_class.record_fields}
+        BUILT[f"legacy:{form_class.__name__}"] = create_form_data_dict(**fields, **bool_fields)
+        return Response(status_code=204)
+
+    endpoint.__signature__ = inspect.Signature(parameters)
+    return endpoint
+
+
+async def parse_only_endpoint(request: Request):
+    form = await request.form()
+    await form.close()
+    return Response(status_code=204)
+
+
+def model_endpoint(form_class):
+    async def endpoint(form: form_class = Depends(form_class.parse)):
+        BUILT[f"model:{form_class.__name__}"] = form.form_data()
+        return Response(status_code=204)
+    return endpoint
+
+
+# ============================================================================
+# REQUESTS
+# ============================================================================
+
+def payload(form_class, file_kb: int) -> Tuple[bytes, str]:
+    """A fully populated body for the form and its content type."""
+    data, files = {}, {}
+    attachment = b"%PDF-1.4\n" + b"0" * max(0, file_kb * 1024 - 9)
+    for key, name in input_names(form_class).items():
+        field = form_class.model_fields[name]
+        if key in form_class.file_inputs:
+            files[key] = (f"{key}.pdf", attachment, "application/pdf")
+        elif key in form_class.checkbox_inputs:
+            data[key] = "on"
+        elif field.annotation is bool:
+            data[key] = "true"
+        else:
+            data[key] = f"{key} value"
+    request = httpx.Request("POST", "http://bench/", data=data, files=files or None)
+    return request.read(), request.headers["content-type"]
+
+
+async def send(app, path: str, body: bytes, content_type: str) -> int:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"content-type", content_type.encode()),
+                    (b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 1234), "server": ("bench", 80),
+    }
+    received = False
+    status = []
+
+    async def receive():
+        nonlocal received
+        if received:
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send_message(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send_message)
+    return status[0]
+
+
+def peak_kb(loop, app, path: str, body: bytes, content_type: str) -> float:
+    """Peak memory allocated while handling one request."""
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        loop.run_until_complete(send(app, path, body, content_type))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (peak - before) / 1024
+
+
+def time_interleaved(calls: Dict[str, Callable[[], object]], rounds: int, min_time: float) -> Dict[str, float]:
+    """Best microseconds per call for each function, alternating between them."""
+    for func in calls.values():
+        func()  # warm up
+
+    # Size batches so the slowest function takes about min_time per batch
+    start = time.perf_counter()
+    for func in calls.values():
+        for _ in range(10):
+            func()
+    per_call = (time.perf_counter() - start) / (10 * len(calls))
+    number = max(1, int(min_time / per_call / 1.5))
+
+    best = {kind: float("inf") for kind in calls}
+    for _ in range(rounds):
+        for kind, func in calls.items():
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            best[kind] = min(best[kind], (time.perf_counter() - start) / number)
+    return {kind: seconds * 1e6 for kind, seconds in best.items()}
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Form(...) parameters with MultipartForm parsing.")
+    parser.add_argument("--rounds", type=int, default=9, help="Timed batches per case (best is reported)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per batch")
+    parser.add_argument("--file-kb", type=int, default=1, help="Size of each attached file")
+    parser.add_argument("--filter", default="", help="Only run forms whose class name contains this")
+    args = parser.parse_args()
+
+    form_classes = [
+        getattr(forms, name) for name in sorted(dir(forms))
+        if isinstance(getattr(forms, name), type)
+        and issubclass(getattr(forms, name), MultipartForm)
+        and getattr(forms, name) is not MultipartForm
+        and args.filter in name
+    ]
+
+    app = FastAPI()
+    app.post("/parse-only", status_code=204)(parse_only_endpoint)
+    for form_class in form_classes:
+        app.post(f"/legacy/{form_class.__name__}", status_code=204)(legacy_endpoint(form_class))
+        app.post(f"/model/{form_class.__name__}", status_code=204)(model_endpoint(form_class))
+
+    loop = asyncio.new_event_loop()
+    print(f"{'form':<44}{'fields':>7}{'parse us':>10}{'legacy us':>11}{'model us':>10}{'speedup':>9}"
+          f"{'overhead':>10}{'legacy KB':>11}{'model KB':>10}")
+    try:
+        for form_class in form_classes:
+            name = form_class.__name__
+            body, content_type = payload(form_class, args.file_kb)
+            paths = {"parse-only": "/parse-only", "legacy": f"/legacy/{name}", "model": f"/model/{name}"}
+            for path in paths.values():
+                status = loop.run_until_complete(send(app, path, body, content_type))
+                assert status == 204, f"{path} returned {status}"
+
+            micros = time_interleaved(
+                {kind: (lambda path=path: loop.run_until_complete(send(app, path, body, content_type)))
+                 for kind, path in paths.items()},
+                args.rounds, args.min_time)
+            memory = {kind: peak_kb(loop, app, path, body, content_type) for kind, path in paths.items()}
+            assert BUILT[f"legacy:{name}"] == BUILT[f"model:{name}"], f"{name}: form_data differs"
+
+            parse_us, legacy_us, model_us = micros["parse-only"], micros["legacy"], micros["model"]
+            legacy_kb, model_kb = memory["legacy"], memory["model"]
+            # How much of the non-parsing work the model path still does
+            overhead = (model_us - parse_us) / max(legacy_us - parse_us, 1e-9)
+            print(f"{name:<44}{len(form_class.model_fields):>7}{parse_us:>10.1f}{legacy_us:>11.1f}"
+                  f"{model_us:>10.1f}{legacy_us / model_us:>8.2f}x{overhead:>10.0%}"
+                  f"{legacy_kb:>11.1f}{model_kb:>10.1f}")
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Benchmark: worker cold start.
+
+Starts fresh Python processes that import main, run the lifespan startup
+and serve their first requests over ASGI (no server), and reports the
+median of each phase:
+  - interpreter: process spawn until the interpreter runs our code
+  - import: import main (FastAPI, SQLAlchemy, schemas, models, routes)
+  - startup: lifespan startup (route warm-up / table check)
+  - first request: GET /api/i20-requests/
+  - first openapi: GET /openapi.json (generation or precomputed file)
+  - to first response: spawn until the first request has been answered
+
+Both modes are measured: the default eager startup generating OpenAPI at
+runtime, and LAZY_INIT=true with a document built by tools/build_openapi.py
+into a temporary directory. One extra run with `python -X importtime` lists
+the slowest imports.
+
+Runs against a scratch database in a temporary directory.
+
+Usage (from backend/):
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --modes lazy --top 30
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PHASES = ["interpreter", "import", "startup", "first request", "first openapi", "to first response"]
+
+# Runs inside each child process; prints phase timestamps as JSON
+CHILD = r"""
+import time
+started = time.time()
+import asyncio, json, os, sys
+sys.path.insert(0, os.environ["BENCH_BACKEND_DIR"])
+
+import main
+imported = time.time()
+
+
+async def call(path):
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+             "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+             "root_path": "", "query_string": b"", "headers": [(b"host", b"bench")],
+             "client": ("127.0.0.1", 1234), "server": ("bench", 80)}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await main.app(scope, receive, send)
+    return messages[0]["status"]
+
+
+async def run():
+    stamps = {}
+    async with main.app.router.lifespan_context(main.app):
+        stamps["ready"] = time.time()
+        assert await call("/api/i20-requests/") == 200
+        stamps["first"] = time.time()
+        assert await call("/openapi.json") == 200
+        stamps["openapi"] = time.time()
+    return stamps
+
+
+stamps = asyncio.run(run())
+print(json.dumps({"started": started, "imported": imported, **stamps}))
+"""
+
+
+def child_env(workdir: str, lazy: bool) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "BENCH_BACKEND_DIR": BACKEND_DIR,
+        "LAZY_INIT": "true" if lazy else "false",
+        # Only the lazy run gets the precomputed OpenAPI document
+        "OPENAPI_PATH": os.path.join(workdir, "openapi.json" if lazy else "missing.json"),
+        "LOG_LEVEL": "WARNING",
+    })
+    return env
+
+
+def run_child(workdir: str, lazy: bool, extra_args: List[str] = ()) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *extra_args, "-c", CHILD],
+        cwd=workdir, env=child_env(workdir, lazy), capture_output=True, text=True, check=True)
+
+
+def measure(workdir: str, lazy: bool) -> Dict[str, float]:
+    spawned = time.time()
+    result = run_child(workdir, lazy)
+    stamps = json.loads(result.stdout.strip().splitlines()[-1])
+    return {
+        "interpreter": stamps["started"] - spawned,
+        "import": stamps["imported"] - stamps["started"],
+        "startup": stamps["ready"] - stamps["imported"],
+        "first request": stamps["first"] - stamps["ready"],
+        "first openapi": stamps["openapi"] - stamps["first"],
+        "to first response": stamps["first"] - spawned,
+    }
+
+
+def import_times(workdir: str, top: int) -> None:
+    """Print the slowest imports from one `python -X importtime` run."""
+    result = run_child(workdir, False, ["-X", "importtime"])
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+
+    top_level = sorted((r for r in rows if not r[2].startswith("  ")), key=lambda r: -r[1])
+    print(f"\nSlowest top-level imports (cumulative, from import main):")
+    for self_us, cumulative_us, name in top_level[:top]:
+        print(f"  {cumulative_us / 1000:>8.1f} ms  {name.strip()}")
+
+    print(f"\nSlowest modules by self time:")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: -r[0])[:top]:
+        print(f"  {self_us / 1000:>8.1f} ms  {name.strip()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure worker import and time-to-first-request.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per mode (median is reported)")
+    parser.add_argument("--modes", default="eager,lazy", help="Comma-separated: eager, lazy")
+    parser.add_argument("--top", type=int, default=15, help="Imports to list from -X importtime")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_startup_")
+    try:
+        # Build the OpenAPI document for lazy mode, then create the scratch
+        # database once so timed runs measure an already-migrated worker
+        subprocess.run(
+            [sys.executable, os.path.join(BACKEND_DIR, "tools", "build_openapi.py"),
+             "--output", os.path.join(workdir, "openapi.json")],
+            cwd=workdir, check=True, capture_output=True)
+        run_child(workdir, False)
+
+        modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+        results = {}
+        for mode in modes:
+            runs = [measure(workdir, mode == "lazy") for _ in range(args.runs)]
+            results[mode] = {phase: statistics.median(run[phase] for run in runs) for phase in PHASES}
+
+        print(f"Median of {args.runs} runs (ms)")
+        print(f"{'phase':<20}" + "".join(f"{mode:>12}" for mode in modes))
+        for phase in PHASES:
+            print(f"{phase:<20}" + "".join(f"{results[mode][phase] * 1000:>12.1f}" for mode in modes))
+
+        if args.top:
+            import_times(workdir, args.top)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
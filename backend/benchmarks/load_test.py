@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test against a running API server.
+
+An asyncio + httpx driver runs a number of concurrent virtual users for a
+fixed duration. Request bodies are generated from the server's OpenAPI
+schema, so new form fields are picked up without touching this script.
+
+Scenarios:
+  deadline   Multipart submission bursts with attachments against
+             /api/opt-requests/ and /api/opt-stem-applications/
+  dashboard  Admin dashboard loads: every list endpoint at once
+  deletes    Create a JSON form submission, read it back, delete it
+  mixed      Weighted mix of the three above (default)
+
+Reports throughput and p50/p95/p99 latency per route template. Results can
+be saved as a baseline (benchmarks/baselines/load_<scenario>.json) and later
+runs compared against it; the script exits with status 1 when a route's p95
+or throughput regresses beyond --tolerance, so it can gate changes to
+app/routes.py.
+
+Requires httpx (pip install httpx). --in-process drives main:app over ASGI
+without a server, which is handy for quick before/after comparisons of
+route code; use a real server for numbers that include the network stack.
+Run the server against a scratch,
+seeded database, never production data:
+
+    python tools/seed.py --per-model 2000 --database-url sqlite:///./load.db
+    python -m uvicorn main:app --port 8000      # with sql_app.db pointed at the scratch copy
+    python benchmarks/load_test.py --scenario mixed --duration 60 --concurrency 32 --save-baseline
+    python benchmarks/load_test.py --scenario mixed --duration 60 --concurrency 32 --compare
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+# Add backend directory to path (for --in-process)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+DEADLINE_ROUTES = ["/api/opt-requests/", "/api/opt-stem-applications/"]
+
+# (scenario, weight) for the mixed scenario
+MIXED_WEIGHTS = [("deadline", 0.3), ("dashboard", 0.5), ("deletes", 0.2)]
+
+PLACEHOLDER_PDF_HEADER = b"%PDF-1.4\n% load test attachment\n"
+
+# Paths that are not part of the form dashboard
+IGNORED_PATHS = {"/api/", "/api/debug/"}
+
+
+# ============================================================================
+# PAYLOADS FROM OPENAPI
+# ============================================================================
+
+class PayloadFactory:
+    """Generate request bodies from the server's OpenAPI components."""
+
+    def __init__(self, openapi: dict, rng: random.Random, file_kb: int):
+        self.schemas = openapi.get("components", {}).get("schemas", {})
+        self.rng = rng
+        self.attachment = PLACEHOLDER_PDF_HEADER + b"0" * max(0, file_kb * 1024 - len(PLACEHOLDER_PDF_HEADER))
+
+    def resolve(self, schema: dict) -> dict:
+        while "$ref" in schema:
+            schema = self.schemas[schema["$ref"].split("/")[-1]]
+        return schema
+
+    def value(self, name: str, schema: dict, depth: int = 0):
+        schema = self.resolve(schema)
+        if "anyOf" in schema:
+            options = [s for s in schema["anyOf"] if s.get("type") != "null"]
+            schema = self.resolve(options[0]) if options else {"type": "null"}
+        kind = schema.get("type")
+
+        if kind == "boolean":
+            return self.rng.random() < 0.7
+        if kind == "integer":
+            return self.rng.randrange(1, 40)
+        if kind == "number":
+            return round(self.rng.uniform(1, 40), 1)
+        if kind == "array":
+            return [self.value(name, schema.get("items", {}), depth + 1) for _ in range(self.rng.randrange(0, 3))]
+        if kind == "object" or "properties" in schema:
+            if depth > 3:
+                return {}
+            return {key: self.value(key, prop, depth + 1) for key, prop in schema.get("properties", {}).items()}
+        if kind == "null":
+            return None
+        return self.string(name)
+
+    def string(self, name: str) -> str:
+        if "email" in name:
+            return f"load.test{self.rng.randrange(1000)}@ucf.edu"
+        if name in ("ucf_id", "student_id", "employee_id") or name.endswith("_id"):
+            return str(self.rng.randrange(1000000, 9999999))
+        if "date" in name or "birth" in name:
+            return f"2025-{self.rng.randrange(1, 13):02d}-{self.rng.randrange(1, 29):02d}"
+        if "phone" in name:
+            return f"407-555-{self.rng.randrange(1000, 9999)}"
+        if "name" in name:
+            return self.rng.choice(["Load", "Test", "Bench", "Sample"])
+        return "load test"
+
+    def json_body(self, operation: dict) -> dict:
+        schema = operation["requestBody"]["content"]["application/json"]["schema"]
+        return self.value("body", schema)
+
+    def multipart_body(self, operation: dict) -> Tuple[Dict[str, str], Dict[str, tuple]]:
+        content = operation["requestBody"]["content"]
+        form = content.get("multipart/form-data") or content["application/x-www-form-urlencoded"]
+        schema = self.resolve(form["schema"])
+        data, files = {}, {}
+        for name, prop in schema.get("properties", {}).items():
+            prop = self.resolve(prop)
+            if "anyOf" in prop:
+                prop = next((p for p in prop["anyOf"] if p.get("type") != "null"), prop)
+            if prop.get("format") == "binary" or prop.get("contentMediaType") == "application/octet-stream":
+                files[name] = (f"{name}.pdf", self.attachment, "application/pdf")
+            else:
+                value = self.value(name, prop)
+                data[name] = str(value).lower() if isinstance(value, bool) else str(value)
+        return data, files
+
+
+# ============================================================================
+# RESULTS
+# ============================================================================
+
+class Results:
+    """Latency samples and error counts per route label."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, label: str, seconds: float, ok: bool) -> None:
+        self.latencies[label].append(seconds)
+        if not ok:
+            self.errors[label] += 1
+
+    def summary(self, duration: float) -> Dict[str, dict]:
+        summary = {}
+        for label, samples in sorted(self.latencies.items()):
+            ordered = sorted(samples)
+            summary[label] = {
+                "requests": len(ordered),
+                "errors": self.errors.get(label, 0),
+                "rps": round(len(ordered) / duration, 2),
+                "p50_ms": round(_percentile(ordered, 50) * 1000, 2),
+                "p95_ms": round(_percentile(ordered, 95) * 1000, 2),
+                "p99_ms": round(_percentile(ordered, 99) * 1000, 2),
+            }
+        return summary
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+# ============================================================================
+# VIRTUAL USERS
+# ============================================================================
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, openapi: dict, payloads: PayloadFactory,
+                 rng: random.Random, concurrency: int):
+        self.client = client
+        # Cap requests in flight like a connection pool would; the ASGI
+        # transport used by --in-process has no connection limit of its own
+        self.slots = asyncio.Semaphore(concurrency)
+        self.paths = openapi["paths"]
+        self.payloads = payloads
+        self.rng = rng
+        self.results = Results()
+
+        self.list_paths = sorted(
+            path for path, ops in self.paths.items()
+            if "get" in ops and path.startswith("/api/") and "{" not in path
+            and path not in IGNORED_PATHS and not path.startswith("/api/admin/")
+        )
+        # JSON create endpoints that also have a delete-by-id route
+        self.json_crud_paths = sorted(
+            path for path, ops in self.paths.items()
+            if "post" in ops and "application/json" in ops["post"].get("requestBody", {}).get("content", {})
+            and any(p.startswith(path + "{") and "delete" in self.paths[p] for p in self.paths)
+        )
+
+    async def request(self, method: str, label: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        async with self.slots:
+            start = time.perf_counter()
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except httpx.HTTPError:
+                self.results.record(f"{method} {label}", time.perf_counter() - start, False)
+                return None
+        self.results.record(f"{method} {label}", time.perf_counter() - start, response.status_code < 400)
+        return response
+
+    async def deadline(self) -> None:
+        path = self.rng.choice(DEADLINE_ROUTES)
+        data, files = self.payloads.multipart_body(self.paths[path]["post"])
+        await self.request("POST", path, path, data=data, files=files)
+
+    async def dashboard(self) -> None:
+        await asyncio.gather(*(self.request("GET", path, path) for path in self.list_paths))
+
+    async def deletes(self) -> None:
+        path = self.rng.choice(self.json_crud_paths)
+        item_template = next(p for p in self.paths if p.startswith(path + "{") and "delete" in self.paths[p])
+        response = await self.request("POST", path, path, json=self.payloads.json_body(self.paths[path]["post"]))
+        if response is None or response.status_code >= 400:
+            return
+        record_id = response.json().get("id")
+        if record_id is None:
+            return
+        item_url = f"{path}{record_id}"
+        if "get" in self.paths[item_template]:
+            await self.request("GET", item_template, item_url)
+        await self.request("DELETE", item_template, item_url)
+
+    async def user(self, scenario: str, deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            name = scenario
+            if scenario == "mixed":
+                names, weights = zip(*MIXED_WEIGHTS)
+                name = self.rng.choices(names, weights)[0]
+            await getattr(self, name)()
+
+
+# ============================================================================
+# BASELINES
+# ============================================================================
+
+def baseline_path(scenario: str) -> str:
+    return os.path.join(BASELINE_DIR, f"load_{scenario}.json")
+
+
+def compare(current: Dict[str, dict], baseline: Dict[str, dict], tolerance: float,
+            min_samples: int) -> List[str]:
+    """
+    Return a description of every route that regressed beyond tolerance.
+
+    Routes with fewer than min_samples requests in either run are skipped;
+    their percentiles are too noisy to compare.
+    """
+    regressions = []
+    print(f"\n{'route':<58}{'p95 base':>10}{'p95 now':>10}{'rps base':>10}{'rps now':>10}")
+    for label, stats in current.items():
+        base = baseline.get(label)
+        if base is None or min(base["requests"], stats["requests"]) < min_samples:
+            continue
+        flags = []
+        if stats["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            flags.append("p95")
+        if stats["rps"] < base["rps"] * (1 - tolerance):
+            flags.append("rps")
+        marker = f"  REGRESSED ({', '.join(flags)})" if flags else ""
+        print(f"{label:<58}{base['p95_ms']:>10.1f}{stats['p95_ms']:>10.1f}"
+              f"{base['rps']:>10.1f}{stats['rps']:>10.1f}{marker}")
+        if flags:
+            regressions.append(f"{label}: {', '.join(flags)}")
+    return regressions
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def print_summary(summary: Dict[str, dict]) -> None:
+    print(f"\n{'route':<58}{'reqs':>8}{'errs':>6}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for label, stats in summary.items():
+        print(f"{label:<58}{stats['requests']:>8}{stats['errors']:>6}{stats['rps']:>9.1f}"
+              f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}")
+
+
+async def run(args) -> Tuple[Dict[str, dict], float]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    client_args = {"base_url": args.base_url, "limits": limits, "timeout": args.timeout}
+    if args.in_process:
+        # Drive the app directly over ASGI - no server or network in the loop
+        os.chdir(BACKEND_DIR)
+        from main import app
+        client_args["transport"] = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        client_args["base_url"] = "http://loadtest"
+
+    async with httpx.AsyncClient(**client_args) as client:
+        openapi = (await client.get("/openapi.json")).raise_for_status().json()
+        rng = random.Random(args.seed)
+        test = LoadTest(client, openapi, PayloadFactory(openapi, rng, args.file_kb), rng, args.concurrency)
+
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(*(test.user(args.scenario, deadline) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+        return test.results.summary(elapsed), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the API and compare against baselines.")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="Server to test")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run the app in this process over ASGI instead of hitting --base-url")
+    parser.add_argument("--scenario", default="mixed", choices=["deadline", "dashboard", "deletes", "mixed"])
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent virtual users")
+    parser.add_argument("--file-kb", type=int, default=200, help="Size of each attachment in deadline bursts")
+    parser.add_argument("--timeout", type=float, default=60, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the request mix")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the scenario baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare against the stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95/throughput regression (0.2 = 20%%)")
+    parser.add_argument("--min-samples", type=int, default=20,
+                        help="Ignore routes with fewer requests than this when comparing")
+    args = parser.parse_args()
+
+    summary, elapsed = asyncio.run(run(args))
+    total = sum(stats["requests"] for stats in summary.values())
+    print(f"Scenario {args.scenario}: {total} requests in {elapsed:.1f}s "
+          f"({total / elapsed:.1f} req/s, concurrency {args.concurrency})")
+    print_summary(summary)
+
+    path = baseline_path(args.scenario)
+    exit_code = 0
+    if args.compare:
+        if not os.path.exists(path):
+            print(f"\nNo baseline at {path}; run with --save-baseline first")
+            exit_code = 2
+        else:
+            with open(path) as handle:
+                baseline = json.load(handle)
+            regressions = compare(summary, baseline["routes"], args.tolerance, args.min_samples)
+            if regressions:
+                print(f"\n{len(regressions)} route(s) regressed beyond {args.tolerance:.0%}:")
+                for line in regressions:
+                    print(f"  {line}")
+                exit_code = 1
+            else:
+                print("\nNo regressions against baseline")
+
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(path, "w") as handle:
+            json.dump({
+                "scenario": args.scenario,
+                "recorded_at": datetime.now().isoformat(timespec="seconds"),
+                "duration": args.duration,
+                "concurrency": args.concurrency,
+                "file_kb": args.file_kb,
+                "routes": summary,
+            }, handle, indent=2)
+        print(f"\nBaseline saved to {path}")
+
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
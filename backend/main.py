@@ -1,7 +1,67 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI()
+from app import attachments, group_commit, ingest, resumable, upload_gc
+from app.body_limits import BodyLimitMiddleware
+from app.form_registry import body_limits, submission_paths
+from app.idempotency import IdempotencyMiddleware
+from app.logging_config import setup_logging, shutdown_logging
+from app.metrics import METRICS_ENABLED, MetricsMiddleware, metrics_endpoint
+from app.timing import SERVER_TIMING_ENABLED, ServerTimingMiddleware
+from app.profiler import RequestProfilerMiddleware
+from app import startup
+from app.openapi_cache import PrecomputedOpenAPI
+from app.previews import preview_renderer
+
+# Send app.* log records through the background queue listener
+setup_logging()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if startup.LAZY_INIT:
+        # Tables weren't created at import - just make sure they exist
+        startup.ensure_tables()
+    else:
+        # Build every route handler now rather than on the first request
+        await startup.warm_routes(app)
+    # Drain queued submissions in the background when ingest mode is on
+    if ingest.INGEST_MODE:
+        ingest.ingest_worker.start()
+    # Collect orphaned upload files on a schedule when configured
+    if upload_gc.UPLOAD_GC_INTERVAL_HOURS > 0:
+        upload_gc.upload_collector.start()
+    yield
+    if upload_gc.UPLOAD_GC_INTERVAL_HOURS > 0:
+        upload_gc.upload_collector.stop()
+    if ingest.INGEST_MODE:
+        ingest.ingest_worker.stop()
+    # Drop thumbnails still waiting to be rendered (they render again on request)
+    preview_renderer.shutdown()
+    # Flush any inserts still waiting for a group commit
+    group_commit.group_commit_writer.stop()
+    # Write out any log records still queued
+    shutdown_logging()
+
+
+# Build-time OpenAPI document (tools/build_openapi.py). When it exists the
+# built-in /openapi.json, /docs and /redoc are replaced by cached versions.
+precomputed_openapi = PrecomputedOpenAPI.load()
+if precomputed_openapi is not None:
+    app = FastAPI(lifespan=lifespan, openapi_url=None)
+    precomputed_openapi.install(app)
+else:
+    app = FastAPI(lifespan=lifespan)
+
+# Replay stored responses for retried submissions (Idempotency-Key header)
+app.add_middleware(IdempotencyMiddleware, paths=submission_paths())
+
+# 413 for oversized bodies before they are buffered; outside the idempotency
+# middleware so no key is claimed for them, inside CORS so the browser can
+# read the error
+app.add_middleware(BodyLimitMiddleware, limits=body_limits(), prefix_limits=resumable.body_limits())
 
 # Configure CORS - use wildcard to eliminate any CORS issues
 app.add_middleware(
@@ -10,17 +70,35 @@ app.add_middleware(
     allow_credentials=False,  # Must be False when using "*" for origins
     allow_methods=["*"],  # Allow all methods
     allow_headers=["*"],  # Allow all headers
+    # Let browser clients of the resumable upload endpoints read these
+    expose_headers=["Location", "Upload-Offset", "Upload-Length", "Upload-Expires", "Tus-Resumable"],
 )
 
+# Profile single requests sent with "X-Profile: true" (admin token required)
+app.add_middleware(RequestProfilerMiddleware)
+
+# Server-Timing header (db / serialize / total) for the browser's network tab
+if SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
+# Per-route latency/size/status metrics, scraped from GET /metrics.
+# Added last so it is the outermost middleware and times everything above.
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.add_api_route("/metrics", metrics_endpoint, methods=["GET"], include_in_schema=False)
+
 # Include the router
 from app.routes import router
+from app import admin
 app.include_router(router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
+app.include_router(resumable.router, prefix="/api")
+app.include_router(attachments.router, prefix="/api")
 
-# Create tables
-from app.database import engine
-from app import models
-models.Base.metadata.create_all(bind=engine)
+# Create tables (deferred to startup in lazy mode)
+if not startup.LAZY_INIT:
+    startup.create_tables()
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to the FastAPI backend!"}
\ No newline at end of file
+    return {"message": "Welcome to the FastAPI backend!"}
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Generate the OpenAPI document at build time.
+
+Writes openapi.json and a gzip-compressed openapi.json.gz. Workers that
+find the file serve it from /openapi.json with ETags instead of generating
+the schema themselves (see app/openapi_cache.py). Run it as a deploy build
+step, and again whenever routes or schemas change:
+
+    python tools/build_openapi.py                  # writes openapi.json(.gz)
+    python tools/build_openapi.py --output /srv/api/openapi.json
+    python tools/build_openapi.py --check          # exit 1 if the file is stale
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Import the app without touching the database
+os.environ["LAZY_INIT"] = "true"
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+
+def render(schema: dict) -> bytes:
+    """Serialize exactly like FastAPI's JSONResponse does."""
+    return json.dumps(schema, ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def read(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as handle:
+            return handle.read()
+    except FileNotFoundError:
+        return None
+
+
+def main():
+    from app.openapi_cache import OPENAPI_PATH, gzip_document
+
+    parser = argparse.ArgumentParser(description="Generate the OpenAPI document served by workers.")
+    parser.add_argument("--output", default=OPENAPI_PATH, help="Where to write the document")
+    parser.add_argument("--check", action="store_true",
+                        help="Don't write; exit 1 if the existing file differs from the generated one")
+    args = parser.parse_args()
+
+    from fastapi import FastAPI
+    from main import app
+
+    # Call FastAPI's generator directly, bypassing a precomputed override
+    start = time.perf_counter()
+    app.openapi_schema = None
+    document = render(FastAPI.openapi(app))
+    elapsed = time.perf_counter() - start
+
+    compressed = gzip_document(document)
+
+    if args.check:
+        if read(args.output) != document or read(args.output + ".gz") != compressed:
+            print(f"{args.output} is out of date; run tools/build_openapi.py")
+            sys.exit(1)
+        print(f"{args.output} is up to date")
+        return
+
+    with open(args.output, "wb") as handle:
+        handle.write(document)
+    # Written second so its mtime is never older than the document's
+    with open(args.output + ".gz", "wb") as handle:
+        handle.write(compressed)
+    print(f"Wrote {args.output} ({len(document) / 1024:.0f} KB, {len(compressed) / 1024:.0f} KB gzipped, "
+          f"{len(app.openapi_schema['paths'])} paths, generated in {elapsed * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Delete (or quarantine) upload files that no form record references.
+
+Walks every directory in UPLOAD_PATHS and compares it with the *_path
+values of the form tables, see app/upload_gc.py. Files younger than the
+grace period are never touched. Exits 0 and prints what was found.
+
+Usage (from backend/):
+    python tools/gc_uploads.py --dry-run
+    python tools/gc_uploads.py --grace-hours 48
+    python tools/gc_uploads.py --quarantine-dir /var/backups/orphaned-uploads
+"""
+
+import argparse
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.database import SessionLocal
+from app.upload_gc import UPLOAD_GC_GRACE_HOURS, UPLOAD_GC_QUARANTINE_DIR, collect_orphans
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect orphaned upload files.")
+    parser.add_argument("--grace-hours", type=float, default=UPLOAD_GC_GRACE_HOURS,
+                        help="Never collect files modified more recently than this")
+    parser.add_argument("--quarantine-dir", default=UPLOAD_GC_QUARANTINE_DIR,
+                        help="Move orphans here instead of deleting them")
+    parser.add_argument("--dry-run", action="store_true", help="Only report the orphans")
+    args = parser.parse_args()
+
+    if args.quarantine_dir:
+        args.quarantine_dir = os.path.abspath(args.quarantine_dir)
+    # Relative database and upload paths resolve the same way as for the app
+    os.chdir(BACKEND_DIR)
+
+    db = SessionLocal()
+    try:
+        stats = collect_orphans(db, args.grace_hours, args.quarantine_dir, args.dry_run)
+    finally:
+        db.close()
+
+    action = "would be collected" if args.dry_run else ("quarantined" if args.quarantine_dir else "deleted")
+    print(f"Scanned {stats.scanned} files in {stats.seconds:.1f}s")
+    print(f"Orphans: {stats.orphans} ({stats.orphan_bytes / 1024 / 1024:.1f} MB), "
+          f"{stats.orphans if args.dry_run else stats.collected} {action}")
+    if stats.interrupted:
+        print("Stopped early: an upload layout migration is running; run again once it has finished")
+
+
+if __name__ == "__main__":
+    main()
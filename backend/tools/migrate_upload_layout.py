@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Move existing uploads into the directory layout of UPLOAD_SHARD_LEVELS.
+
+After UPLOAD_SHARD_LEVELS changes, new files go to the new layout
+(uploads/<form>/ab/cd/<ucf_id>/ for 2 levels) but existing ones stay where
+they are. This tool moves them and rewrites the *_path values in
+form_data, while the API keeps serving:
+
+For every form with file inputs, rows are read in id order, --batch-size at
+a time (only id and form_data). For each batch:
+1. every file not yet in the target layout, with its thumbnail and
+   preview, is hard-linked at its new path and its modification time set
+   to now
+2. the rewritten form_data of the batch is written in one transaction
+3. once that has committed, the old paths are unlinked
+
+Until the commit the old paths are valid and afterwards the new ones are,
+so no request sees a missing file. An interrupted run is simply run again;
+links left behind by a crash are orphans for tools/gc_uploads.py.
+
+The orphan collector (app/upload_gc.py) works from a snapshot of the
+referenced paths, which a committed batch makes stale. While this tool
+runs it keeps a marker file in uploads/ that stops collections from
+deleting anything, and the fresh modification times keep the new paths
+inside the collector's grace period should one already be past its check.
+
+Run it with the ingest queue drained (queued submissions still carry the
+old paths); the tool refuses to start otherwise. It works on local storage
+only: object storage has no directories to fill up, and objects keep
+their keys when UPLOAD_SHARD_LEVELS changes.
+
+Usage (from backend/):
+    python tools/migrate_upload_layout.py --levels 2 --dry-run
+    python tools/migrate_upload_layout.py --levels 2
+    python tools/migrate_upload_layout.py --levels 0 --forms exit-forms   # back to flat
+"""
+
+import argparse
+import contextlib
+import errno
+import os
+import shutil
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from sqlalchemy import bindparam, create_engine, func, inspect, select, update
+
+from app import models
+from app.database import SQLALCHEMY_DATABASE_URL, ingest_engine
+from app.form_registry import FORMS, FormSpec
+from app.ingest import RECEIPT_QUEUED
+from app.previews import derivative_paths
+from app.route_helpers import UPLOAD_SHARD_LEVELS, student_upload_dir
+from app.storage import STORAGE_BACKEND, storage
+from app.upload_gc import migration_marker, touch_migration_marker
+
+
+# ============================================================================
+# PATHS
+# ============================================================================
+
+def target_path(spec: FormSpec, path: str, levels: int) -> Optional[str]:
+    """Where a stored file belongs in the target layout (None: not a path of this form)."""
+    path = os.path.normpath(path)
+    upload_dir = os.path.normpath(spec.upload_dir)
+    if not path.startswith(upload_dir + os.sep):
+        return None
+    ucf_id = os.path.basename(os.path.dirname(path))
+    return os.path.join(student_upload_dir(upload_dir, ucf_id, levels), os.path.basename(path))
+
+
+def link_file(source: str, target: str) -> bool:
+    """
+    Make target the same file as source, keeping source.
+
+    Returns:
+        False if source is missing and target doesn't exist either
+    """
+    if os.path.exists(target):
+        # Linked by an earlier, interrupted run
+        return True
+    if not os.path.exists(source):
+        return False
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+            raise
+        # No hard links here (other filesystem); a copy works the same way
+        shutil.copy2(source, target)
+    # Both keep the old mtime, which would make the new path look like an old
+    # orphan to the collector until the row pointing at it has committed
+    os.utime(target)
+    return True
+
+
+def remove_old(paths: List[str], upload_dir: str) -> None:
+    """Unlink old paths, then the folders below upload_dir they leave empty."""
+    folders = set()
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        folders.add(os.path.dirname(path))
+    upload_dir = os.path.normpath(upload_dir)
+    for folder in sorted(folders, reverse=True):
+        while os.path.normpath(folder) != upload_dir:
+            try:
+                os.rmdir(folder)
+            except OSError:
+                break  # still has files
+            folder = os.path.dirname(folder)
+
+
+# ============================================================================
+# MIGRATION
+# ============================================================================
+
+class LayoutMigration:
+    def __init__(self, engine, levels: int, batch_size: int, dry_run: bool):
+        self.engine = engine
+        self.levels = levels
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+
+    def migrate_form(self, spec: FormSpec) -> Dict[str, int]:
+        table = spec.model.__table__
+        counts = {"rows": 0, "moved": 0, "missing": 0, "skipped": 0}
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("row_id"))
+            .values(form_data=bindparam("new_form_data"))
+        )
+        last_id = 0
+        while True:
+            with self.engine.connect() as conn:
+                rows = conn.execute(
+                    select(table.c.id, table.c.form_data)
+                    .where(table.c.id > last_id)
+                    .order_by(table.c.id)
+                    .limit(self.batch_size)
+                ).all()
+            if not rows:
+                return counts
+            last_id = rows[-1].id
+            counts["rows"] += len(rows)
+
+            if not self.dry_run:
+                touch_migration_marker()
+            changes, old_paths = self._plan_batch(spec, rows, counts)
+            if not changes or self.dry_run:
+                continue
+            with self.engine.begin() as conn:
+                conn.execute(statement, changes)
+            remove_old(old_paths, spec.upload_dir)
+
+    def _plan_batch(self, spec: FormSpec, rows, counts) -> Tuple[List[dict], List[str]]:
+        """Link the files of a batch at their new paths; returns the row updates and old paths."""
+        changes, old_paths = [], []
+        for row in rows:
+            form_data = dict(row.form_data or {})
+            changed = False
+            for field in spec.file_fields:
+                path = form_data.get(field)
+                if not path:
+                    continue
+                target = target_path(spec, path, self.levels)
+                if target is None:
+                    counts["skipped"] += 1
+                    continue
+                if target == os.path.normpath(path):
+                    continue
+                if self.dry_run:
+                    counts["moved"] += 1
+                    continue
+                if not link_file(path, target):
+                    counts["missing"] += 1
+                    continue
+                for old_derivative, new_derivative in zip(derivative_paths(path), derivative_paths(target)):
+                    if os.path.exists(old_derivative):
+                        link_file(old_derivative, new_derivative)
+                        old_paths.append(old_derivative)
+                old_paths.append(path)
+                form_data[field] = target
+                changed = True
+                counts["moved"] += 1
+            if changed:
+                changes.append({"row_id": row.id, "new_form_data": form_data})
+        return changes, old_paths
+
+
+def queued_submissions() -> int:
+    if not inspect(ingest_engine).has_table(models.IngestReceipt.__tablename__):
+        return 0
+    with ingest_engine.connect() as conn:
+        return conn.execute(
+            select(func.count()).select_from(models.IngestReceipt.__table__)
+            .where(models.IngestReceipt.status == RECEIPT_QUEUED)
+        ).scalar_one()
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Move uploads into the sharded directory layout.")
+    parser.add_argument("--levels", type=int, default=UPLOAD_SHARD_LEVELS,
+                        help="Fan-out levels of the target layout (default UPLOAD_SHARD_LEVELS)")
+    parser.add_argument("--forms", help="Comma-separated form paths, e.g. exit-forms (default: all with files)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per transaction")
+    parser.add_argument("--database-url", default=SQLALCHEMY_DATABASE_URL, help="Database to migrate")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the files to move")
+    args = parser.parse_args()
+
+    # Relative database and upload paths resolve the same way as for the app
+    os.chdir(BACKEND_DIR)
+
+    specs = [spec for spec in FORMS if spec.file_fields]
+    if args.forms:
+        wanted = {path.strip() for path in args.forms.split(",")}
+        unknown = wanted - {spec.path for spec in specs}
+        if unknown:
+            parser.error(f"unknown forms: {', '.join(sorted(unknown))}")
+        specs = [spec for spec in specs if spec.path in wanted]
+
+    if not storage.is_local:
+        print(f"Uploads are in {STORAGE_BACKEND} storage; only local uploads have a directory layout to migrate")
+        sys.exit(1)
+
+    queued = queued_submissions()
+    if queued and not args.dry_run:
+        print(f"{queued} submission(s) still in the ingest queue; run again once it has drained")
+        sys.exit(1)
+
+    migration = LayoutMigration(create_engine(args.database_url), args.levels, args.batch_size, args.dry_run)
+    verb = "to move" if args.dry_run else "moved"
+    print(f"{'form':<34}{'rows':>9}{'files ' + verb:>14}{'missing':>9}{'skipped':>9}")
+    start = time.perf_counter()
+    with migration_marker() if not args.dry_run else contextlib.nullcontext():
+        for spec in specs:
+            counts = migration.migrate_form(spec)
+            print(f"{spec.path:<34}{counts['rows']:>9}{counts['moved']:>14}{counts['missing']:>9}{counts['skipped']:>9}")
+    print(f"\nDone in {time.perf_counter() - start:.1f}s (target layout: {args.levels} level(s))")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Check how many SQL statements each API route issues against a budget.
+
+Runs every form route of app/routes.py in-process against a throwaway
+database in a temporary directory, counting the statements executed on the
+main engine (via its before_cursor_execute event) for each request:
+
+    POST   /api/<form>/               create     - 1 INSERT, no refresh SELECT
+    GET    /api/<form>/               list       - 1 SELECT
+    GET    /api/<form>/{request_id}   get        - 1 SELECT
+    DELETE /api/<form>/{request_id}   delete     - SELECT + DELETE
+    DELETE /api/<form>/               delete-all - 1 DELETE, rows never loaded
+
+A route that issues more statements than its budget (an extra refresh, a
+count() before a delete, an N+1 loop over rows) fails the run with status 1,
+so the check can gate changes to app/routes.py. Budgets per route kind are in
+BUDGETS; a route that legitimately needs more goes in ROUTE_BUDGETS.
+
+List endpoints are checked with --rows records in the table so that per-row
+queries show up.
+
+Usage (from backend/):
+    python tools/query_budget.py
+    python tools/query_budget.py --verbose      # print every statement
+    python tools/query_budget.py --only opt-requests
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+# Thumbnails don't touch the database; don't start the rendering pool
+os.environ.setdefault("PREVIEWS_ENABLED", "false")
+
+
+# ============================================================================
+# BUDGETS
+# ============================================================================
+
+# Maximum statements per request, by route kind
+BUDGETS = {
+    "create": 1,
+    "list": 1,
+    "get": 1,
+    "delete": 2,
+    "delete-all": 1,
+}
+
+# Per-route overrides, keyed "METHOD /api/path"
+ROUTE_BUDGETS: Dict[str, int] = {}
+
+# Form routes that aren't plain CRUD collections
+SKIPPED_PATHS = {"/api/", "/api/debug/", "/api/ingest/receipts/{receipt_id}", "/api/uploads/"}
+
+
+def route_kind(method: str, path: str) -> str:
+    is_item = path.endswith("}")
+    if method == "POST":
+        return "create"
+    if method == "GET":
+        return "get" if is_item else "list"
+    return "delete" if is_item else "delete-all"
+
+
+def budget_for(method: str, path: str) -> int:
+    return ROUTE_BUDGETS.get(f"{method} {path}", BUDGETS[route_kind(method, path)])
+
+
+# ============================================================================
+# STATEMENT COUNTING
+# ============================================================================
+
+class StatementRecorder:
+    """Collect the SQL statements an engine executes while active."""
+
+    def __init__(self, engine):
+        self.statements: List[str] = []
+        self.active = False
+        from sqlalchemy import event
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active:
+            self.statements.append(statement)
+
+    def start(self) -> None:
+        self.statements = []
+        self.active = True
+
+    def stop(self) -> List[str]:
+        self.active = False
+        return self.statements
+
+
+def summarize(statements: List[str]) -> str:
+    """e.g. "SELECT x1, DELETE x1" """
+    kinds = Counter(statement.split(None, 1)[0].upper() for statement in statements)
+    return ", ".join(f"{kind} x{count}" for kind, count in kinds.items()) or "-"
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+class BudgetRun:
+    def __init__(self, client, recorder: StatementRecorder, openapi: dict, verbose: bool):
+        from benchmarks.load_test import PayloadFactory
+
+        self.client = client
+        self.recorder = recorder
+        self.paths = openapi["paths"]
+        self.payloads = PayloadFactory(openapi, random.Random(42), file_kb=1)
+        self.verbose = verbose
+        self.failures: List[str] = []
+
+    def create(self, path: str) -> Tuple[Optional[int], object]:
+        operation = self.paths[path]["post"]
+        content = operation["requestBody"]["content"]
+        if "application/json" in content:
+            return self.client.post(path, json=self.payloads.json_body(operation))
+        data, files = self.payloads.multipart_body(operation)
+        return self.client.post(path, data=data, files=files)
+
+    def measure(self, method: str, path: str, url: str, send) -> Optional[object]:
+        self.recorder.start()
+        response = send()
+        statements = self.recorder.stop()
+
+        budget = budget_for(method, path)
+        ok = response.status_code < 400 and len(statements) <= budget
+        status = "ok" if ok else ("OVER" if response.status_code < 400 else f"HTTP {response.status_code}")
+        label = f"{method} {path}"
+        print(f"{label:<62}{len(statements):>6}{budget:>8}  {status:<8}{summarize(statements)}")
+        if self.verbose or not ok:
+            for statement in statements:
+                print("      " + " ".join(statement.split())[:150])
+        if not ok:
+            self.failures.append(label)
+        return response
+
+    def run_collection(self, path: str, rows: int) -> None:
+        ops = self.paths[path]
+        item_path = next((p for p in self.paths if re.fullmatch(re.escape(path) + r"\{\w+\}", p)), None)
+
+        created = None
+        if "post" in ops:
+            response = self.measure("POST", path, path, lambda: self.create(path))
+            if response.status_code < 400:
+                created = response.json().get("id")
+            for _ in range(rows - 1):
+                self.create(path)
+
+        if "get" in ops:
+            self.measure("GET", path, path, lambda: self.client.get(path))
+
+        if item_path and created is not None:
+            url = f"{path}{created}"
+            if "get" in self.paths[item_path]:
+                self.measure("GET", item_path, url, lambda: self.client.get(url))
+            if "delete" in self.paths[item_path]:
+                self.measure("DELETE", item_path, url, lambda: self.client.delete(url))
+
+        if "delete" in ops:
+            self.measure("DELETE", path, path, lambda: self.client.delete(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check SQL statements per route against budgets.")
+    parser.add_argument("--rows", type=int, default=5, help="Records per table when listing and deleting")
+    parser.add_argument("--only", default="", help="Only check paths containing this")
+    parser.add_argument("--verbose", action="store_true", help="Print every statement")
+    args = parser.parse_args()
+
+    # The app uses paths relative to the working directory for its SQLite
+    # files and uploads - run it in a scratch directory
+    workdir = tempfile.mkdtemp(prefix="query_budget_")
+    os.chdir(workdir)
+
+    from fastapi.testclient import TestClient
+
+    import main as app_main
+    from app.database import engine
+
+    recorder = StatementRecorder(engine)
+    with TestClient(app_main.app) as client:
+        openapi = client.get("/openapi.json").json()
+        run = BudgetRun(client, recorder, openapi, args.verbose)
+
+        collections = sorted(
+            path for path, ops in openapi["paths"].items()
+            if path.startswith("/api/") and not path.endswith("}") and path not in SKIPPED_PATHS
+            and not path.startswith("/api/admin/") and ("post" in ops or "delete" in ops)
+            and args.only in path
+        )
+        print(f"{'route':<62}{'stmts':>6}{'budget':>8}  {'status':<8}statements")
+        for path in collections:
+            run.run_collection(path, args.rows)
+
+    print(f"\nScratch directory: {workdir}")
+    if run.failures:
+        print(f"{len(run.failures)} route(s) over budget or failing:")
+        for label in run.failures:
+            print(f"  {label}")
+        sys.exit(1)
+    print("All routes within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic form submissions for load and scaling tests.
+
+Creates N rows for every form model in app/models.py (every model with a
+form_data column). form_data is shaped by the matching *Create schema in
+app/schemas.py: addresses, dependents, availability grids and the other
+fields get plausible fake values, and student IDs repeat across forms the
+way real students submit several forms. Rows are written with Core
+executemany inserts in large batches, so a million rows load in minutes.
+
+With --files, placeholder documents are written under UPLOAD_PATHS for the
+forms that take uploads and referenced from form_data (*_path keys), the
+same layout and storage backend the upload routes use.
+
+Usage (from backend/):
+    python tools/seed.py --per-model 1000
+    python tools/seed.py --per-model 50000 --models OPTRequest,ExitForm --files
+    python tools/seed.py --per-model 1000 --database-url sqlite:///./seed.db --truncate
+"""
+
+import argparse
+import io
+import os
+import random
+import re
+import sys
+import time
+import typing
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from pydantic import BaseModel
+from sqlalchemy import create_engine, delete, event, insert
+
+from app import models, schemas
+from app.database import SQLALCHEMY_DATABASE_URL
+from app.route_helpers import UPLOAD_PATHS, student_upload_dir
+from app.storage import storage
+
+
+# ============================================================================
+# UPLOAD FIELDS
+# ============================================================================
+
+# Forms that take file uploads: (UPLOAD_PATHS key, upload field names).
+# Each saved file is referenced from form_data as "<field>_path".
+UPLOAD_FIELDS = {
+    "AcademicTrainingRequest": ("academic_training", ["offer_letter", "training_authorization"]),
+    "OPTRequest": ("opt_requests", [
+        "photo2x2", "passport_biographical", "f1_visa_or_uscis_notice", "i94",
+        "form_i765", "form_g1145", "previous_i20s", "previous_ead"]),
+    "FloridaStatute101035Request": ("florida_statute", ["passport_document"]),
+    "LeaveRequest": ("leave_requests", ["documentation"]),
+    "OptStemExtensionApplication": ("opt_stem_applications", [
+        "photo_2x2", "form_i983", "passport", "f1_visa", "i94", "ead_card",
+        "form_i765", "form_g1145", "diploma", "transcripts", "previous_i20s"]),
+    "ExitForm": ("exit_forms", ["flight_itinerary"]),
+    "VirtualCheckInRequest": ("virtual_checkin", [
+        "visa_notice_of_action", "form_i94", "passport", "other_documents"]),
+}
+
+PLACEHOLDER_PDF = b"%PDF-1.4\n% synthetic placeholder generated by tools/seed.py\n%%EOF\n"
+
+# Columns every form model has; anything else is filled from form_data
+STANDARD_COLUMNS = {"id", "student_name", "student_id", "program", "submission_date", "status", "form_data"}
+
+# Schema fields that are not part of form_data
+SKIPPED_FIELDS = {"student_name", "student_id", "program", "raw_form_data", "form_data"}
+
+
+# ============================================================================
+# FAKE VALUES
+# ============================================================================
+
+GIVEN_NAMES = [
+    "Aisha", "Carlos", "Chen", "Daniela", "Emeka", "Fatima", "Hiroshi", "Ines", "Jae-won",
+    "Kavya", "Luca", "Maria", "Mohammed", "Nguyen", "Olga", "Priya", "Rafael", "Sara",
+    "Tomasz", "Wei", "Yusuf", "Zeynep",
+]
+FAMILY_NAMES = [
+    "Ahmed", "Alvarez", "Banerjee", "Costa", "Dubois", "Garcia", "Haddad", "Ivanova",
+    "Kim", "Kowalski", "Li", "Martins", "Nakamura", "Okafor", "Patel", "Rossi", "Silva",
+    "Tran", "Wang", "Yilmaz",
+]
+COUNTRIES = [
+    "India", "China", "Brazil", "Nigeria", "Vietnam", "South Korea", "Colombia", "Turkey",
+    "Saudi Arabia", "Mexico", "Germany", "Egypt", "Pakistan", "Japan", "Venezuela",
+]
+CITIES = ["Mumbai", "Shanghai", "Sao Paulo", "Lagos", "Hanoi", "Seoul", "Bogota", "Istanbul",
+          "Riyadh", "Guadalajara", "Berlin", "Cairo", "Lahore", "Osaka", "Caracas"]
+US_CITIES = [("Orlando", "FL", "328"), ("Oviedo", "FL", "327"), ("Winter Park", "FL", "327"),
+             ("Tampa", "FL", "336"), ("Miami", "FL", "331"), ("Atlanta", "GA", "303")]
+STREETS = ["University Blvd", "Alafaya Trl", "Gemini Blvd", "McCulloch Rd", "Research Pkwy",
+           "Colonial Dr", "Orange Ave", "Central Florida Blvd"]
+MAJORS = ["Computer Science", "Mechanical Engineering", "Data Analytics", "Hospitality Management",
+          "Industrial Engineering", "Biomedical Sciences", "Finance", "Physics", "Optics and Photonics"]
+LEVELS = ["Undergraduate", "Masters", "PhD"]
+TERMS = ["Spring", "Summer", "Fall"]
+RELATIONSHIPS = ["Spouse", "Child"]
+SEXES = ["Male", "Female"]
+STATUSES = ["pending"] * 6 + ["approved"] * 3 + ["denied"]
+WORDS = ("request submitted for review please process before the upcoming term "
+         "documents attached employer confirmed start date adviser approved").split()
+
+
+class Faker:
+    """Small seeded generator of plausible field values."""
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+
+    def choice(self, values):
+        return self.rng.choice(values)
+
+    def digits(self, n: int) -> str:
+        return str(self.rng.randrange(10 ** (n - 1), 10 ** n))
+
+    def date(self, start_year: int, end_year: int) -> str:
+        start = datetime(start_year, 1, 1)
+        days = (datetime(end_year, 12, 31) - start).days
+        return (start + timedelta(days=self.rng.randrange(days))).strftime("%Y-%m-%d")
+
+    def sentence(self, words: int = 8) -> str:
+        return " ".join(self.rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+    def us_address(self) -> Dict[str, str]:
+        city, state, zip_prefix = self.rng.choice(US_CITIES)
+        return {
+            "street": f"{self.rng.randrange(100, 20000)} {self.rng.choice(STREETS)}",
+            "city": city,
+            "state": state,
+            "postal_code": zip_prefix + self.digits(2),
+            "country": "United States",
+        }
+
+    def foreign_address(self) -> Dict[str, str]:
+        return {
+            "street": f"{self.rng.randrange(1, 999)} {self.rng.choice(FAMILY_NAMES)} Street",
+            "city": self.rng.choice(CITIES),
+            "state": None,
+            "postal_code": self.digits(6),
+            "country": self.rng.choice(COUNTRIES),
+        }
+
+    def dependent(self) -> Dict[str, str]:
+        return {
+            "relationship": self.rng.choice(RELATIONSHIPS),
+            "given_name": self.rng.choice(GIVEN_NAMES),
+            "family_name": self.rng.choice(FAMILY_NAMES),
+            "legal_sex": self.rng.choice(SEXES),
+            "date_of_birth": self.date(1985, 2022),
+            "city_of_birth": self.rng.choice(CITIES),
+            "country_of_birth": self.rng.choice(COUNTRIES),
+            "country_of_citizenship": self.rng.choice(COUNTRIES),
+        }
+
+
+# Field-name patterns for string fields, checked in order
+STRING_RULES: List[Tuple[str, Callable[[Faker, dict], Any]]] = [
+    (r"given_name|first_name", lambda f, s: s["given_name"]),
+    (r"family_name|last_name", lambda f, s: s["family_name"]),
+    (r"email", lambda f, s: f"{s['given_name']}.{s['family_name']}{s['ucf_id'][-3:]}@ucf.edu".lower()),
+    (r"ucf_id|employee_id|student_id", lambda f, s: s["ucf_id"]),
+    (r"sevis", lambda f, s: "N00" + f.digits(8)),
+    (r"phone", lambda f, s: f"407-{f.digits(3)}-{f.digits(4)}"),
+    (r"birth_date|date_of_birth|dob", lambda f, s: s["date_of_birth"]),
+    (r"city", lambda f, s: f.choice(CITIES)),
+    (r"country|citizenship", lambda f, s: f.choice(COUNTRIES)),
+    (r"zip|postal", lambda f, s: "328" + f.digits(2)),
+    (r"street|address", lambda f, s: f.us_address()["street"]),
+    (r"state$", lambda f, s: "FL"),
+    (r"sex|gender", lambda f, s: f.choice(SEXES)),
+    (r"date", lambda f, s: f.date(2024, 2026)),
+    (r"(^|_)time$", lambda f, s: f"{f.rng.randrange(8, 18):02d}:{f.choice(['00', '15', '30', '45'])}"),
+    (r"year", lambda f, s: str(f.rng.randrange(2024, 2028))),
+    (r"term|semester", lambda f, s: f.choice(TERMS)),
+    (r"level", lambda f, s: f.choice(LEVELS)),
+    (r"major|program_of_study|degree", lambda f, s: f.choice(MAJORS)),
+    (r"college|department", lambda f, s: f.choice(["Engineering", "Sciences", "Business", "Medicine"])),
+    (r"hours", lambda f, s: str(f.rng.randrange(2, 21))),
+    (r"salary|wage|amount", lambda f, s: str(f.rng.randrange(15, 60) * 1000)),
+    (r"employer|company|organization", lambda f, s: f.choice(["Lockheed Martin", "Siemens", "EA", "UCF", "Disney"])),
+    (r"signature", lambda f, s: f"{s['given_name']} {s['family_name']}"),
+    (r"remarks|comments|reason|explanation|description|notes", lambda f, s: f.sentence()),
+]
+
+
+def _unwrap_optional(annotation):
+    if typing.get_origin(annotation) is typing.Union:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _field_generator(name: str, annotation) -> Optional[Callable[[Faker, dict], Any]]:
+    """Pick a value generator for one schema field (None to leave it out)."""
+    annotation = _unwrap_optional(annotation)
+    origin = typing.get_origin(annotation)
+
+    if name.endswith("_path"):
+        return None
+    if annotation is bool:
+        # Availability grids and checkboxes are sparse in real submissions
+        rate = 0.3 if name.startswith("availability_") else 0.7
+        return lambda f, s: f.rng.random() < rate
+    if annotation is int:
+        return lambda f, s: f.rng.randrange(0, 40)
+    if annotation is float:
+        return lambda f, s: round(f.rng.uniform(0, 40), 1)
+    if annotation is schemas.Address:
+        if "non_us" in name or "foreign" in name:
+            return lambda f, s: f.foreign_address()
+        return lambda f, s: f.us_address()
+    if origin is list:
+        (item,) = typing.get_args(annotation) or (str,)
+        if item is schemas.Dependent:
+            return lambda f, s: [f.dependent() for _ in range(f.choice([0, 0, 0, 1, 1, 2, 3]))]
+        return lambda f, s: f.rng.sample(WORDS, f.rng.randrange(1, 4))
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        sub_generators = _schema_generators(annotation)
+        return lambda f, s: {key: gen(f, s) for key, gen in sub_generators}
+    if origin is dict or annotation is dict:
+        return None
+
+    for pattern, generator in STRING_RULES:
+        if re.search(pattern, name):
+            return generator
+    return lambda f, s: " ".join(f.rng.sample(WORDS, 2))
+
+
+def _schema_generators(schema, skip=()) -> List[Tuple[str, Callable]]:
+    generators = []
+    for name, field in schema.model_fields.items():
+        if name in SKIPPED_FIELDS or name in skip:
+            continue
+        generator = _field_generator(name, field.annotation)
+        if generator is not None:
+            generators.append((name, generator))
+    return generators
+
+
+# ============================================================================
+# ROW GENERATION
+# ============================================================================
+
+def form_models() -> List[type]:
+    """Every model with a form_data column (i.e. excludes bookkeeping tables)."""
+    found = [mapper.class_ for mapper in models.Base.registry.mappers
+             if "form_data" in mapper.class_.__table__.c]
+    return sorted(found, key=lambda cls: cls.__name__)
+
+
+def program_name(model_class) -> str:
+    default = model_class.__table__.c.program.default
+    if default is not None:
+        return default.arg
+    return re.sub(r"(?<=[a-z0-9])(?=[A-Z])", " ", model_class.__name__)
+
+
+class RowFactory:
+    """Build insert-ready rows for one model."""
+
+    def __init__(self, model_class, faker: Faker, students: List[dict], with_files: bool):
+        self.model_class = model_class
+        self.faker = faker
+        self.students = students
+        self.program = program_name(model_class)
+        upload_key, fields = UPLOAD_FIELDS.get(model_class.__name__, (None, []))
+        schema = getattr(schemas, f"{model_class.__name__}Create", None)
+        # Upload fields only ever appear in form_data as their *_path
+        self.generators = _schema_generators(schema, skip=fields) if schema is not None else []
+        self.extra_columns = [c.key for c in model_class.__table__.columns if c.key not in STANDARD_COLUMNS]
+        self.upload_dir = UPLOAD_PATHS[upload_key] if (with_files and upload_key) else None
+        self.upload_fields = fields
+        self.files_written = 0
+        self._now = datetime.now()
+
+    def row(self) -> Dict[str, Any]:
+        f = self.faker
+        student = f.choice(self.students)
+        form_data = {name: generator(f, student) for name, generator in self.generators}
+        form_data.setdefault("ucf_id", student["ucf_id"])
+
+        if self.upload_dir:
+            for field in self.upload_fields:
+                # Optional documents are missing from some submissions
+                if f.rng.random() < 0.8:
+                    form_data[f"{field}_path"] = self._write_placeholder(student["ucf_id"])
+
+        row = {
+            "student_name": f"{student['given_name']} {student['family_name']}",
+            "student_id": student["ucf_id"],
+            "program": self.program,
+            "submission_date": self._now - timedelta(seconds=f.rng.randrange(365 * 24 * 3600)),
+            "status": f.choice(STATUSES),
+            "form_data": form_data,
+        }
+        for column in self.extra_columns:
+            if column == "completion_type":
+                row[column] = f.choice(["pre", "post"])
+            else:
+                row[column] = form_data.get(column)
+        return row
+
+    def _write_placeholder(self, ucf_id: str) -> str:
+        path = os.path.join(student_upload_dir(self.upload_dir, ucf_id), f"{uuid.uuid4()}.pdf")
+        storage.save(path, io.BytesIO(PLACEHOLDER_PDF), "application/pdf")
+        self.files_written += 1
+        return path
+
+
+def make_students(faker: Faker, count: int) -> List[dict]:
+    students, seen = [], set()
+    while len(students) < count:
+        ucf_id = faker.digits(7)
+        if ucf_id in seen:
+            continue
+        seen.add(ucf_id)
+        students.append({
+            "ucf_id": ucf_id,
+            "given_name": faker.choice(GIVEN_NAMES),
+            "family_name": faker.choice(FAMILY_NAMES),
+            "date_of_birth": faker.date(1990, 2006),
+        })
+    return students
+
+
+# ============================================================================
+# BULK INSERT
+# ============================================================================
+
+def seed_model(engine, factory: RowFactory, count: int, batch_size: int) -> float:
+    """Insert count rows for one model in executemany batches; returns seconds."""
+    table = factory.model_class.__table__
+    statement = insert(table)
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        remaining = count
+        while remaining > 0:
+            size = min(batch_size, remaining)
+            conn.execute(statement, [factory.row() for _ in range(size)])
+            remaining -= size
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic form submissions.")
+    parser.add_argument("--per-model", type=int, default=1000, help="Rows to create for each model")
+    parser.add_argument("--models", help="Comma-separated model class names (default: all form models)")
+    parser.add_argument("--students", type=int, help="Distinct students (default: per-model / 3)")
+    parser.add_argument("--files", action="store_true", help="Write placeholder upload files")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducible data")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per executemany batch")
+    parser.add_argument("--database-url", default=SQLALCHEMY_DATABASE_URL, help="Target database")
+    parser.add_argument("--truncate", action="store_true", help="Delete existing rows from the seeded tables first")
+    args = parser.parse_args()
+
+    # Relative database and upload paths resolve the same way as for the app
+    os.chdir(BACKEND_DIR)
+
+    selected = form_models()
+    if args.models:
+        wanted = {name.strip() for name in args.models.split(",")}
+        unknown = wanted - {cls.__name__ for cls in selected}
+        if unknown:
+            parser.error(f"unknown models: {', '.join(sorted(unknown))}")
+        selected = [cls for cls in selected if cls.__name__ in wanted]
+
+    engine = create_engine(args.database_url)
+    if engine.dialect.name == "sqlite":
+        @event.listens_for(engine, "connect")
+        def _fast_bulk_load(dbapi_connection, connection_record):
+            # Seed data is disposable - skip fsyncs while loading
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA synchronous=OFF")
+            cursor.close()
+
+    models.Base.metadata.create_all(bind=engine, tables=[cls.__table__ for cls in selected])
+    if args.truncate:
+        with engine.begin() as conn:
+            for cls in selected:
+                conn.execute(delete(cls.__table__))
+
+    faker = Faker(args.seed)
+    students = make_students(faker, args.students or max(1, args.per_model // 3))
+
+    total_rows, total_files, total_seconds = 0, 0, 0.0
+    print(f"Seeding {args.per_model} rows x {len(selected)} models into {args.database_url}")
+    for cls in selected:
+        factory = RowFactory(cls, faker, students, args.files)
+        seconds = seed_model(engine, factory, args.per_model, args.batch_size)
+        total_rows += args.per_model
+        total_files += factory.files_written
+        total_seconds += seconds
+        print(f"  {cls.__name__:<36}{args.per_model:>10} rows {seconds:>8.2f}s "
+              f"({args.per_model / seconds:,.0f} rows/s)")
+
+    print(f"Done: {total_rows} rows, {total_files} files in {total_seconds:.1f}s "
+          f"({total_rows / total_seconds:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@
 Script to create/update database tables for Academic Training requests
 """
 
-from app.database import engine
+from app.database import engine, ingest_engine
 from app import models
 
 if __name__ == "__main__":
@@ -11,6 +11,7 @@ if __name__ == "__main__":
     
     # Create all tables (this will create new tables if they don't exist)
     models.Base.metadata.create_all(bind=engine)
+    models.IngestBase.metadata.create_all(bind=ingest_engine)
     
     print("Database tables created/updated successfully!")
     print("Available tables:")
@@ -9,6 +9,29 @@ import {
     CModal, CModalHeader, CModalTitle, CModalBody, CModalFooter
 } from '@coreui/react'
 
+// The API returns at most this many rows per request (MAX_PAGE_SIZE on the backend)
+const PAGE_SIZE = 500
+
+// Fetch every page of a form's submissions, newest first. Each page starts
+// below the last id of the previous one, so submissions arriving meanwhile
+// don't shift the pages
+const fetchAllPages = async (type) => {
+    const rows = []
+    let cursor = ''
+    for (;;) {
+        const response = await fetch(`http://localhost:8000/api/${type.name}/?limit=${PAGE_SIZE}${cursor}`)
+        if (!response.ok) {
+            throw new Error(`${type.label} HTTP error! Status: ${response.status}`)
+        }
+        const page = await response.json()
+        rows.push(...page)
+        if (page.length < PAGE_SIZE) {
+            return rows
+        }
+        cursor = `&before_id=${page[page.length - 1].id}`
+    }
+}
+
 // Custom hook for fetching requests
 const useFetchRequests = () => {
     const [requests, setRequests] = useState([])
@@ -39,17 +62,7 @@ const useFetchRequests = () => {
                 { name: 'virtual-checkin', label: 'Virtual Check In' }
             ]
 
-            const responses = await Promise.all(
-                requestTypes.map(type =>
-                    fetch(`http://localhost:8000/api/${type.name}/`)
-                        .then(response => {
-                            if (!response.ok) {
-                                throw new Error(`${type.label} HTTP error! Status: ${response.status}`)
-                            }
-                            return response.json()
-                        })
-                )
-            )
+            const responses = await Promise.all(requestTypes.map(fetchAllPages))
 
             const allRequests = responses.flat()
             setRequests(allRequests)